@@ -0,0 +1,508 @@
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import map_navigator
+
+# Benchmarks the navigator's queries on reproducible synthetic road networks.
+#
+#   python "Map Navigator Benchmark.py" --sizes 1000,10000,100000 \
+#       --output results.json
+#   python "Map Navigator Benchmark.py" --compare results.json
+#
+# Networks are generated as CSV once per (kind, size, seed) and cached, then
+# bulk-loaded with import_network on every run, so import time is measured
+# too. Each query type is timed on its own pass; nodes settled, heap
+# operations and allocation peaks come from a second, instrumented pass so
+# the counting does not distort the timings.
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(map_navigator.__file__))
+
+GRAPH_KINDS = ("grid", "geometric", "scale-free")
+QUERY_TYPES = ("dijkstra", "calculate_eta", "get_optimal_departure_time",
+               "generate_timing_report")
+
+KM_PER_DEGREE_LATITUDE = 111.2
+ORIGIN = (28.45, 77.0)  # South-west corner, so maps sit around Delhi
+
+ROAD_TYPES = ("highway", "avenue", "street", "local")
+SPEED_LIMITS = {"highway": 80, "avenue": 50, "street": 40, "local": 30}
+TRAFFIC_PATTERNS = [
+    {"8-10": 2.0, "10-16": 1.2, "16-19": 1.8, "19-22": 1.3, "22-8": 1.0},
+    {"7-11": 1.6, "11-17": 1.1, "17-21": 1.7, "21-7": 0.9},
+    {"0-24": 1.4},
+    {"9-12": 1.3, "12-14": 1.5, "14-18": 1.2, "18-9": 1.0},
+]
+PATTERN_SHARE = 0.2  # Fraction of roads with a time-of-day traffic pattern
+
+def _to_coordinates(x_km: np.ndarray, y_km: np.ndarray
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+    latitude = ORIGIN[0] + y_km / KM_PER_DEGREE_LATITUDE
+    longitude = ORIGIN[1] + x_km / (KM_PER_DEGREE_LATITUDE *
+                                    math.cos(math.radians(ORIGIN[0])))
+    return latitude, longitude
+
+def grid_network(nodes: int, rng: np.random.Generator):
+    """
+    Street grid with 500 m blocks and a highway every eighth row and column.
+    """
+    columns = math.ceil(math.sqrt(nodes))
+    ids = np.arange(nodes)
+    row, column = ids // columns, ids % columns
+    x = column * 0.5 + rng.uniform(-0.05, 0.05, nodes)
+    y = row * 0.5 + rng.uniform(-0.05, 0.05, nodes)
+
+    right = ids[(column + 1 < columns) & (ids + 1 < nodes)]
+    down = ids[ids + columns < nodes]
+    sources = np.concatenate([right, down])
+    targets = np.concatenate([right + 1, down + columns])
+    on_highway = np.concatenate([row[right] % 8 == 0, column[down] % 8 == 0])
+    road_types = np.where(on_highway, 0, rng.integers(1, 4, len(sources)))
+    return x, y, sources, targets, road_types, 1.1
+
+def geometric_network(nodes: int, rng: np.random.Generator):
+    """
+    Random geometric graph: uniform points, 0.25 km² each, joined when
+    closer than a radius giving about five neighbours per node.
+    """
+    side = math.sqrt(nodes * 0.25)
+    radius = math.sqrt(5 / (math.pi * 4))
+    x = rng.uniform(0, side, nodes)
+    y = rng.uniform(0, side, nodes)
+
+    # Bucket points into radius-sized cells and pair each cell with itself
+    # and four of its neighbours, so every close pair is seen exactly once
+    cells_per_side = max(int(side / radius), 1)
+    cell_x = np.minimum((x / radius).astype(np.int64), cells_per_side - 1)
+    cell_y = np.minimum((y / radius).astype(np.int64), cells_per_side - 1)
+    cell = cell_y * cells_per_side + cell_x
+    order = np.argsort(cell, kind="stable")
+    counts = np.bincount(cell, minlength=cells_per_side ** 2)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    sources, targets = [], []
+    for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        neighbour_x, neighbour_y = cell_x + dx, cell_y + dy
+        valid = ((neighbour_x >= 0) & (neighbour_x < cells_per_side) &
+                 (neighbour_y < cells_per_side))
+        points = np.nonzero(valid)[0]
+        neighbour = neighbour_y[points] * cells_per_side + neighbour_x[points]
+        repeats = counts[neighbour]
+        first = np.repeat(points, repeats)
+        # Position of each pair within its neighbour cell
+        within = np.arange(repeats.sum()) - np.repeat(
+            np.cumsum(repeats) - repeats, repeats
+        )
+        second = order[np.repeat(starts[neighbour], repeats) + within]
+        close = np.hypot(x[first] - x[second], y[first] - y[second]) < radius
+        if (dx, dy) == (0, 0):
+            close &= first < second
+        sources.append(first[close])
+        targets.append(second[close])
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    road_types = rng.choice(4, len(sources), p=[0.05, 0.2, 0.5, 0.25])
+    return x, y, sources, targets, road_types, 1.3
+
+def scale_free_network(nodes: int, rng: np.random.Generator):
+    """
+    Barabási–Albert graph with two roads per new node, on uniform points.
+    Hubs get highways, as arterial roads gather many junctions.
+    """
+    side = math.sqrt(nodes * 0.25)
+    x = rng.uniform(0, side, nodes)
+    y = rng.uniform(0, side, nodes)
+
+    # Preferential attachment: sample endpoints of earlier roads
+    links = 2
+    sources = [0, 0, 1]
+    targets = [1, 2, 2]
+    endpoints = [0, 1, 0, 2, 1, 2]
+    picks = rng.random(nodes * links)
+    for node in range(links + 1, nodes):
+        chosen = set()
+        offset = node * links
+        for attempt in range(links):
+            chosen.add(endpoints[int(picks[offset + attempt] *
+                                     len(endpoints))])
+        for target in chosen:
+            sources.append(node)
+            targets.append(target)
+            endpoints.append(node)
+            endpoints.append(target)
+    sources = np.array(sources, dtype=np.int64)
+    targets = np.array(targets, dtype=np.int64)
+
+    degree = np.bincount(np.concatenate([sources, targets]), minlength=nodes)
+    hub = np.maximum(degree[sources], degree[targets]) >= 8
+    road_types = np.where(hub, 0, rng.integers(1, 4, len(sources)))
+    return x, y, sources, targets, road_types, 1.3
+
+GENERATORS = {
+    "grid": grid_network,
+    "geometric": geometric_network,
+    "scale-free": scale_free_network,
+}
+
+def write_network_csv(kind: str, nodes: int, seed: int,
+                      directory: str) -> List[str]:
+    """
+    Generates a network and writes it as importer node and edge CSV files,
+    reusing files from an earlier run with the same kind, size and seed.
+    """
+    stem = os.path.join(directory, f"{kind}-{nodes}-{seed}")
+    filenames = [stem + "-nodes.csv", stem + "-edges.csv"]
+    if all(os.path.exists(filename) for filename in filenames):
+        return filenames
+
+    rng = np.random.default_rng([seed, nodes, GRAPH_KINDS.index(kind)])
+    x, y, sources, targets, road_types, detour = GENERATORS[kind](nodes, rng)
+    latitude, longitude = _to_coordinates(x, y)
+    names = np.char.add("N", np.arange(nodes).astype(str))
+
+    straight = np.hypot(x[sources] - x[targets], y[sources] - y[targets])
+    distance = np.maximum(straight * rng.uniform(1.0, detour, len(sources)),
+                          0.01)
+    road_type = np.array(ROAD_TYPES)[road_types]
+    patterns = np.array([json.dumps(pattern)
+                         for pattern in TRAFFIC_PATTERNS] + [""])
+    pattern = rng.integers(0, len(TRAFFIC_PATTERNS), len(sources))
+    pattern[rng.random(len(sources)) >= PATTERN_SHARE] = len(TRAFFIC_PATTERNS)
+
+    os.makedirs(directory, exist_ok=True)
+    pd.DataFrame({"name": names, "latitude": latitude,
+                  "longitude": longitude}).to_csv(filenames[0] + ".tmp",
+                                                  index=False)
+    pd.DataFrame({
+        "from": names[sources],
+        "to": names[targets],
+        "distance": distance,
+        "traffic": rng.uniform(1.0, 1.5, len(sources)).round(3),
+        "road_type": road_type,
+        "speed_limit": [SPEED_LIMITS[name] for name in road_type],
+        "traffic_pattern": patterns[pattern],
+    }).to_csv(filenames[1] + ".tmp", index=False)
+    for filename in filenames:
+        os.replace(filename + ".tmp", filename)
+    return filenames
+
+def sample_queries(navigator, count: int, seed: int) -> List[Tuple[str, str]]:
+    """
+    Draws origin/destination pairs from the component of a random node,
+    retrying from other nodes while it covers less than half the map.
+    """
+    compiled = navigator.compile_graph()
+    offsets, targets = compiled.offsets, compiled.targets
+    nodes = len(compiled.names)
+    rng = random.Random(seed)
+
+    component = []
+    for _ in range(10):
+        start = rng.randrange(nodes)
+        seen = bytearray(nodes)
+        seen[start] = 1
+        component = [start]
+        queue = deque(component)
+        while queue:
+            u = queue.popleft()
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if not seen[v]:
+                    seen[v] = 1
+                    component.append(v)
+                    queue.append(v)
+        if len(component) * 2 >= nodes:
+            break
+
+    pairs = []
+    while len(pairs) < count and len(component) > 1:
+        u, v = rng.sample(component, 2)
+        pairs.append((compiled.names[u], compiled.names[v]))
+    return pairs
+
+class CountingHeap:
+    """
+    Stand-in for the heapq module that counts pushes and pops, and treats
+    each distinct vertex popped (the last tuple field) as settled.
+    """
+
+    def __init__(self):
+        self.pushes = 0
+        self.pops = 0
+        self.popped = set()
+
+    def heappush(self, heap: List, item) -> None:
+        self.pushes += 1
+        heapq.heappush(heap, item)
+
+    def heappop(self, heap: List):
+        item = heapq.heappop(heap)
+        self.pops += 1
+        self.popped.add(item[-1])
+        return item
+
+    def __getattr__(self, name: str):
+        return getattr(heapq, name)
+
+def query_runner(navigator, query: str, departure: datetime):
+    """
+    Returns a function(start, end, target_arrival) running one query type.
+    """
+    if query == "dijkstra":
+        return lambda start, end, arrival: navigator.dijkstra(start, end,
+                                                              departure)
+    if query == "calculate_eta":
+        return lambda start, end, arrival: navigator.calculate_eta(
+            start, end, departure)
+    if query == "get_optimal_departure_time":
+        return lambda start, end, arrival: (
+            navigator.get_optimal_departure_time(
+                start, end, arrival,
+                math.ceil((arrival - departure).total_seconds() / 3600) + 1
+            )
+        )
+    return lambda start, end, arrival: navigator.generate_timing_report(
+        start, end, departure)
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    if not values:
+        return {}
+
+    def percentile(fraction: float) -> float:
+        return values[max(math.ceil(fraction * len(values)), 1) - 1]
+
+    return {"mean": sum(values) / len(values), "p50": percentile(0.5),
+            "p90": percentile(0.9), "max": values[-1]}
+
+def benchmark_queries(navigator, pairs: List[Tuple[str, str]],
+                      departure: datetime, repeat: int) -> Dict:
+    """
+    Times every query type over the pairs, then reruns them once with the
+    heap and allocations instrumented.
+    """
+    # Arrive a quarter hour after the fastest route would, so the optimal
+    # departure search always has an answer inside its window
+    arrivals = []
+    for start, end in pairs:
+        eta = navigator.calculate_eta(start, end, departure)
+        arrivals.append(departure + (eta or timedelta()) +
+                        timedelta(minutes=15))
+
+    results = {}
+    for query in QUERY_TYPES:
+        run = query_runner(navigator, query, departure)
+        run(*pairs[0], arrivals[0])  # Warm slice and workspace caches
+
+        timings = []
+        for _ in range(repeat):
+            for (start, end), arrival in zip(pairs, arrivals):
+                started = perf_counter()
+                run(start, end, arrival)
+                timings.append((perf_counter() - started) * 1000)
+
+        settled, pushes, pops, allocated = [], [], [], []
+        searching_modules = [
+            module for name, module in list(sys.modules.items())
+            if name.startswith("map_navigator.") and
+            getattr(module, "heapq", None) is heapq
+        ]
+        tracemalloc.start()
+        try:
+            for (start, end), arrival in zip(pairs, arrivals):
+                counter = CountingHeap()
+                for module in searching_modules:
+                    module.heapq = counter
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                run(start, end, arrival)
+                allocated.append(
+                    (tracemalloc.get_traced_memory()[1] - before) / 1024
+                )
+                settled.append(len(counter.popped))
+                pushes.append(counter.pushes)
+                pops.append(counter.pops)
+        finally:
+            for module in searching_modules:
+                module.heapq = heapq
+            tracemalloc.stop()
+
+        results[query] = {
+            "queries": len(timings),
+            "ms": summarize(timings),
+            "nodes_settled": summarize(settled),
+            "heap_pushes": summarize(pushes),
+            "heap_pops": summarize(pops),
+            "peak_allocated_kb": summarize(allocated),
+        }
+    return results
+
+def code_version() -> Dict[str, str]:
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(PACKAGE_DIR)):
+        if filename.endswith(".py"):
+            with open(os.path.join(PACKAGE_DIR, filename), "rb") as f:
+                digest.update(f.read())
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+            text=True, cwd=PACKAGE_DIR, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "source_sha256": digest.hexdigest()[:12]}
+
+def run_benchmarks(args: argparse.Namespace) -> Dict:
+    departure = datetime.fromisoformat(args.departure)
+    report = {
+        "version": code_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "departure": departure.isoformat(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+
+    for kind in args.graphs:
+        for nodes in args.sizes:
+            started = perf_counter()
+            filenames = write_network_csv(kind, nodes, args.seed,
+                                          args.cache_dir)
+            generate_seconds = perf_counter() - started
+
+            navigator = map_navigator.EnhancedMapNavigator()
+            output = os.path.join(args.cache_dir,
+                                  f"{kind}-{nodes}-{args.seed}.map")
+            started = perf_counter()
+            summary = navigator.import_network(filenames, output)
+            import_seconds = perf_counter() - started
+
+            started = perf_counter()
+            navigator.compile_weights()
+            compile_seconds = perf_counter() - started
+
+            pairs = sample_queries(navigator, args.queries, args.seed)
+            entry = {
+                "graph": kind,
+                "nodes": summary["nodes"],
+                "roads": summary["roads"],
+                "generate_seconds": generate_seconds,
+                "import_seconds": import_seconds,
+                "compile_seconds": compile_seconds,
+                "map_file_mb": os.path.getsize(output) / (1024 * 1024),
+                "queries": benchmark_queries(navigator, pairs,
+                                             departure, args.repeat),
+                "peak_memory_mb": map_navigator.peak_memory_mb(),
+            }
+            report["results"].append(entry)
+            print(format_entry(entry), flush=True)
+    return report
+
+def format_entry(entry: Dict) -> str:
+    lines = [f"{entry['graph']} {entry['nodes']:,} nodes, "
+             f"{entry['roads']:,} roads: import {entry['import_seconds']:.2f}s"
+             f", compile {entry['compile_seconds']:.2f}s"]
+    for query, stats in entry["queries"].items():
+        if not stats["ms"]:
+            continue
+        lines.append(
+            f"  {query:<27} p50 {stats['ms']['p50']:9.2f} ms  "
+            f"p90 {stats['ms']['p90']:9.2f} ms  "
+            f"settled {stats['nodes_settled']['mean']:10.0f}  "
+            f"pops {stats['heap_pops']['mean']:10.0f}"
+        )
+    return "\n".join(lines)
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """
+    Lists queries whose median time grew by more than threshold (a ratio,
+    0.1 meaning 10%) against the baseline for the same graph and size.
+    """
+    previous = {(entry["graph"], entry["nodes"]): entry
+                for entry in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        old = previous.get((entry["graph"], entry["nodes"]))
+        if old is None:
+            continue
+        for query, stats in entry["queries"].items():
+            old_stats = old["queries"].get(query)
+            if not old_stats or not old_stats["ms"] or not stats["ms"]:
+                continue
+            ratio = stats["ms"]["p50"] / old_stats["ms"]["p50"]
+            line = (f"{entry['graph']} {entry['nodes']:,} {query}: "
+                    f"{old_stats['ms']['p50']:.2f} -> "
+                    f"{stats['ms']['p50']:.2f} ms ({ratio:.2f}x)")
+            print(line)
+            if ratio > 1 + threshold:
+                regressions.append(line)
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark routing queries on synthetic road networks."
+    )
+    parser.add_argument("--graphs", default=",".join(GRAPH_KINDS),
+                        type=lambda value: value.split(","),
+                        help="Comma-separated: " + ", ".join(GRAPH_KINDS))
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        type=lambda value: [int(size) for size in
+                                            value.split(",")],
+                        help="Comma-separated node counts, up to 1000000")
+    parser.add_argument("--queries", type=int, default=20,
+                        help="Origin/destination pairs per network")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed passes over the pairs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--departure", default="2024-12-20T08:30:00",
+                        help="ISO departure time for every query")
+    parser.add_argument("--cache-dir",
+                        default=os.path.join(tempfile.gettempdir(),
+                                             "map-navigator-benchmark"),
+                        help="Where generated networks are kept")
+    parser.add_argument("--output", help="Write JSON results here")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Earlier JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Median slowdown reported as a regression")
+    args = parser.parse_args()
+    unknown = set(args.graphs) - set(GRAPH_KINDS)
+    if unknown:
+        parser.error(f"Unknown graph kinds: {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over "
+                  f"{args.threshold:.0%}:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
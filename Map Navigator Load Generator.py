@@ -0,0 +1,107 @@
+import asyncio
+import argparse
+import json
+import math
+import random
+from collections import Counter
+from time import perf_counter
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+# Load generator for the routing service started with
+# python "Map Navigator.py" serve --map FILE
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  host: str, target: str) -> Tuple[int, object]:
+    """
+    Sends one keep-alive GET request and returns (status, decoded JSON).
+    """
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, json.loads(body) if body else None
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)), 1) - 1]
+
+async def client(host: str, port: int, endpoint: str, locations: List[str],
+                 deadline: float, departure: str, statuses: Counter,
+                 latencies: List[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while perf_counter() < deadline:
+            start, end = random.sample(locations, 2)
+            query = {"start": start, "end": end}
+            if departure:
+                query["time"] = departure
+            started = perf_counter()
+            status, _ = await request(reader, writer, host,
+                                      f"{endpoint}?{urlencode(query)}")
+            latencies.append((perf_counter() - started) * 1000)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+async def run(args: argparse.Namespace) -> Dict:
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, locations = await request(reader, writer, args.host, "/locations")
+
+    statuses = Counter()
+    latencies = []
+    started = perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        client(args.host, args.port, args.endpoint, locations, deadline,
+               args.time, statuses, latencies)
+        for _ in range(args.concurrency)
+    ))
+    elapsed = perf_counter() - started
+
+    _, server_stats = await request(reader, writer, args.host, "/stats")
+    writer.close()
+    latencies.sort()
+    return {
+        "endpoint": args.endpoint,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,
+        "statuses": dict(statuses),
+        "client_p50_ms": percentile(latencies, 0.50),
+        "client_p90_ms": percentile(latencies, 0.90),
+        "client_p99_ms": percentile(latencies, 0.99),
+        "server": server_stats
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure routing service throughput on one machine."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--endpoint", default="/route",
+                        choices=("/route", "/eta", "/timing-report"))
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Open keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="Seconds to keep sending requests")
+    parser.add_argument("--time", default=None,
+                        help="ISO departure time sent with every request")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -18,27 +18,190 @@ def is_valid(board, row, col, num):
     
     return True
 
+# Candidate digits are bitmasks: bit d set means digit d (1-9) is possible
+ALL_DIGITS = 0b1111111110
+BIT_COUNT = [bin(mask).count("1") for mask in range(1 << 10)]
+DIGIT_OF = {1 << d: d for d in range(1, 10)}
+BITS_OF = [[1 << d for d in range(1, 10) if mask >> d & 1]
+           for mask in range(1 << 10)]
+
+# Row, column and box of each of the 81 cells, numbered row by row
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [3 * (i // 27) + (i % 9) // 3 for i in range(81)]
+UNITS = ([[9 * r + c for c in range(9)] for r in range(9)] +
+         [[9 * r + c for r in range(9)] for c in range(9)] +
+         [[9 * (3 * (b // 3) + i // 3) + 3 * (b % 3) + i % 3
+           for i in range(9)] for b in range(9)])
+
+class SudokuEngine:
+    """
+    Solves a 9x9 Sudoku by constraint propagation and backtracking.
+
+    Each row, column and box keeps a bitmask of the digits already placed
+    in it, updated as digits are placed and removed, so the candidates of a
+    cell are one OR and one AND away. Before every guess the engine fills
+    naked singles (cells with one candidate) and hidden singles (digits
+    with one possible cell in a unit) until nothing changes, then guesses
+    on the cell with the fewest candidates, or on the digit with the fewest
+    possible cells in a unit if that is fewer still.
+    """
+
+    def __init__(self, board):
+        self.cells = [board[r][c] for r in range(9) for c in range(9)]
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.options = [0] * 81  # Candidates of empty cells, see propagate
+        self.valid = True
+        for i, digit in enumerate(self.cells):
+            if digit:
+                bit = 1 << digit
+                if (self.rows[ROW_OF[i]] | self.cols[COL_OF[i]] |
+                        self.boxes[BOX_OF[i]]) & bit:
+                    self.valid = False  # The clues already clash
+                self.rows[ROW_OF[i]] |= bit
+                self.cols[COL_OF[i]] |= bit
+                self.boxes[BOX_OF[i]] |= bit
+
+    def candidates(self, i):
+        return ALL_DIGITS & ~(self.rows[ROW_OF[i]] | self.cols[COL_OF[i]] |
+                              self.boxes[BOX_OF[i]])
+
+    def place(self, i, bit, trail):
+        self.cells[i] = DIGIT_OF[bit]
+        self.rows[ROW_OF[i]] |= bit
+        self.cols[COL_OF[i]] |= bit
+        self.boxes[BOX_OF[i]] |= bit
+        trail.append(i)
+
+    def undo(self, trail):
+        for i in trail:
+            bit = ~(1 << self.cells[i])
+            self.rows[ROW_OF[i]] &= bit
+            self.cols[COL_OF[i]] &= bit
+            self.boxes[BOX_OF[i]] &= bit
+            self.cells[i] = 0
+        trail.clear()
+
+    def propagate(self, trail):
+        """
+        Fills naked and hidden singles until neither is left. Returns False
+        as soon as a dead end shows. On success self.options holds the exact
+        candidates of every empty cell.
+        """
+        cells, rows, cols, boxes = self.cells, self.rows, self.cols, self.boxes
+        options = self.options
+        empty = [i for i in range(81) if cells[i] == 0]
+        while True:
+            # Naked singles until none are left
+            progress = True
+            while progress:
+                progress = False
+                still_empty = []
+                for i in empty:
+                    candidates = ALL_DIGITS & ~(rows[ROW_OF[i]] |
+                                                cols[COL_OF[i]] |
+                                                boxes[BOX_OF[i]])
+                    if candidates & (candidates - 1):
+                        options[i] = candidates
+                        still_empty.append(i)
+                    elif candidates:
+                        self.place(i, candidates, trail)
+                        progress = True
+                    else:
+                        return False
+                empty = still_empty
+            if not empty:
+                return True
+
+            # Then hidden singles. options may still list digits placed
+            # during this scan; that only hides singles, never invents them,
+            # and each one is checked against the live masks before placing.
+            for unit in UNITS:
+                seen_once = seen_twice = placed = 0
+                for i in unit:
+                    if cells[i]:
+                        placed |= 1 << cells[i]
+                    else:
+                        candidates = options[i]
+                        seen_twice |= seen_once & candidates
+                        seen_once |= candidates
+                if seen_once | placed != ALL_DIGITS:
+                    return False  # Some digit fits nowhere in this unit
+                hidden = seen_once & ~seen_twice & ~placed
+                if hidden:
+                    for i in unit:
+                        if cells[i] == 0:
+                            bit = self.candidates(i) & hidden
+                            if bit:
+                                if bit & (bit - 1):
+                                    return False  # Two digits need this cell
+                                self.place(i, bit, trail)
+                                progress = True
+            if not progress:
+                return True
+            empty = [i for i in empty if cells[i] == 0]
+
+    def choose(self):
+        """
+        Picks what to branch on: the empty cell with the fewest candidates,
+        or a digit with even fewer possible cells in some unit. Returns a
+        list of (cell, bit) alternatives, empty if the board is full.
+        """
+        cells, options = self.cells, self.options
+        best_cell, best_count = -1, 10
+        for i in range(81):
+            if cells[i] == 0:
+                count = BIT_COUNT[options[i]]
+                if count < best_count:
+                    best_cell, best_count = i, count
+                    if count == 2:
+                        break
+        if best_cell == -1:
+            return []
+        best = [(best_cell, bit) for bit in BITS_OF[options[best_cell]]]
+        if best_count == 2:
+            return best
+        for unit in UNITS:
+            empty = [i for i in unit if cells[i] == 0]
+            missing = 0
+            for i in empty:
+                missing |= options[i]
+            for bit in BITS_OF[missing]:
+                places = [i for i in empty if options[i] & bit]
+                if len(places) < len(best):
+                    best = [(i, bit) for i in places]
+                    if len(best) == 2:
+                        return best
+        return best
+
+    def search(self):
+        trail = []
+        if self.propagate(trail):
+            alternatives = self.choose()
+            if not alternatives:
+                return True
+            for i, bit in alternatives:
+                guess = []
+                self.place(i, bit, guess)
+                if self.search():
+                    return True
+                self.undo(guess)
+        self.undo(trail)
+        return False
+
+    def solve(self):
+        return self.valid and self.search()
+
 def solve_sudoku(board):
-    # Find the next empty spot (represented by 0)
+    # Solve in place; the board is left unchanged if there is no solution
+    engine = SudokuEngine(board)
+    if not engine.solve():
+        return False
     for row in range(9):
         for col in range(9):
-            if board[row][col] == 0:
-                # Try placing numbers 1 through 9
-                for num in range(1, 10):
-                    if is_valid(board, row, col, num):
-                        board[row][col] = num
-                        
-                        # Recur to fill the rest of the board
-                        if solve_sudoku(board):
-                            return True
-                        
-                        # Backtrack
-                        board[row][col] = 0
-                        
-                # If no valid number can be placed, return False (backtrack)
-                return False
-    
-    # If no empty spot is found, the puzzle is solved
+            board[row][col] = engine.cells[9 * row + col]
     return True
 
 def print_board(board):
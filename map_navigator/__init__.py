@@ -0,0 +1,56 @@
+"""Time-aware road navigation for city maps.
+
+Importing the package only loads the pure-Python routing core. folium is
+imported by the visualization methods, pandas and NumPy by the bulk importer,
+distance matrices and all-pairs tables, and the HTTP service on first use.
+"""
+from importlib import import_module
+
+from .cache import RouteCache
+from .dynamic import DynamicShortestPathTree
+from .geometry import EARTH_RADIUS_KM, convex_hull, haversine_km
+from .graph import (CompiledGraph, EdgeWeightTable, NameIndex, SearchWorkspace,
+                    StringTable)
+from .hierarchy import ContractionHierarchy
+from .history import HotRouteTable, RouteHistory
+from .mapfile import MAPPED_ATTRIBUTES, MapFile
+from .navigator import EnhancedMapNavigator
+from .profiling import QueryProfile, SearchProfiler
+from .schedule import DayOfWeek, LocationSchedule, TimeWindow
+from .spatial import SpatialIndex
+from .tour import TourPlanner
+from .traffic import (DEFAULT_SPEED_KMH, ROAD_TYPE_MULTIPLIERS,
+                      hourly_multipliers, parse_time_window)
+
+# Public names whose modules pull in heavier dependencies, loaded on access
+_LAZY = {
+    "AllPairsTable": "allpairs",
+    "NetworkImporter": "importer",
+    "GEOJSON_LINES_SUFFIXES": "importer",
+    "peak_memory_mb": "importer",
+    "print_import_progress": "importer",
+    "RoutingService": "service",
+    "percentile": "service",
+    "serve": "service",
+    "main": "cli",
+    "run": "cli",
+}
+
+__all__ = [
+    "CompiledGraph", "ContractionHierarchy", "DayOfWeek", "DEFAULT_SPEED_KMH",
+    "DynamicShortestPathTree", "EARTH_RADIUS_KM", "EdgeWeightTable",
+    "EnhancedMapNavigator", "HotRouteTable", "LocationSchedule",
+    "MAPPED_ATTRIBUTES", "MapFile", "NameIndex", "QueryProfile",
+    "ROAD_TYPE_MULTIPLIERS", "RouteCache", "RouteHistory", "SearchProfiler",
+    "SearchWorkspace", "SpatialIndex", "StringTable", "TimeWindow",
+    "TourPlanner",
+    "convex_hull", "haversine_km", "hourly_multipliers", "parse_time_window",
+]
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,215 @@
+"""Precomputed all-pairs distance and next-hop tables.
+
+Needs NumPy, so the navigator only imports this module from build_all_pairs
+and load_all_pairs.
+"""
+import heapq
+import math
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .graph import CompiledGraph
+
+# Graph and weight vectors shared read-only by table worker processes
+_table_reverse = None
+_table_weights = None
+
+def _init_table_worker(reverse: Tuple, weight_vectors: List[array]) -> None:
+    global _table_reverse, _table_weights
+    _table_reverse = reverse
+    _table_weights = weight_vectors
+
+def _table_columns(matrix: int, targets: List[int]
+                   ) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    # One reverse search per target: distance to it and first arc towards it
+    offsets, sources, arcs = _table_reverse
+    weights = _table_weights[matrix]
+    node_count = len(offsets) - 1
+    columns = []
+    for target in targets:
+        distances = [math.inf] * node_count
+        next_arcs = [-1] * node_count
+        distances[target] = 0.0
+        pq = [(0.0, target)]
+        while pq:
+            current_distance, v = heapq.heappop(pq)
+            if current_distance > distances[v]:
+                continue
+            for j in range(offsets[v], offsets[v + 1]):
+                k = arcs[j]
+                u = sources[j]
+                new_distance = current_distance + weights[k]
+                if new_distance < distances[u]:
+                    distances[u] = new_distance
+                    next_arcs[u] = k
+                    heapq.heappush(pq, (new_distance, u))
+        columns.append((target, np.array(distances, dtype=np.float32),
+                        np.array(next_arcs, dtype=np.int32)))
+    return columns
+
+class AllPairsTable:
+    """
+    Distance and next-hop matrices between every pair of nodes, one pair of
+    matrices per distinct arc weight vector.
+
+    ``distances[m, u, t]`` is the float32 cost from u to t under weight
+    vector m and ``next_arcs[m, u, t]`` the int32 index of the first arc on
+    that route, -1 if t is unreachable or u is t. A route is read by
+    following next arcs, so no query ever searches. Time slices with the
+    same traffic share a matrix, and a query is answered whenever the
+    navigator's current weight vector equals one of the stored ones; any
+    other vector (a construction zone the table was not built for, say)
+    is left to the regular search.
+
+    Memory is 8 bytes per node pair and weight vector, which suits maps of
+    a few thousand nodes.
+    """
+
+    def __init__(self, fingerprint: int, weights: np.ndarray,
+                 distances: np.ndarray, next_arcs: np.ndarray):
+        self.fingerprint = fingerprint
+        self.weights = weights
+        self.distances = distances
+        self.next_arcs = next_arcs
+        self.compiled = None  # Graph the fingerprint was last checked on
+        self._keys = {weights[m].tobytes(): m for m in range(len(weights))}
+        self._matrices = {}  # id(weight vector) -> (vector, matrix or None)
+
+    @property
+    def matrix_count(self) -> int:
+        return len(self.weights)
+
+    @property
+    def nbytes(self) -> int:
+        return self.distances.nbytes + self.next_arcs.nbytes
+
+    @classmethod
+    def build(cls, compiled: CompiledGraph, weight_vectors: List[array],
+              processes: int = 1) -> "AllPairsTable":
+        """
+        Runs one reverse Dijkstra per destination and weight vector.
+
+        On sparse road graphs this is V searches of O(E log V) each, well
+        below the O(V^3) of Floyd-Warshall.
+
+        Args:
+            compiled: Graph to tabulate
+            weight_vectors: Arc weight vectors; duplicates are stored once
+            processes: Worker processes for the searches; 1 runs them all
+                in this process
+
+        Returns:
+            The built AllPairsTable
+        """
+        unique = {}
+        for weights in weight_vectors:
+            unique.setdefault(bytes(weights), weights)
+        vectors = list(unique.values())
+        node_count = compiled.node_count
+        reverse = compiled.reverse_arcs()
+
+        # Rows are filled per destination, then transposed to [source, target]
+        distances = np.empty((len(vectors), node_count, node_count),
+                             dtype=np.float32)
+        next_arcs = np.empty((len(vectors), node_count, node_count),
+                             dtype=np.int32)
+        jobs = [(m, list(range(start, min(start + 64, node_count))))
+                for m in range(len(vectors))
+                for start in range(0, node_count, 64)]
+        processes = min(processes, len(jobs))
+        if processes > 1:
+            if "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+            else:
+                context = None
+            with ProcessPoolExecutor(processes, mp_context=context,
+                                     initializer=_init_table_worker,
+                                     initargs=(reverse, vectors)) as pool:
+                results = pool.map(_table_columns, *zip(*jobs))
+                for (m, _), columns in zip(jobs, results):
+                    for target, column, arcs in columns:
+                        distances[m, target] = column
+                        next_arcs[m, target] = arcs
+        else:
+            _init_table_worker(reverse, vectors)
+            for m, targets in jobs:
+                for target, column, arcs in _table_columns(m, targets):
+                    distances[m, target] = column
+                    next_arcs[m, target] = arcs
+        for m in range(len(vectors)):
+            distances[m] = distances[m].T.copy()
+            next_arcs[m] = next_arcs[m].T.copy()
+
+        weights = np.array([np.frombuffer(w, dtype=np.float64)
+                            for w in vectors]).reshape(len(vectors),
+                                                       compiled.arc_count)
+        table = cls(compiled.fingerprint(), weights, distances, next_arcs)
+        table.compiled = compiled
+        return table
+
+    def matrix_for(self, compiled: CompiledGraph,
+                   weights: array) -> Optional[int]:
+        """
+        Returns the matrix that answers queries under the given weight
+        vector, or None if the table does not cover it.
+        """
+        if compiled is not self.compiled:
+            if compiled.fingerprint() != self.fingerprint:
+                return None
+            self.compiled = compiled
+        cached = self._matrices.get(id(weights))
+        if cached is None or cached[0] is not weights:
+            cached = (weights, self._keys.get(bytes(weights)))
+            self._matrices[id(weights)] = cached
+        return cached[1]
+
+    def path_arcs(self, matrix: int, source: int,
+                  target: int) -> Optional[List[int]]:
+        """
+        Arc indices of the stored route from source to target, or None if
+        target is unreachable.
+        """
+        if source == target:
+            return []
+        next_arcs = self.next_arcs[matrix]
+        targets = self.compiled.targets
+        if next_arcs[source, target] == -1:
+            return None
+        arcs = []
+        u = source
+        while u != target:
+            k = int(next_arcs[u, target])
+            arcs.append(k)
+            u = targets[k]
+        return arcs
+
+    def distance(self, matrix: int, source: int, target: int) -> float:
+        return float(self.distances[matrix, source, target])
+
+    def save(self, filename: str) -> None:
+        """
+        Saves the matrices and weight vectors as an uncompressed .npz file.
+
+        Args:
+            filename: Name of the file to save to
+        """
+        with open(filename, 'wb') as f:
+            np.savez(f, fingerprint=np.array(self.fingerprint, dtype=np.int64),
+                     weights=self.weights, distances=self.distances,
+                     next_arcs=self.next_arcs)
+
+    @classmethod
+    def load(cls, filename: str) -> "AllPairsTable":
+        """
+        Loads a table saved with save().
+
+        Args:
+            filename: Name of the file to load from
+        """
+        with np.load(filename) as data:
+            return cls(int(data["fingerprint"]), data["weights"],
+                       data["distances"], data["next_arcs"])
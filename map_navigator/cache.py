@@ -0,0 +1,82 @@
+"""LRU cache of routes and shortest-path trees."""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+class RouteCache:
+    """
+    Bounded LRU cache of routes and shortest-path trees.
+    
+    Entries are only valid for the navigator graph version they were
+    computed under; the whole cache is dropped as soon as the version moves.
+    Shortest-path trees answer any destination from an origin that keeps
+    showing up in the same traffic bucket.
+    """
+
+    def __init__(self, capacity: int = 1024, tree_capacity: int = 16):
+        self.capacity = capacity
+        self.tree_capacity = tree_capacity
+        self.version = None
+        self.routes = OrderedDict()
+        self.trees = OrderedDict()
+        self.origin_misses = {}
+        self.hits = 0
+        self.tree_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def sync(self, version: int) -> None:
+        """
+        Drops every entry if the graph version changed.
+        """
+        if version != self.version:
+            if self.routes or self.trees:
+                self.invalidations += 1
+            self.routes.clear()
+            self.trees.clear()
+            self.origin_misses.clear()
+            self.version = version
+
+    def get_route(self, key: Tuple) -> Optional[Tuple[List[str], float]]:
+        route = self.routes.get(key)
+        if route is None:
+            return None
+        self.routes.move_to_end(key)
+        self.hits += 1
+        return route
+
+    def put_route(self, key: Tuple, route: Tuple[List[str], float]) -> None:
+        self.routes[key] = route
+        self.routes.move_to_end(key)
+        while len(self.routes) > self.capacity:
+            self.routes.popitem(last=False)
+            self.evictions += 1
+
+    def get_tree(self, key: Tuple):
+        tree = self.trees.get(key)
+        if tree is not None:
+            self.trees.move_to_end(key)
+        return tree
+
+    def put_tree(self, key: Tuple, tree) -> None:
+        self.trees[key] = tree
+        self.trees.move_to_end(key)
+        while len(self.trees) > self.tree_capacity:
+            self.trees.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns hit/miss/eviction counters and the current sizes.
+        """
+        lookups = self.hits + self.tree_hits + self.misses
+        return {
+            "hits": self.hits,
+            "tree_hits": self.tree_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "routes": len(self.routes),
+            "trees": len(self.trees),
+            "hit_rate": (self.hits + self.tree_hits) / lookups if lookups else 0.0
+        }
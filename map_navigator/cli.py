@@ -0,0 +1,180 @@
+"""Delhi sample map and the interactive command line."""
+import sys
+from datetime import datetime, time
+from typing import List
+
+from .navigator import EnhancedMapNavigator
+from .schedule import DayOfWeek
+
+# Example usage
+def main() -> EnhancedMapNavigator:
+    # Create navigator instance
+    navigator = EnhancedMapNavigator()
+
+    # Add locations with metadata
+    locations_data = [
+        ("Connaught Place", 28.6277, 77.2208, "commercial", "Central business district"),
+        ("Karol Bagh", 28.6460, 77.2054, "shopping", "Popular shopping area"),
+        ("Chandni Chowk", 28.6500, 77.2300, "historical", "Historic market area"),
+        ("India Gate", 28.6129, 77.2295, "landmark", "War memorial"),
+        ("Saket", 28.5245, 77.1947, "residential", "Modern residential area"),
+        ("Red Fort", 28.6562, 77.2410, "historical", "Historic fort complex"),
+        ("Lajpat Nagar", 28.5638, 77.2341, "shopping", "Popular market area"),
+        ("Nehru Place", 28.5523, 77.2597, "commercial", "IT hub"),
+        ("Hauz Khas", 28.5494, 77.2001, "entertainment", "Cultural hub"),
+        ("Dwarka", 28.5823, 77.0500, "residential", "Suburban area"),
+        ("Vasant Kunj", 28.5200, 77.1500, "residential", "Upscale residential area"),
+        ("Greater Kailash", 28.5439, 77.2467, "residential", "Premium residential area")
+    ]
+
+    for loc_data in locations_data:
+        navigator.add_location(*loc_data)
+
+        # Add sample operating hours
+        for day in DayOfWeek:
+            if day in [DayOfWeek.SUNDAY]:
+                # Different hours for Sunday
+                hours = [(time(10, 0), time(20, 0))]
+            else:
+                # Regular hours
+                hours = [(time(9, 0), time(21, 0))]
+            navigator.set_operating_hours(loc_data[0], day, hours)
+
+    # Add roads with different types and, where known, speed limits
+    roads_data = [
+        ("Connaught Place", "Karol Bagh", 5, 1.2, "avenue", 40),
+        ("Karol Bagh", "Chandni Chowk", 3, 1.5, "street", 30),
+        ("Chandni Chowk", "India Gate", 4, 1.1, "avenue"),
+        ("India Gate", "Saket", 8, 1.3, "highway"),
+        ("Saket", "Connaught Place", 10, 1.0, "highway"),
+        ("Karol Bagh", "Saket", 7, 1.4, "street"),
+        ("Red Fort", "Chandni Chowk", 1, 1.2, "street"),
+        ("Lajpat Nagar", "Nehru Place", 5, 1.5, "avenue"),
+        ("Hauz Khas", "Saket", 4, 1.2, "street"),
+        ("Dwarka", "Vasant Kunj", 12, 1.1, "highway"),
+        ("Vasant Kunj", "Greater Kailash", 9, 1.3, "avenue"),
+        ("Greater Kailash", "Nehru Place", 3, 1.2, "street")
+    ]
+
+    for road in roads_data:
+        navigator.add_road(*road)
+
+    # Add time-based traffic patterns
+    traffic_patterns = {
+        "8-10": 2.0,    # Morning rush hour
+        "10-16": 1.2,   # Daytime
+        "16-19": 1.8,   # Evening rush hour
+        "19-22": 1.3,   # Evening
+        "22-8": 1.0     # Night
+    }
+
+    # Apply traffic patterns to major roads
+    major_routes = [
+        ("Connaught Place", "Karol Bagh"),
+        ("India Gate", "Saket"),
+        ("Dwarka", "Vasant Kunj"),
+        ("Lajpat Nagar", "Nehru Place")
+    ]
+
+    for route in major_routes:
+        navigator.add_traffic_pattern(*route, traffic_patterns)
+
+    # Add construction zones
+    navigator.add_construction_zone(
+        "Connaught Place",
+        "Karol Bagh",
+        datetime(2024, 12, 1),
+        datetime(2024, 12, 31),
+        1.5
+    )
+
+    # Add weather impacts
+    navigator.add_weather_impact(
+        datetime(2024, 12, 20),
+        1.3,
+        "Heavy Rain"
+    )
+
+    return navigator
+
+def run(argv: List[str] = None) -> None:
+    """
+    Command-line entry point. ``serve`` starts the routing service, anything
+    else runs the interactive route planner on the Delhi sample map.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["serve"]:
+        from .service import serve
+        serve(argv[1:])
+        return
+
+    navigator = main()
+
+    print("Delhi Navigation System")
+    print("=" * 50)
+    print("\nAvailable locations:")
+    for location in sorted(navigator.locations.keys()):
+        metadata = navigator.location_metadata[location]
+        print(f"- {location} ({metadata['type']}): {metadata['description']}")
+
+    start = input("\nEnter starting location: ")
+    end = input("Enter destination: ")
+    if start not in navigator.locations or end not in navigator.locations:
+        print("Invalid location(s). Please try again.")
+        return
+
+    # Get timing preferences
+    print("\nTiming Options:")
+    print("1. Depart now")
+    print("2. Arrive by specific time")
+    timing_choice = input("Choose option (1/2): ")
+
+    current_time = datetime.now()
+
+    if timing_choice == "1":
+        departure_time = current_time
+    else:
+        hour = int(input("Enter arrival hour (0-23): "))
+        minute = int(input("Enter arrival minute (0-59): "))
+        target_arrival = datetime.combine(
+            current_time.date(),
+            time(hour, minute)
+        )
+        departure_time = navigator.get_optimal_departure_time(
+            start, end, target_arrival
+        )
+        if departure_time is None:
+            print("No departure in the search window arrives in time.")
+            return
+
+    # Generate and display timing report
+    report = navigator.generate_timing_report(start, end, departure_time)
+
+    if report:
+        print("\nRoute Timing Report")
+        print("=" * 50)
+        print(f"Departure: {report['departure_time'].strftime('%H:%M')}")
+        print(f"Arrival: {report['arrival_time'].strftime('%H:%M')}")
+        print(f"Total Distance: {report['total_distance']:.1f} km")
+        print(f"Total Time: {report['total_time']}")
+
+        print("\nSegment Details:")
+        for segment in report["segments"]:
+            print(f"\n{segment['from']} → {segment['to']}")
+            print(f"Distance: {segment['distance']:.1f} km")
+            print(f"Duration: {segment['duration']}")
+            print("Factors:")
+            for factor, value in segment['factors'].items():
+                print(f"  - {factor}: {value:.2f}x")
+
+        # Visualize route
+        navigator.visualize_route(start, end,
+                               [seg['from'] for seg in report['segments']] +
+                               [report['segments'][-1]['to']],
+                               current_time=departure_time)
+
+        # Save map data
+        navigator.save_to_json("delhi_map_data.json")
+    else:
+        print("Could not calculate route.")
@@ -0,0 +1,123 @@
+"""Shortest-path trees repaired in place after weight changes."""
+import heapq
+import math
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+from .graph import CompiledGraph
+
+class DynamicShortestPathTree:
+    """
+    Shortest-path tree from one origin, repaired in place when arc weights
+    change, after Ramalingam and Reps.
+    
+    A slower tree arc invalidates only the subtree hanging below it. Those
+    nodes are re-seeded from their unaffected in-neighbours, and a faster
+    arc seeds its head. A Dijkstra pass over just the changed labels then
+    restores the tree, so an update costs time in proportion to the part of
+    the tree it changes rather than to the graph.
+    """
+
+    def __init__(self, compiled: CompiledGraph, weights: array, source: int):
+        self.compiled = compiled
+        self.weights = array('d', weights)  # Own copy, patched by update()
+        self.source = source
+        self.distances = [math.inf] * compiled.node_count
+        self.parent_arcs = [-1] * compiled.node_count
+        self.distances[source] = 0.0
+        self._settle([(0.0, source)])
+
+    def _settle(self, pq: List[Tuple[float, int]]) -> int:
+        offsets = self.compiled.offsets
+        targets = self.compiled.targets
+        weights = self.weights
+        distances = self.distances
+        parent_arcs = self.parent_arcs
+        settled = 0
+        while pq:
+            current_distance, u = heapq.heappop(pq)
+            if current_distance > distances[u]:
+                continue
+            settled += 1
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                new_distance = current_distance + weights[k]
+                if new_distance < distances[v]:
+                    distances[v] = new_distance
+                    parent_arcs[v] = k
+                    heapq.heappush(pq, (new_distance, v))
+        return settled
+
+    def tail(self, arc: int) -> int:
+        return bisect_right(self.compiled.offsets, arc) - 1
+
+    def update(self, changes: Dict[int, float]) -> int:
+        """
+        Applies new weights to some arcs and repairs the tree.
+        
+        Args:
+            changes: New weight per arc index; math.inf closes an arc
+        
+        Returns:
+            Number of nodes whose distance had to be recomputed
+        """
+        offsets = self.compiled.offsets
+        targets = self.compiled.targets
+        weights = self.weights
+        distances = self.distances
+        parent_arcs = self.parent_arcs
+
+        roots = []
+        for k, weight in changes.items():
+            if weight > weights[k] and parent_arcs[targets[k]] == k:
+                roots.append(targets[k])
+            weights[k] = weight
+
+        # Everything below a tree arc that got slower loses its label
+        affected = set()
+        while roots:
+            v = roots.pop()
+            if v in affected:
+                continue
+            affected.add(v)
+            for k in range(offsets[v], offsets[v + 1]):
+                if parent_arcs[targets[k]] == k:
+                    roots.append(targets[k])
+        for v in affected:
+            distances[v] = math.inf
+            parent_arcs[v] = -1
+
+        pq = []
+        reverse_offsets, sources, arc_map = self.compiled.reverse_arcs()
+        for v in affected:
+            for i in range(reverse_offsets[v], reverse_offsets[v + 1]):
+                k = arc_map[i]
+                new_distance = distances[sources[i]] + weights[k]
+                if new_distance < distances[v]:
+                    distances[v] = new_distance
+                    parent_arcs[v] = k
+            if distances[v] < math.inf:
+                heapq.heappush(pq, (distances[v], v))
+
+        for k in changes:
+            v = targets[k]
+            new_distance = distances[self.tail(k)] + weights[k]
+            if new_distance < distances[v]:
+                distances[v] = new_distance
+                parent_arcs[v] = k
+                heapq.heappush(pq, (new_distance, v))
+
+        return len(affected) + self._settle(pq)
+
+    def path(self, target: int) -> List[int]:
+        """
+        Returns the node ids from the origin to target, or [] if unreachable.
+        """
+        if self.distances[target] == math.inf:
+            return []
+        path = [target]
+        while path[-1] != self.source:
+            path.append(self.tail(self.parent_arcs[path[-1]]))
+        path.reverse()
+        return path
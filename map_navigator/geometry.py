@@ -0,0 +1,43 @@
+"""Great-circle distances and planar hulls."""
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance in kilometers on a spherical earth.
+    
+    Cheaper than geopy's ellipsoidal geodesic and a true metric, which is
+    what the A* lower bound needs.
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) *
+         math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def convex_hull(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Convex hull of (latitude, longitude) points, counter-clockwise, by
+    Andrew's monotone chain.
+    """
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower = []
+    for point in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    upper = []
+    for point in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    return lower[:-1] + upper[:-1]
@@ -0,0 +1,740 @@
+"""Array-based (CSR) graph, precompiled edge weights and search buffers."""
+import heapq
+import math
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from .geometry import haversine_km
+from .traffic import (DEFAULT_SPEED_KMH, PWL_EPSILON, hourly_multipliers,
+                      pwl_simplify)
+
+if TYPE_CHECKING:
+    from .mapfile import MapFile
+
+class StringTable(Sequence):
+    """
+    Read-only list of names stored as one NUL-separated UTF-8 blob.
+    
+    ``starts[i]`` is where name i begins in the blob, with one extra entry
+    past the end, and ``order`` lists the ids sorted by name so lookups are a
+    binary search instead of a dict holding every name.
+    """
+
+    def __init__(self, blob, starts, order):
+        self.blob = blob
+        self.starts = starts
+        self.order = order
+        self.index = NameIndex(self)
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return bytes(
+            self.blob[self.starts[i]:self.starts[i + 1] - 1]
+        ).decode("utf-8")
+
+    def lookup(self, name: str) -> int:
+        """
+        Returns the id of a name, or -1 if it is not in the table.
+        """
+        key = name.encode("utf-8")
+        order = self.order
+        low, high = 0, len(order)
+        while low < high:
+            mid = (low + high) // 2
+            i = order[mid]
+            if bytes(self.blob[self.starts[i]:self.starts[i + 1] - 1]) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(order) and self[order[low]] == name:
+            return order[low]
+        return -1
+
+class NameIndex(Mapping):
+    """
+    Name -> id mapping backed by a StringTable.
+    """
+
+    def __init__(self, table: StringTable):
+        self.table = table
+
+    def __getitem__(self, name: str) -> int:
+        i = self.table.lookup(name)
+        if i == -1:
+            raise KeyError(name)
+        return i
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and self.table.lookup(name) != -1
+
+    def __iter__(self):
+        return iter(self.table)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+class CompiledGraph:
+    """
+    Integer-indexed CSR (compressed sparse row) snapshot of a navigator graph.
+
+    Locations are mapped to dense ids ``0..n-1``. The roads leaving node ``u``
+    occupy positions ``offsets[u]:offsets[u + 1]`` of the parallel edge arrays,
+    so the search loop only does integer indexing instead of string hashing.
+    Both directions of a road share the same ``edge_id``.
+    """
+
+    def __init__(self, names: List[str], offsets: array, targets: array,
+                 distance: array, base_traffic: array,
+                 road_multiplier: array, speed: array, edge_id: array,
+                 traffic_pattern: array, pattern_tables: List[List[float]],
+                 latitude: array, longitude: array,
+                 index: Mapping = None):
+        self.names = names
+        if index is None:
+            index = {name: i for i, name in enumerate(names)}
+        self.index = index
+        self.latitude = latitude
+        self.longitude = longitude
+        self.offsets = offsets
+        self.targets = targets
+        self.distance = distance
+        self.base_traffic = base_traffic
+        self.road_multiplier = road_multiplier
+        self.speed = speed  # Speed limit in km/h
+        self.edge_id = edge_id
+        # Index into pattern_tables; 0 is the "no pattern" table of 1.0s
+        self.traffic_pattern = traffic_pattern
+        self.pattern_tables = pattern_tables
+        self._reverse = None
+        self._fingerprint = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def arc_count(self) -> int:
+        return len(self.targets)
+
+    @classmethod
+    def from_navigator(cls, navigator) -> "CompiledGraph":
+        """
+        Builds the CSR arrays from a navigator's dict-of-lists graph.
+
+        Args:
+            navigator: EnhancedMapNavigator to compile
+
+        Returns:
+            A new CompiledGraph
+        """
+        names = list(navigator.graph)
+        index = {name: i for i, name in enumerate(names)}
+        latitude = array('d', (navigator.locations[u][0] for u in names))
+        longitude = array('d', (navigator.locations[u][1] for u in names))
+
+        offsets = array('q', [0])
+        targets = array('i')
+        distance = array('d')
+        base_traffic = array('d')
+        road_multiplier = array('d')
+        speed = array('d')
+        edge_id = array('i')
+        traffic_pattern = array('i')
+
+        pattern_tables = [[1.0] * 24]
+        pattern_ids = {}
+        pending_reverse = {}  # (u, v) -> edge ids still waiting for v -> u
+        next_edge = 0
+
+        for u in names:
+            for v, dist, traffic in navigator.graph[u]:
+                targets.append(index[v])
+                distance.append(dist)
+                base_traffic.append(traffic)
+
+                road_type = navigator.road_types.get(
+                    f"{u}-{v}", navigator.road_types.get(f"{v}-{u}", "street")
+                )
+                road_multiplier.append(
+                    navigator.get_road_type_multiplier(road_type)
+                )
+                speed.append(navigator.speed_limits.get(
+                    f"{u}-{v}",
+                    navigator.speed_limits.get(f"{v}-{u}", DEFAULT_SPEED_KMH)
+                ))
+
+                waiting = pending_reverse.get((v, u))
+                if waiting:
+                    edge_id.append(waiting.pop())
+                else:
+                    edge_id.append(next_edge)
+                    pending_reverse.setdefault((u, v), []).append(next_edge)
+                    next_edge += 1
+
+                patterns = navigator.traffic_patterns.get(f"{u}-{v}")
+                if patterns is None:
+                    traffic_pattern.append(0)
+                else:
+                    key = id(patterns)
+                    if key not in pattern_ids:
+                        pattern_ids[key] = len(pattern_tables)
+                        pattern_tables.append(hourly_multipliers(patterns))
+                    traffic_pattern.append(pattern_ids[key])
+            offsets.append(len(targets))
+
+        return cls(names, offsets, targets, distance, base_traffic,
+                   road_multiplier, speed, edge_id, traffic_pattern,
+                   pattern_tables, latitude, longitude)
+
+    @classmethod
+    def from_map_file(cls, map_file: "MapFile") -> "CompiledGraph":
+        """
+        Wraps the sections of a binary map without copying them.
+        
+        Args:
+            map_file: Opened MapFile
+        
+        Returns:
+            A CompiledGraph whose arrays are views over the mapped file
+        """
+        names = StringTable(map_file.section("names"),
+                            map_file.section("name_starts"),
+                            map_file.section("name_order"))
+        tables = map_file.section("pattern_tables")
+        pattern_tables = [tables[i:i + 24] for i in range(0, len(tables), 24)]
+        return cls(names, map_file.section("offsets"),
+                   map_file.section("targets"), map_file.section("distance"),
+                   map_file.section("base_traffic"),
+                   map_file.section("road_multiplier"),
+                   map_file.section("speed"), map_file.section("edge_id"),
+                   map_file.section("traffic_pattern"), pattern_tables,
+                   map_file.section("latitude"),
+                   map_file.section("longitude"), index=names.index)
+
+    def names_blob(self) -> bytes:
+        """
+        Returns the location names as one NUL-separated UTF-8 string, the
+        layout of the binary map string table.
+        """
+        if isinstance(self.names, StringTable):
+            return self.names.blob
+        return "\0".join(self.names).encode("utf-8")
+
+    def fingerprint(self) -> int:
+        """
+        Returns a CRC-32 of the names and arc topology, which tables
+        precomputed for this graph store to recognize it after loading.
+        Weights are not included. Computed on first use and kept, since
+        the topology of a CompiledGraph never changes.
+        """
+        if self._fingerprint is None:
+            checksum = zlib.crc32(self.names_blob())
+            checksum = zlib.crc32(self.offsets.tobytes(), checksum)
+            self._fingerprint = zlib.crc32(self.targets.tobytes(), checksum)
+        return self._fingerprint
+
+    def traffic_multipliers(self, hour: int) -> List[float]:
+        """
+        Returns the multiplier of every traffic pattern for the given hour,
+        indexed like ``traffic_pattern``.
+        """
+        return [table[hour] for table in self.pattern_tables]
+
+    def node_km(self, u: int, v: int) -> float:
+        """
+        Straight-line distance between two nodes in kilometers.
+        """
+        return haversine_km(self.latitude[u], self.longitude[u],
+                            self.latitude[v], self.longitude[v])
+
+    def reverse_arcs(self) -> Tuple[array, array, array]:
+        """
+        Returns the transposed CSR as (offsets, sources, arcs).
+        
+        The arcs entering node v are ``arcs[offsets[v]:offsets[v + 1]]``,
+        given as indices into the forward arrays so weight vectors are shared,
+        and ``sources`` holds the tail of each of them.
+        """
+        if self._reverse is None:
+            node_count = self.node_count
+            counts = [0] * (node_count + 1)
+            for v in self.targets:
+                counts[v + 1] += 1
+            for v in range(node_count):
+                counts[v + 1] += counts[v]
+            reverse_offsets = array('q', counts)
+
+            fill = counts[:-1]
+            sources = array('i', bytes(4 * self.arc_count))
+            arcs = array('i', bytes(4 * self.arc_count))
+            for u in range(node_count):
+                for k in range(self.offsets[u], self.offsets[u + 1]):
+                    v = self.targets[k]
+                    sources[fill[v]] = u
+                    arcs[fill[v]] = k
+                    fill[v] += 1
+            self._reverse = (reverse_offsets, sources, arcs)
+        return self._reverse
+
+    def shortest_distances(self, weights: array, source: int,
+                           reverse: bool = False) -> List[float]:
+        """
+        Plain one-to-all Dijkstra over the given arc weights. With reverse,
+        the distances are from every node to source instead.
+        """
+        if reverse:
+            offsets, targets, arc_map = self.reverse_arcs()
+            weights = [weights[k] for k in arc_map]
+        else:
+            offsets = self.offsets
+            targets = self.targets
+        distances = [math.inf] * self.node_count
+        distances[source] = 0.0
+        pq = [(0.0, source)]
+        while pq:
+            current_distance, u = heapq.heappop(pq)
+            if current_distance > distances[u]:
+                continue
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                new_distance = current_distance + weights[k]
+                if new_distance < distances[v]:
+                    distances[v] = new_distance
+                    heapq.heappush(pq, (new_distance, v))
+        return distances
+
+    def find_arc(self, u: int, v: int, weights: array) -> int:
+        """
+        Returns the cheapest arc from u to v under the given weights, or -1.
+        """
+        best_arc = -1
+        for k in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[k] == v and (
+                best_arc == -1 or weights[k] < weights[best_arc]
+            ):
+                best_arc = k
+        return best_arc
+
+    def road_arcs(self, road_id: str) -> Tuple[int, ...]:
+        """
+        Returns every arc of the road named "location1-location2", in both
+        directions, or an empty tuple if the road is unknown.
+        """
+        for u_name, v_name in self._split_road_id(road_id):
+            u = self.index[u_name]
+            v = self.index[v_name]
+            arcs = [k for k in range(self.offsets[u], self.offsets[u + 1])
+                    if self.targets[k] == v]
+            edges = {self.edge_id[k] for k in arcs}
+            arcs += [k for k in range(self.offsets[v], self.offsets[v + 1])
+                     if self.targets[k] == u and self.edge_id[k] in edges]
+            return tuple(arcs)
+        return ()
+
+    def _split_road_id(self, road_id: str):
+        # Location names may contain '-', so try every split point
+        for i, char in enumerate(road_id):
+            if char == '-':
+                u_name, v_name = road_id[:i], road_id[i + 1:]
+                if u_name in self.index and v_name in self.index:
+                    yield u_name, v_name
+
+    def path_names(self, previous: List[int], target: int) -> List[str]:
+        """
+        Rebuilds the location names of a path from a predecessor array.
+        """
+        path = []
+        current = target
+        while current != -1:
+            path.append(self.names[current])
+            current = previous[current]
+        path.reverse()
+        return path
+
+class EdgeWeightTable:
+    """
+    Travel minutes for every arc of a CompiledGraph, precompiled per
+    time-of-day slice.
+    
+    A slice vector folds distance, speed limit, base traffic, road type and
+    the traffic pattern of that slice into one number per arc. Construction
+    zones are patched on top of the slice vector they overlap, and weather is
+    a per-date scalar, so routing and ETA read the same cost model without
+    parsing or string lookups per edge.
+    """
+
+    def __init__(self, navigator, compiled: CompiledGraph,
+                 slice_minutes: int = 60):
+        if slice_minutes <= 0 or 1440 % slice_minutes:
+            raise ValueError("slice_minutes must evenly divide a day")
+
+        self.compiled = compiled
+        self.slice_minutes = slice_minutes
+        self.slices_per_day = 1440 // slice_minutes
+        self.weather_impacts = navigator.weather_impacts
+
+        # Minutes at the speed limit, before any congestion factor
+        self.base_minutes = array('d', bytes(8 * compiled.arc_count))
+        # Minutes with base traffic and road type, before time-of-day traffic
+        self.free_flow = array('d', bytes(8 * compiled.arc_count))
+        for k in range(compiled.arc_count):
+            minutes = compiled.distance[k] / compiled.speed[k] * 60
+            self.base_minutes[k] = minutes
+            self.free_flow[k] = (minutes * compiled.base_traffic[k] *
+                                 compiled.road_multiplier[k])
+
+        self.construction = []
+        self._slices = {}
+        self._overlays = {}
+        self._lower_bound = None
+        self._minutes_per_km = None
+        self.update_construction(navigator.construction_zones)
+
+    def update_construction(self, construction_zones: Dict[str, Dict]) -> bool:
+        """
+        Re-reads the construction zones without rebuilding the slice vectors.
+        
+        Args:
+            construction_zones: The navigator's zones, keyed by road id
+        
+        Returns:
+            True if the lower-bound weights changed, which happens only when
+            a zone with a delay factor below 1.0 was added or removed
+        """
+        old_speedups = [zone for zone in self.construction if zone[3] < 1.0]
+
+        # Each zone applies to both directions of its road
+        self.construction = []
+        for road_id, zone in construction_zones.items():
+            arcs = self.compiled.road_arcs(road_id)
+            if arcs:
+                self.construction.append((
+                    arcs, zone["start_date"], zone["end_date"],
+                    zone["delay_factor"]
+                ))
+        self._overlays = {}
+
+        new_speedups = [zone for zone in self.construction if zone[3] < 1.0]
+        if old_speedups == new_speedups:
+            return False
+        self._lower_bound = None
+        self._minutes_per_km = None
+        return True
+
+    def slice_index(self, when: datetime) -> int:
+        """
+        Returns the time-of-day slice that contains the given time.
+        """
+        return (when.hour * 60 + when.minute) // self.slice_minutes
+
+    def slice_hour(self, slice_index: int) -> int:
+        return slice_index * self.slice_minutes // 60
+
+    def slice_weights(self, slice_index: int) -> array:
+        """
+        Returns the arc minutes for a time-of-day slice, ignoring construction
+        and weather. Each slice vector is built once and cached.
+        """
+        weights = self._slices.get(slice_index)
+        if weights is None:
+            compiled = self.compiled
+            hour_multiplier = compiled.traffic_multipliers(
+                self.slice_hour(slice_index)
+            )
+            if all(m == 1.0 for m in hour_multiplier):
+                weights = self.free_flow
+            else:
+                free_flow = self.free_flow
+                traffic_pattern = compiled.traffic_pattern
+                weights = array('d', [
+                    free_flow[k] * hour_multiplier[traffic_pattern[k]]
+                    for k in range(compiled.arc_count)
+                ])
+            self._slices[slice_index] = weights
+        return weights
+
+    def lower_bound_weights(self) -> array:
+        """
+        Returns, for every arc, the smallest minutes it can cost in any slice.
+        
+        Construction zones only lower this when their delay factor is below
+        1.0. Weather is applied to whole routes, so it is left out here too.
+        """
+        if self._lower_bound is None:
+            lower_bound = array('d', self.free_flow)
+            for table in self.compiled.pattern_tables[1:]:
+                if min(table) < 1.0:
+                    lower_bound = array('d', map(
+                        min, lower_bound,
+                        *(self.slice_weights(s)
+                          for s in range(self.slices_per_day))
+                    ))
+                    break
+            for arcs, _, _, delay_factor in self.construction:
+                if delay_factor < 1.0:
+                    for k in arcs:
+                        lower_bound[k] *= delay_factor
+            self._lower_bound = lower_bound
+        return self._lower_bound
+
+    def minutes_per_km(self) -> float:
+        """
+        Returns the fewest minutes any arc needs per straight-line kilometer.
+        
+        Multiplying a straight-line distance by this never overestimates the
+        cost of a path, whatever the slice, which keeps A* optimal.
+        """
+        if self._minutes_per_km is None:
+            compiled = self.compiled
+            lower_bound = self.lower_bound_weights()
+            best = math.inf
+            for u in range(compiled.node_count):
+                for k in range(compiled.offsets[u], compiled.offsets[u + 1]):
+                    km = compiled.node_km(u, compiled.targets[k])
+                    if km > 0:
+                        best = min(best, lower_bound[k] / km)
+            self._minutes_per_km = 0.0 if best == math.inf else best
+        return self._minutes_per_km
+
+    def active_construction(self, when: datetime) -> Tuple[int, ...]:
+        return tuple(
+            i for i, (_, start, end, _) in enumerate(self.construction)
+            if start <= when <= end
+        )
+
+    def weights_at(self, when: datetime) -> array:
+        """
+        Returns the arc minutes in effect at the given time, including any
+        active construction zones but not the weather factor.
+        """
+        slice_index = self.slice_index(when)
+        active = self.active_construction(when) if self.construction else ()
+        if not active:
+            return self.slice_weights(slice_index)
+
+        key = (slice_index, active)
+        weights = self._overlays.get(key)
+        if weights is None:
+            weights = array('d', self.slice_weights(slice_index))
+            for i in active:
+                arcs, _, _, delay_factor = self.construction[i]
+                for k in arcs:
+                    weights[k] *= delay_factor
+            self._overlays[key] = weights
+        return weights
+
+    def slice_vectors(self) -> List[array]:
+        """
+        Returns the slice weight vectors built so far.
+        """
+        return list(self._slices.values())
+
+    def arc_weight(self, arc: int, when: datetime) -> float:
+        """
+        Returns ``weights_at(when)[arc]`` without building the whole vector.
+        """
+        weight = self.slice_weights(self.slice_index(when))[arc]
+        for i in self.active_construction(when):
+            arcs, _, _, delay_factor = self.construction[i]
+            if arc in arcs:
+                weight *= delay_factor
+        return weight
+
+    def weather_factor(self, when: datetime) -> float:
+        weather = self.weather_impacts.get(when.date())
+        return weather["impact_factor"] if weather else 1.0
+
+    def arc_minutes(self, arc: int, when: datetime) -> float:
+        """
+        Returns the full travel time of one arc when entered at the given time.
+        """
+        return self.weights_at(when)[arc] * self.weather_factor(when)
+
+    def slice_clock(self, day_start: datetime):
+        """
+        Returns a memoized lookup from an absolute slice number, counted from
+        day_start, to the (weights, weather factor) in effect during it.
+        """
+        cache = {}
+
+        def lookup(slice_number: int) -> Tuple[array, float]:
+            entry = cache.get(slice_number)
+            if entry is None:
+                when = day_start + timedelta(
+                    minutes=slice_number * self.slice_minutes
+                )
+                entry = (self.weights_at(when), self.weather_factor(when))
+                cache[slice_number] = entry
+            return entry
+
+        return lookup
+
+    def traverse(self, arc: int, depart: float, clock) -> float:
+        """
+        Returns the arrival minute when entering an arc at minute depart.
+        
+        The speed on the arc changes at slice boundaries instead of the whole
+        arc taking the cost of the slice it was entered in. Leaving later
+        therefore never means arriving earlier (the FIFO property), which is
+        what keeps a time-dependent Dijkstra exact.
+        
+        Args:
+            arc: Arc index
+            depart: Minutes since the clock's day_start
+            clock: Lookup returned by slice_clock()
+        
+        Returns:
+            Arrival time in minutes since the clock's day_start
+        """
+        remaining = 1.0  # Fraction of the arc still to drive
+        current = depart
+        while True:
+            slice_number = int(current // self.slice_minutes)
+            weights, weather_factor = clock(slice_number)
+            cost = weights[arc] * weather_factor
+            if cost == math.inf:
+                return math.inf
+            slice_end = (slice_number + 1) * self.slice_minutes
+            if current + remaining * cost <= slice_end:
+                return current + remaining * cost
+            remaining -= (slice_end - current) / cost
+            current = slice_end
+
+    def latest_entry(self, arc: int, arrive: float, clock) -> float:
+        """
+        Inverse of traverse(): the latest minute the arc can be entered to
+        reach its end by minute arrive, or -inf if it is closed.
+        """
+        remaining = 1.0
+        current = arrive
+        while True:
+            slice_number = math.ceil(current / self.slice_minutes) - 1
+            weights, weather_factor = clock(slice_number)
+            cost = weights[arc] * weather_factor
+            if cost == math.inf:
+                return -math.inf
+            slice_start = slice_number * self.slice_minutes
+            if current - remaining * cost >= slice_start:
+                return current - remaining * cost
+            remaining -= (current - slice_start) / cost
+            current = slice_start
+
+    def compose_arrival(self, arc: int, function: List[Tuple[float, float]],
+                        clock) -> List[Tuple[float, float]]:
+        """
+        Composes an arrival-time function with one more arc.
+        
+        Traversal time is linear in the entry time as long as neither the
+        entry nor the exit slice changes, so the result only needs extra
+        breakpoints where one of them does.
+        
+        Args:
+            arc: Arc index
+            function: Arrival time at the arc's tail as a function of the
+                departure time, nondecreasing
+            clock: Lookup returned by slice_clock()
+        
+        Returns:
+            Arrival time at the arc's head as a function of the departure time
+        """
+        slice_minutes = self.slice_minutes
+        result = []
+        for (x0, y0), (x1, y1) in zip(function, function[1:]):
+            result.append((x0, self.traverse(arc, y0, clock)))
+            if y1 - y0 <= PWL_EPSILON:
+                continue
+            entries = [
+                b * slice_minutes
+                for b in range(math.floor(y0 / slice_minutes) + 1,
+                               math.ceil(y1 / slice_minutes))
+            ]
+            exit_lo = self.traverse(arc, y0, clock)
+            exit_hi = self.traverse(arc, y1, clock)
+            if exit_hi < math.inf:
+                entries += [
+                    self.latest_entry(arc, b * slice_minutes, clock)
+                    for b in range(math.floor(exit_lo / slice_minutes) + 1,
+                                   math.ceil(exit_hi / slice_minutes))
+                ]
+            for entry in sorted(entries):
+                if y0 < entry < y1:
+                    x = x0 + (entry - y0) * (x1 - x0) / (y1 - y0)
+                    result.append((x, self.traverse(arc, entry, clock)))
+        x_last, y_last = function[-1]
+        result.append((x_last, self.traverse(arc, y_last, clock)))
+        return pwl_simplify(result)
+
+    def arc_factors(self, arc: int, when: datetime) -> Dict[str, float]:
+        """
+        Breaks the cost of one arc down into the factors that make it up.
+        Construction and weather only appear when they apply.
+        """
+        compiled = self.compiled
+        hour_multiplier = compiled.traffic_multipliers(
+            self.slice_hour(self.slice_index(when))
+        )
+        factors = {
+            "traffic": hour_multiplier[compiled.traffic_pattern[arc]],
+            "base_traffic": compiled.base_traffic[arc],
+            "road_type": compiled.road_multiplier[arc],
+        }
+        construction = 1.0
+        for i in self.active_construction(when):
+            arcs, _, _, delay_factor = self.construction[i]
+            if arc in arcs:
+                construction *= delay_factor
+        if construction != 1.0:
+            factors["construction"] = construction
+        if when.date() in self.weather_impacts:
+            factors["weather"] = self.weather_factor(when)
+        return factors
+
+class SearchWorkspace:
+    """
+    Reusable distance and parent buffers for point-to-point searches.
+    
+    A slot only counts as set in the current search when its stamp equals
+    the current generation. Starting a search bumps the generation instead
+    of allocating and filling O(V) lists, so a query that settles a handful
+    of nodes costs just that. Each thread gets its own workspaces.
+    """
+
+    def __init__(self, node_count: int):
+        self.distances = array('d', bytes(8 * node_count))
+        self.parents = array('i', bytes(4 * node_count))
+        self.parent_arcs = array('i', bytes(4 * node_count))
+        self.estimates = array('d', bytes(8 * node_count))  # A* heuristics
+        self.stamps = array('q', bytes(8 * node_count))
+        self.generation = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.stamps)
+
+    def begin(self) -> int:
+        """
+        Starts a new search and returns its generation.
+        """
+        self.generation += 1
+        return self.generation
+
+    def path(self, source: int, target: int) -> List[int]:
+        """
+        Node ids from source to target along the parent links, built by
+        appending and reversing once.
+        """
+        path = [target]
+        parents = self.parents
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
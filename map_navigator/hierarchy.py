@@ -0,0 +1,320 @@
+"""Customizable contraction hierarchies."""
+import heapq
+import json
+import math
+from array import array
+from typing import List, Tuple
+
+from .graph import CompiledGraph
+
+class ContractionHierarchy:
+    """
+    Customizable contraction hierarchy over a CompiledGraph.
+    
+    Preprocessing depends only on the road topology: nodes are ordered by
+    geometric nested dissection and every pair of higher-ranked neighbors of
+    a contracted node is joined by a shortcut, so no witness search is needed.
+    Any weight vector (one per traffic slice) is then applied with a cheap
+    customization pass over the lower triangles of the hierarchy, and queries
+    run a bidirectional upward search that settles only a few hundred nodes.
+    """
+
+    def __init__(self, node_count: int, fingerprint: int, rank: array,
+                 up_offsets: array, up_targets: array):
+        self.node_count = node_count
+        self.fingerprint = fingerprint
+        self.rank = rank
+        # Edge e of node u goes to the higher-ranked up_targets[e]
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.edge_index = {}
+        for u in range(node_count):
+            for e in range(up_offsets[u], up_offsets[u + 1]):
+                self.edge_index[(u, up_targets[e])] = e
+        self._triangles = None
+        self.compiled = None  # Graph the fingerprint was last checked on
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.up_targets)
+
+    @classmethod
+    def build(cls, compiled: CompiledGraph) -> "ContractionHierarchy":
+        """
+        Computes the node order and shortcut topology.
+        
+        Args:
+            compiled: Graph to preprocess
+        
+        Returns:
+            A ContractionHierarchy ready to be customized
+        """
+        node_count = compiled.node_count
+        neighbors = [set() for _ in range(node_count)]
+        for u in range(node_count):
+            for k in range(compiled.offsets[u], compiled.offsets[u + 1]):
+                v = compiled.targets[k]
+                if v != u:
+                    neighbors[u].add(v)
+                    neighbors[v].add(u)
+
+        order = cls._dissection_order(compiled, neighbors)
+        rank = array('i', [-1]) * node_count
+        for position, u in enumerate(order):
+            rank[u] = position
+
+        upward = [None] * node_count
+        for u in order:
+            # Turn the remaining neighbors into a clique of shortcuts
+            remaining = neighbors[u]
+            upward[u] = remaining
+            for v in remaining:
+                neighbors[v].discard(u)
+                neighbors[v] |= remaining
+                neighbors[v].discard(v)
+            neighbors[u] = set()
+
+        up_offsets = array('q', [0])
+        up_targets = array('i')
+        for u in range(node_count):
+            up_targets.extend(sorted(upward[u], key=rank.__getitem__))
+            up_offsets.append(len(up_targets))
+
+        hierarchy = cls(node_count, compiled.fingerprint(), rank,
+                        up_offsets, up_targets)
+        hierarchy.compiled = compiled
+        return hierarchy
+
+    @staticmethod
+    def _dissection_order(compiled: CompiledGraph,
+                          neighbors: List[set]) -> List[int]:
+        # Recursively split the nodes at the median of their wider coordinate
+        # axis and rank the boundary (separator) above both halves. Small
+        # separators keep the number of shortcuts close to linear.
+        latitude = compiled.latitude
+        longitude = compiled.longitude
+        order = []
+
+        def dissect(nodes: List[int]) -> None:
+            if len(nodes) <= 8:
+                order.extend(nodes)
+                return
+            lat_span = (max(latitude[u] for u in nodes) -
+                        min(latitude[u] for u in nodes))
+            lon_span = (max(longitude[u] for u in nodes) -
+                        min(longitude[u] for u in nodes))
+            lon_span *= math.cos(math.radians(latitude[nodes[0]]))
+            coordinate = latitude if lat_span >= lon_span else longitude
+            nodes = sorted(nodes, key=coordinate.__getitem__)
+            middle = len(nodes) // 2
+            left, right = nodes[:middle], nodes[middle:]
+            left_set, right_set = set(left), set(right)
+            left_boundary = {u for u in left if not neighbors[u].isdisjoint(right_set)}
+            right_boundary = {u for u in right if not neighbors[u].isdisjoint(left_set)}
+            separator = min(left_boundary, right_boundary, key=len)
+            dissect([u for u in left if u not in separator])
+            dissect([u for u in right if u not in separator])
+            order.extend(sorted(separator, key=lambda u: len(neighbors[u])))
+
+        dissect(list(range(compiled.node_count)))
+        return order
+
+    def _lower_triangles(self) -> Tuple[array, array, array, array]:
+        # (x, x-a edge, x-b edge, a-b edge) with rank x < a < b, ordered by
+        # x so every edge is final before a later triangle reads it
+        if self._triangles is None:
+            middle = array('i')
+            lower_a, lower_b, upper = array('i'), array('i'), array('i')
+            by_rank = sorted(range(self.node_count), key=self.rank.__getitem__)
+            for x in by_rank:
+                edges = range(self.up_offsets[x], self.up_offsets[x + 1])
+                for i in edges:
+                    a = self.up_targets[i]
+                    for j in edges:
+                        if j <= i:
+                            continue
+                        middle.append(x)
+                        lower_a.append(i)
+                        lower_b.append(j)
+                        upper.append(self.edge_index[(a, self.up_targets[j])])
+            self._triangles = (middle, lower_a, lower_b, upper)
+        return self._triangles
+
+    def matches(self, compiled: CompiledGraph) -> bool:
+        """
+        Whether the hierarchy was built for compiled's topology. Only the
+        first check against a given CompiledGraph computes its fingerprint.
+        """
+        if compiled is not self.compiled:
+            if compiled.fingerprint() != self.fingerprint:
+                return False
+            self.compiled = compiled
+        return True
+
+    def customize(self, compiled: CompiledGraph,
+                  weights: array) -> Tuple[array, array, array, array]:
+        """
+        Applies a weight vector to the hierarchy.
+        
+        Args:
+            compiled: The graph the hierarchy was built from
+            weights: Arc weights, e.g. one traffic slice of EdgeWeightTable
+        
+        Returns:
+            (up_weights, down_weights, up_middle, down_middle) per hierarchy
+            edge; the middle arrays hold the node a shortcut skips, or -1
+        """
+        if not self.matches(compiled):
+            raise ValueError("Hierarchy was built for a different graph")
+
+        rank = self.rank
+        edge_index = self.edge_index
+        up_weights = array('d', [math.inf]) * self.edge_count
+        down_weights = array('d', [math.inf]) * self.edge_count
+        for u in range(compiled.node_count):
+            for k in range(compiled.offsets[u], compiled.offsets[u + 1]):
+                v = compiled.targets[k]
+                if v == u:
+                    continue
+                if rank[u] < rank[v]:
+                    e = edge_index[(u, v)]
+                    up_weights[e] = min(up_weights[e], weights[k])
+                else:
+                    e = edge_index[(v, u)]
+                    down_weights[e] = min(down_weights[e], weights[k])
+
+        up_middle = array('i', [-1]) * self.edge_count
+        down_middle = array('i', [-1]) * self.edge_count
+        middle, lower_a, lower_b, upper = self._lower_triangles()
+        for t in range(len(upper)):
+            xa, xb, ab = lower_a[t], lower_b[t], upper[t]
+            # a -> x -> b and b -> x -> a
+            through = down_weights[xa] + up_weights[xb]
+            if through < up_weights[ab]:
+                up_weights[ab] = through
+                up_middle[ab] = middle[t]
+            through = down_weights[xb] + up_weights[xa]
+            if through < down_weights[ab]:
+                down_weights[ab] = through
+                down_middle[ab] = middle[t]
+        return up_weights, down_weights, up_middle, down_middle
+
+    def query(self, metric: Tuple[array, array, array, array], source: int,
+              target: int) -> Tuple[List[int], float]:
+        """
+        Bidirectional upward search on a customized metric.
+        
+        Args:
+            metric: Result of customize()
+            source: Source node id
+            target: Target node id
+        
+        Returns:
+            Tuple containing the node ids of the path and its cost
+        """
+        up_weights, down_weights, up_middle, down_middle = metric
+        up_offsets = self.up_offsets
+        up_targets = self.up_targets
+
+        forward = {source: 0.0}
+        backward = {target: 0.0}
+        forward_parent = {source: -1}
+        backward_parent = {target: -1}
+        forward_pq = [(0.0, source)]
+        backward_pq = [(0.0, target)]
+        best, meeting = (0.0, source) if source == target else (math.inf, -1)
+
+        while forward_pq or backward_pq:
+            if forward_pq and (not backward_pq or
+                               forward_pq[0][0] <= backward_pq[0][0]):
+                pq, distances, parents = forward_pq, forward, forward_parent
+                other, edge_weights = backward, up_weights
+            else:
+                pq, distances, parents = backward_pq, backward, backward_parent
+                other, edge_weights = forward, down_weights
+
+            current_distance, u = heapq.heappop(pq)
+            if current_distance >= best:
+                pq.clear()
+                continue
+            if current_distance > distances[u]:
+                continue
+            if u in other and current_distance + other[u] < best:
+                best, meeting = current_distance + other[u], u
+
+            for e in range(up_offsets[u], up_offsets[u + 1]):
+                v = up_targets[e]
+                new_distance = current_distance + edge_weights[e]
+                if new_distance < distances.get(v, math.inf):
+                    distances[v] = new_distance
+                    parents[v] = u
+                    heapq.heappush(pq, (new_distance, v))
+
+        if meeting == -1:
+            return [], math.inf
+
+        upward_half = []
+        current = meeting
+        while current != -1:
+            upward_half.append(current)
+            current = forward_parent[current]
+        upward_half.reverse()
+        downward_half = []
+        current = meeting
+        while current != -1:
+            downward_half.append(current)
+            current = backward_parent[current]
+
+        hops = upward_half + downward_half[1:]
+        path = [hops[0]]
+        for u, v in zip(hops, hops[1:]):
+            self._unpack(metric, u, v, path)
+        return path, best
+
+    def _unpack(self, metric, u: int, v: int, path: List[int]) -> None:
+        # Appends the original nodes between u and v (excluding u) to path
+        _, _, up_middle, down_middle = metric
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            if self.rank[a] < self.rank[b]:
+                middle = up_middle[self.edge_index[(a, b)]]
+            else:
+                middle = down_middle[self.edge_index[(b, a)]]
+            if middle == -1:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+    def save(self, filename: str) -> None:
+        """
+        Saves the hierarchy topology to a JSON file next to the map data.
+        Weights are not stored; customize() rebuilds them per slice.
+        
+        Args:
+            filename: Name of the file to save to
+        """
+        data = {
+            "node_count": self.node_count,
+            "fingerprint": self.fingerprint,
+            "rank": self.rank.tolist(),
+            "up_offsets": self.up_offsets.tolist(),
+            "up_targets": self.up_targets.tolist()
+        }
+        with open(filename, 'w') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, filename: str) -> "ContractionHierarchy":
+        """
+        Loads a hierarchy saved with save().
+        
+        Args:
+            filename: Name of the file to load from
+        """
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        return cls(data["node_count"], data["fingerprint"],
+                   array('i', data["rank"]), array('q', data["up_offsets"]),
+                   array('i', data["up_targets"]))
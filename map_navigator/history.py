@@ -0,0 +1,166 @@
+"""Ring buffer of served route queries and the hot-route table built from it."""
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+class RouteHistory:
+    """
+    Fixed-size ring buffer of served (origin, destination, time slice)
+    queries.
+
+    Location names are interned to small integer ids, so a record is two
+    int slots and one short slot in parallel arrays instead of a tuple of
+    strings. The arrays grow up to capacity and are then overwritten oldest
+    first.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.origins = array("i")
+        self.destinations = array("i")
+        self.slices = array("H")
+        self.names = []  # Interned id -> location name
+        self._ids = {}
+        self.position = 0  # Next slot to overwrite once full
+        self.recorded = 0  # Queries recorded since the last clear()
+
+    def _intern(self, name: str) -> int:
+        i = self._ids.get(name)
+        if i is None:
+            i = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def record(self, start: str, end: str, slice_index: int) -> None:
+        """
+        Appends one served query, overwriting the oldest once full.
+        """
+        origin = self._intern(start)
+        destination = self._intern(end)
+        if len(self.origins) < self.capacity:
+            self.origins.append(origin)
+            self.destinations.append(destination)
+            self.slices.append(slice_index)
+        else:
+            position = self.position
+            self.origins[position] = origin
+            self.destinations[position] = destination
+            self.slices[position] = slice_index
+            self.position = (position + 1) % self.capacity
+        self.recorded += 1
+
+    def __len__(self) -> int:
+        return len(self.origins)
+
+    def clear(self) -> None:
+        self.origins = array("i")
+        self.destinations = array("i")
+        self.slices = array("H")
+        self.names = []
+        self._ids = {}
+        self.position = 0
+        self.recorded = 0
+
+    def pair_counts(self) -> Dict[int, Counter]:
+        """
+        Counts the buffered queries per time slice and (origin, destination).
+
+        Safe to call from another thread while queries are being recorded;
+        it works on a copy of the buffer.
+        """
+        names = self.names
+        origins = self.origins[:]
+        destinations = self.destinations[:]
+        slices = self.slices[:]
+        counts = {}
+        for k in range(min(len(origins), len(destinations), len(slices))):
+            counter = counts.get(slices[k])
+            if counter is None:
+                counter = counts[slices[k]] = Counter()
+            counter[names[origins[k]], names[destinations[k]]] += 1
+        return counts
+
+    def top_pairs(self, count: int) -> Dict[int, List[Tuple[str, str, int]]]:
+        """
+        Most requested origin-destination pairs in every time slice.
+
+        Args:
+            count: Maximum number of pairs per slice
+
+        Returns:
+            Dict of slice index -> list of (origin, destination, queries),
+            most requested first
+        """
+        return {
+            slice_index: [(start, end, n) for (start, end), n
+                          in counter.most_common(count)]
+            for slice_index, counter in self.pair_counts().items()
+        }
+
+class HotRouteTable:
+    """
+    Precomputed routes for the most requested pairs of every time slice.
+
+    The table is rebuilt off the query path and swapped in whole, so
+    lookups never see a half-built table. Like RouteCache, it only answers
+    for the graph version it was built under; keys also carry the traffic
+    bucket and weather date the route was computed for.
+    """
+
+    def __init__(self, per_slice: int = 32):
+        self.per_slice = per_slice
+        self.version = None
+        self.routes = {}
+        self.built_at = None  # Date the routes were computed for
+        self.hits = 0
+        self.misses = 0
+        self.warmups = 0
+        self.warm_seconds = 0.0
+        self.coverage = 0.0
+        self.interrupted = 0  # Warm-ups cut short by a graph change
+        self.failures = 0  # Warm-ups that raised anything else
+        self.last_error = None
+
+    def get(self, key: Tuple, version: int
+            ) -> Optional[Tuple[List[str], float]]:
+        if self.version != version:
+            self.misses += 1
+            return None
+        route = self.routes.get(key)
+        if route is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return route
+
+    def replace(self, routes: Dict, version: int) -> None:
+        """
+        Swaps in a freshly warmed set of routes.
+        """
+        self.routes, self.version = routes, version
+
+    def stats(self) -> Dict:
+        """
+        Returns hit/miss counters, the table size, coverage and background
+        warm-up failures.
+
+        coverage is the share of the recorded queries at the last warm-up
+        that fell on a pair in the table, the hit rate the table would have
+        had on that traffic, so per_slice can be sized against it.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "routes": len(self.routes),
+            "per_slice": self.per_slice,
+            "coverage": self.coverage,
+            "warmups": self.warmups,
+            "warm_seconds": self.warm_seconds,
+            "interrupted": self.interrupted,
+            "failures": self.failures,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,365 @@
+"""Streaming bulk import of CSV and GeoJSON-lines road networks.
+
+Needs pandas and NumPy, so the navigator only imports this module from
+import_network.
+"""
+import json
+import math
+import sys
+from array import array
+from itertools import islice
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .geometry import EARTH_RADIUS_KM, haversine_km
+from .graph import CompiledGraph
+from .mapfile import MapFile
+from .traffic import DEFAULT_SPEED_KMH, ROAD_TYPE_MULTIPLIERS, hourly_multipliers
+
+GEOJSON_LINES_SUFFIXES = (".geojsonl", ".geojsons", ".jsonl", ".ndjson")
+
+def peak_memory_mb() -> Optional[float]:
+    """
+    Peak resident memory of this process in MB, or None on platforms
+    without the resource module.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+def print_import_progress(report: Dict) -> None:
+    """
+    Progress callback for import_network that prints one line per chunk.
+    """
+    line = (f"{report['file']}: {report['rows']:,} rows, "
+            f"{report['nodes']:,} nodes, {report['roads']:,} roads")
+    if report["peak_memory_mb"] is not None:
+        line += f", peak memory {report['peak_memory_mb']:.0f} MB"
+    print(line)
+
+def _optional(value):
+    # pandas reads missing cells as NaN
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+class NetworkImporter:
+    """
+    Streams a road network from CSV or GeoJSON-lines files into a binary map.
+    
+    Files are read in chunks, so only the node table and the packed edge
+    columns stay resident, never the raw file. Nodes are de-duplicated by
+    name, and GeoJSON endpoints without a name are keyed by their rounded
+    coordinates so segments that meet share a node. The CSR adjacency is
+    then built with NumPy sorts instead of one add_road call per segment.
+    
+    CSV node files have name, latitude and longitude columns, plus optional
+    type and description. CSV edge files have from and to columns, plus
+    optional distance (km, straight-line when missing), traffic, road_type,
+    speed_limit, one_way and traffic_pattern (a JSON object). GeoJSON-lines
+    files hold one Feature per line: Points are nodes and LineStrings are
+    roads, with the same fields as properties.
+    """
+
+    EDGE_FIELDS = ("traffic", "road_type", "speed_limit", "one_way",
+                   "traffic_pattern")
+
+    def __init__(self, chunk_size: int = 100_000, progress=None):
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.names = []
+        self.index = {}
+        self.latitude = array('d')
+        self.longitude = array('d')
+        self.location_metadata = {}
+        self.road_types = {}
+        self.speed_limits = {}
+        self.traffic_patterns = {}
+        self.pattern_tables = [[1.0] * 24]
+        self._pattern_ids = {}
+        self._edge_chunks = []  # Dicts of NumPy columns, one per chunk
+        self.rows = 0
+        self.roads = 0
+        self.skipped = 0
+
+    def read(self, filename: str) -> None:
+        """
+        Reads one CSV or GeoJSON-lines file. Node files must be read before
+        the edge files that refer to them.
+        """
+        for nodes, edges in self._chunks(filename):
+            if nodes is not None:
+                self._add_nodes(nodes)
+            if edges is not None:
+                self._add_edges(edges)
+            if self.progress:
+                self.progress({
+                    "file": filename,
+                    "rows": self.rows,
+                    "nodes": len(self.names),
+                    "roads": self.roads,
+                    "skipped": self.skipped,
+                    "peak_memory_mb": peak_memory_mb()
+                })
+
+    def _chunks(self, filename: str):
+        # Yields (nodes, edges) DataFrame pairs; either may be None
+        if filename.lower().endswith(".csv"):
+            for chunk in pd.read_csv(filename, chunksize=self.chunk_size,
+                                     dtype={"name": str, "from": str,
+                                            "to": str},
+                                     float_precision="round_trip"):
+                self.rows += len(chunk)
+                if "from" in chunk.columns:
+                    yield None, chunk
+                else:
+                    yield chunk, None
+        elif filename.lower().endswith(GEOJSON_LINES_SUFFIXES):
+            with open(filename, 'r') as f:
+                while True:
+                    lines = list(islice(f, self.chunk_size))
+                    if not lines:
+                        break
+                    self.rows += len(lines)
+                    yield self._geojson_frames(lines)
+        else:
+            raise ValueError(
+                f"{filename}: expected a .csv or GeoJSON-lines file"
+            )
+
+    def _geojson_frames(self, lines: List[str]):
+        nodes = []
+        edges = []
+        for line in lines:
+            if not line.strip():
+                continue
+            feature = json.loads(line)
+            geometry = feature.get("geometry") or {}
+            properties = feature.get("properties") or {}
+            coordinates = geometry.get("coordinates")
+            if geometry.get("type") == "Point":
+                longitude, latitude = coordinates[:2]
+                nodes.append({
+                    "name": properties.get(
+                        "name", f"{latitude:.6f},{longitude:.6f}"
+                    ),
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "type": properties.get("type"),
+                    "description": properties.get("description")
+                })
+            elif geometry.get("type") == "LineString":
+                endpoints = []
+                for key, (longitude, latitude) in (
+                    ("from", coordinates[0][:2]), ("to", coordinates[-1][:2])
+                ):
+                    name = properties.get(
+                        key, f"{latitude:.6f},{longitude:.6f}"
+                    )
+                    nodes.append({"name": name, "latitude": latitude,
+                                  "longitude": longitude})
+                    endpoints.append(name)
+                distance = properties.get("distance")
+                if distance is None:
+                    distance = sum(
+                        haversine_km(a[1], a[0], b[1], b[0])
+                        for a, b in zip(coordinates, coordinates[1:])
+                    )
+                edge = {"from": endpoints[0], "to": endpoints[1],
+                        "distance": distance}
+                for field in self.EDGE_FIELDS:
+                    edge[field] = properties.get(field)
+                edges.append(edge)
+        return (pd.DataFrame(nodes) if nodes else None,
+                pd.DataFrame(edges) if edges else None)
+
+    def _add_nodes(self, nodes) -> None:
+        nodes = nodes.drop_duplicates("name")
+        names = nodes["name"].astype(str).tolist()
+        new_rows = [i for i, name in enumerate(names)
+                    if name not in self.index]
+        if not new_rows:
+            return
+        nodes = nodes.iloc[new_rows]
+        self.latitude.frombytes(
+            nodes["latitude"].to_numpy(dtype=np.float64).tobytes()
+        )
+        self.longitude.frombytes(
+            nodes["longitude"].to_numpy(dtype=np.float64).tobytes()
+        )
+
+        types = (nodes["type"] if "type" in nodes.columns
+                 else [None] * len(nodes))
+        descriptions = (nodes["description"]
+                        if "description" in nodes.columns
+                        else [None] * len(nodes))
+        for i, location_type, description in zip(new_rows, types,
+                                                 descriptions):
+            name = names[i]
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.location_metadata[name] = {
+                "type": _optional(location_type) or "general",
+                "description": _optional(description)
+            }
+
+    def _add_edges(self, edges) -> None:
+        index = self.index
+        sources = np.fromiter(
+            (index.get(name, -1) for name in edges["from"].astype(str)),
+            dtype=np.int64, count=len(edges)
+        )
+        targets = np.fromiter(
+            (index.get(name, -1) for name in edges["to"].astype(str)),
+            dtype=np.int64, count=len(edges)
+        )
+        known = (sources >= 0) & (targets >= 0)
+        self.skipped += int(len(edges) - known.sum())
+        edges = edges[known]
+        self.roads += len(edges)
+
+        def column(name: str, default) -> "pd.Series":
+            if name in edges.columns:
+                return edges[name].fillna(default)
+            return pd.Series(default, index=edges.index)
+
+        speed = column("speed_limit", DEFAULT_SPEED_KMH).to_numpy(
+            dtype=np.float64
+        )
+        chunk = {
+            "u": sources[known],
+            "v": targets[known],
+            "distance": column("distance", np.nan).to_numpy(dtype=np.float64),
+            "traffic": column("traffic", 1.0).to_numpy(dtype=np.float64),
+            "road_multiplier": column("road_type", "street").map(
+                ROAD_TYPE_MULTIPLIERS
+            ).fillna(1.0).to_numpy(dtype=np.float64),
+            "speed": np.where(speed > 0, speed, DEFAULT_SPEED_KMH),
+            "one_way": column("one_way", False).to_numpy(dtype=bool),
+            "pattern": np.zeros(len(edges), dtype=np.int32)
+        }
+
+        # Only the sparse, non-default metadata needs per-row string keys
+        froms = edges["from"].astype(str).to_numpy()
+        tos = edges["to"].astype(str).to_numpy()
+        if "road_type" in edges.columns:
+            road_type = edges["road_type"]
+            for i in np.flatnonzero(road_type.notna() &
+                                    (road_type != "street")):
+                self.road_types[f"{froms[i]}-{tos[i]}"] = road_type.iat[i]
+        if "speed_limit" in edges.columns:
+            given = pd.to_numeric(edges["speed_limit"], errors="coerce")
+            for i in np.flatnonzero(given.to_numpy() > 0):
+                self.speed_limits[f"{froms[i]}-{tos[i]}"] = float(speed[i])
+        if "traffic_pattern" in edges.columns:
+            patterns = edges["traffic_pattern"]
+            for i in np.flatnonzero(patterns.notna()):
+                chunk["pattern"][i] = self._pattern_id(
+                    patterns.iat[i], froms[i], tos[i]
+                )
+
+        self._edge_chunks.append(chunk)
+
+    def _pattern_id(self, pattern, location1: str, location2: str) -> int:
+        if isinstance(pattern, str):
+            pattern = json.loads(pattern)
+        self.traffic_patterns[f"{location1}-{location2}"] = pattern
+        self.traffic_patterns[f"{location2}-{location1}"] = pattern
+        key = json.dumps(pattern, sort_keys=True)
+        if key not in self._pattern_ids:
+            self._pattern_ids[key] = len(self.pattern_tables)
+            self.pattern_tables.append(hourly_multipliers(pattern))
+        return self._pattern_ids[key]
+
+    def compile(self) -> CompiledGraph:
+        """
+        Builds the CSR graph from everything read so far.
+        
+        Both directions of a two-way road are emitted next to each other and
+        then stably sorted by tail node, which gives every node its roads in
+        file order, the same layout add_road calls would produce.
+        """
+        node_count = len(self.names)
+        keys = ("u", "v", "distance", "traffic", "road_multiplier", "speed",
+                "one_way", "pattern")
+        if self._edge_chunks:
+            columns = {key: np.concatenate([c[key] for c in self._edge_chunks])
+                       for key in keys}
+        else:
+            columns = {key: np.zeros(0) for key in keys}
+        self._edge_chunks = [columns]
+
+        u = columns["u"].astype(np.int64)
+        v = columns["v"].astype(np.int64)
+        distance = columns["distance"]
+        missing = np.isnan(distance)
+        if missing.any():
+            latitude = np.radians(np.frombuffer(self.latitude))
+            longitude = np.radians(np.frombuffer(self.longitude))
+            a, b = u[missing], v[missing]
+            h = (np.sin((latitude[b] - latitude[a]) / 2) ** 2 +
+                 np.cos(latitude[a]) * np.cos(latitude[b]) *
+                 np.sin((longitude[b] - longitude[a]) / 2) ** 2)
+            distance = distance.copy()
+            distance[missing] = (2 * EARTH_RADIUS_KM *
+                                 np.arcsin(np.sqrt(np.minimum(h, 1.0))))
+
+        road_count = len(u)
+        tails = np.empty(2 * road_count, dtype=np.int64)
+        heads = np.empty(2 * road_count, dtype=np.int64)
+        tails[0::2], tails[1::2] = u, v
+        heads[0::2], heads[1::2] = v, u
+        keep = np.ones(2 * road_count, dtype=bool)
+        keep[1::2] = ~columns["one_way"].astype(bool)
+        road = np.repeat(np.arange(road_count), 2)[keep]
+        tails = tails[keep]
+        order = np.argsort(tails, kind="stable")
+        road = road[order]
+        offsets = np.concatenate((
+            [0], np.cumsum(np.bincount(tails, minlength=node_count))
+        ))
+
+        def packed(typecode: str, values) -> array:
+            dtype = {'q': np.int64, 'i': np.int32, 'd': np.float64}[typecode]
+            return array(typecode, np.ascontiguousarray(
+                values, dtype=dtype
+            ).tobytes())
+
+        return CompiledGraph(
+            self.names, packed('q', offsets), packed('i', heads[keep][order]),
+            packed('d', distance[road]), packed('d', columns["traffic"][road]),
+            packed('d', columns["road_multiplier"][road]),
+            packed('d', columns["speed"][road]), packed('i', road),
+            packed('i', columns["pattern"][road]), self.pattern_tables,
+            self.latitude, self.longitude
+        )
+
+    def write(self, filename: str) -> Dict:
+        """
+        Compiles the network and writes it as a binary map.
+        
+        Returns:
+            Summary with node, road and arc counts, skipped rows (edges whose
+            endpoints were never defined) and peak memory
+        """
+        compiled = self.compile()
+        MapFile.write(filename, compiled, {
+            "location_metadata": self.location_metadata,
+            "traffic_patterns": self.traffic_patterns,
+            "road_types": self.road_types,
+            "speed_limits": self.speed_limits
+        })
+        return {
+            "rows": self.rows,
+            "nodes": compiled.node_count,
+            "roads": self.roads,
+            "arcs": compiled.arc_count,
+            "skipped": self.skipped,
+            "peak_memory_mb": peak_memory_mb()
+        }
@@ -0,0 +1,138 @@
+"""Memory-mapped binary map format."""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict
+
+from .graph import CompiledGraph
+
+class MapFile:
+    """
+    Compact binary map that is opened with mmap.
+    
+    The file is a header, a section directory and 8-byte aligned sections.
+    Numeric sections are raw native-endian arrays that load as memoryview
+    casts over the mapping, so routing workers opening the same file share
+    its page-cache pages instead of each parsing a private copy. Names live
+    in one string table; location, traffic and road metadata are JSON
+    sections that are only parsed when first needed.
+    """
+
+    MAGIC = b"MAPNAV\0\0"
+    VERSION = 1
+    HEADER = struct.Struct("<8sHHI")  # magic, version, big endian, sections
+    ENTRY = struct.Struct("<24sc7xQQ")  # name, typecode, offset, length
+    JSON_SECTIONS = ("location_metadata", "traffic_patterns", "road_types",
+                     "speed_limits")
+
+    def __init__(self, filename: str):
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version, big_endian, count = self.HEADER.unpack_from(self._view)
+        if magic != self.MAGIC:
+            raise ValueError(f"{filename} is not a binary map file")
+        if version != self.VERSION:
+            raise ValueError(f"Unsupported binary map version {version}")
+        # Files written on the other byte order are copied and swapped
+        self.swap = bool(big_endian) != (sys.byteorder == "big")
+
+        self.directory = {}
+        for i in range(count):
+            name, typecode, offset, length = self.ENTRY.unpack_from(
+                self._view, self.HEADER.size + i * self.ENTRY.size
+            )
+            self.directory[name.rstrip(b"\0").decode("ascii")] = (
+                typecode.decode("ascii"), offset, length
+            )
+
+    def section(self, name: str):
+        """
+        Returns a numeric section as a read-only memoryview over the file.
+        """
+        typecode, offset, length = self.directory[name]
+        raw = self._view[offset:offset + length]
+        if typecode == 'B':
+            return raw
+        if self.swap:
+            values = array(typecode, raw.tobytes())
+            values.byteswap()
+            return values
+        return raw.cast(typecode)
+
+    def json_section(self, name: str):
+        return json.loads(self.section(name).tobytes())
+
+    @classmethod
+    def write(cls, filename: str, compiled: CompiledGraph,
+              metadata: Dict[str, dict]) -> None:
+        """
+        Writes a compiled graph and its metadata in the binary format.
+        
+        Args:
+            filename: Name of the file to write
+            compiled: Graph to save
+            metadata: Dict for each of JSON_SECTIONS, keyed by section name
+        """
+        encoded = [name.encode("utf-8") for name in compiled.names]
+        starts = array('q', [0])
+        for name in encoded:
+            starts.append(starts[-1] + len(name) + 1)
+        order = array('i', sorted(range(len(encoded)),
+                                  key=encoded.__getitem__))
+        pattern_tables = array('d', [multiplier
+                                     for table in compiled.pattern_tables
+                                     for multiplier in table])
+
+        sections = [
+            ("names", b"\0".join(encoded)),
+            ("name_starts", starts),
+            ("name_order", order),
+            ("latitude", compiled.latitude),
+            ("longitude", compiled.longitude),
+            ("offsets", compiled.offsets),
+            ("targets", compiled.targets),
+            ("distance", compiled.distance),
+            ("base_traffic", compiled.base_traffic),
+            ("road_multiplier", compiled.road_multiplier),
+            ("speed", compiled.speed),
+            ("edge_id", compiled.edge_id),
+            ("traffic_pattern", compiled.traffic_pattern),
+            ("pattern_tables", pattern_tables),
+        ] + [
+            (name, json.dumps(metadata[name]).encode("utf-8"))
+            for name in cls.JSON_SECTIONS
+        ]
+
+        position = cls.HEADER.size + len(sections) * cls.ENTRY.size
+        directory = []
+        payload = []
+        for name, values in sections:
+            data = memoryview(values)
+            position += -position % 8
+            directory.append(cls.ENTRY.pack(
+                name.encode("ascii"), data.format.encode("ascii"),
+                position, data.nbytes
+            ))
+            payload.append((position, data))
+            position += data.nbytes
+
+        # Write beside the target and rename, so processes that still map
+        # the old file keep reading a consistent copy
+        temporary = f"{filename}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION,
+                                    sys.byteorder == "big", len(sections)))
+            f.write(b"".join(directory))
+            for offset, data in payload:
+                f.write(bytes(offset - f.tell()))
+                f.write(data)
+        os.replace(temporary, filename)
+
+# Navigator attributes that load_binary builds from the mapped file on demand;
+# schedules are not stored, so every location starts with an empty one
+MAPPED_ATTRIBUTES = ("graph", "locations", "location_schedules",
+                     "spatial_index") + MapFile.JSON_SECTIONS
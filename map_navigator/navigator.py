@@ -0,0 +1,2446 @@
+"""The EnhancedMapNavigator routing engine."""
+import heapq
+import io
+import json
+import math
+import os
+import threading
+from time import perf_counter
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .cache import RouteCache
+from .dynamic import DynamicShortestPathTree
+from .geometry import convex_hull
+from .graph import CompiledGraph, EdgeWeightTable, SearchWorkspace
+from .hierarchy import ContractionHierarchy
+from .history import HotRouteTable, RouteHistory
+from .mapfile import MAPPED_ATTRIBUTES, MapFile
+from .profiling import SearchProfiler
+from .schedule import DayOfWeek, LocationSchedule, TimeWindow
+from .spatial import SpatialIndex
+from .tour import TourPlanner
+from .traffic import ROAD_TYPE_MULTIPLIERS, hourly_multipliers, pwl_lower_envelope
+
+if TYPE_CHECKING:
+    from .allpairs import AllPairsTable
+
+# Special events close a location from their start to their end inclusive
+EVENT_MARGIN = timedelta(seconds=1)
+
+# Navigator shared read-only by distance matrix worker processes
+_matrix_navigator = None
+
+def _init_matrix_worker(navigator) -> None:
+    global _matrix_navigator
+    _matrix_navigator = navigator
+
+def _matrix_worker_rows(origins: List[str], destinations: List[str],
+                        when: datetime, return_times: bool) -> List[Tuple]:
+    rows = []
+    for origin in origins:
+        costs = _matrix_navigator.one_to_many(origin, destinations, when)
+        times = (_matrix_navigator.one_to_many(origin, destinations, when,
+                                               time_dependent=True)
+                 if return_times else None)
+        rows.append((costs, times))
+    return rows
+
+class EnhancedMapNavigator:
+    def __init__(self):
+        self.graph = {}
+        self.locations = {}  # Store (latitude, longitude) of each location
+        self.location_metadata = {}  # Store additional info about locations
+        self.traffic_patterns = {}  # Store time-based traffic patterns
+        self.road_types = {}  # Store road type information
+        self.speed_limits = {}
+        self.construction_zones = {}
+        self.weather_impacts = {}
+        self._traffic_tables = {}  # Parsed hourly multipliers per road
+        self._compiled = None  # CSR form of the graph, rebuilt when stale
+        self._weights = None  # Precompiled arc weights, rebuilt when stale
+        self.graph_version = 0  # Bumped by every change that affects routes
+        self.spatial_index = SpatialIndex()
+        self._map_file = None  # MapFile backing a map opened by load_binary
+        self.route_cache = None  # RouteCache, see enable_route_cache()
+        self.profiler = None  # SearchProfiler, see enable_profiling()
+        self._all_pairs = None  # AllPairsTable, see build_all_pairs()
+        self._landmark_count = 0
+        self._landmarks = None  # (weight table, landmark distance lists)
+        self.routing_algorithm = "dijkstra"  # Default used by find_route
+        self._hierarchy = None  # ContractionHierarchy for the compiled graph
+        self._hierarchy_metrics = {}  # id(weights) -> (weights, metric)
+        self._workspaces = threading.local()  # Per-thread SearchWorkspaces
+        self.location_schedules = {}
+        self.route_history = RouteHistory()  # Queries served by find_route
+        self.hot_routes = None  # HotRouteTable, see enable_hot_routes()
+        self._hot_route_warmer = None  # (thread, stop event)
+        # (origin, time) -> (DynamicShortestPathTree, weight table, version)
+        self._dynamic_trees = {}
+
+    def __getattr__(self, name: str):
+        # Dict views of a map opened with load_binary are built on first use
+        map_file = self.__dict__.get("_map_file")
+        if map_file is None or name not in MAPPED_ATTRIBUTES:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        if name in MapFile.JSON_SECTIONS:
+            value = map_file.json_section(name)
+        elif name == "spatial_index":
+            value = SpatialIndex()
+            for location, (latitude, longitude) in self.locations.items():
+                value.add(location, latitude, longitude)
+        else:
+            compiled = CompiledGraph.from_map_file(map_file)
+            names = list(compiled.names)
+            if name == "locations":
+                value = {
+                    location: (compiled.latitude[u], compiled.longitude[u])
+                    for u, location in enumerate(names)
+                }
+            elif name == "location_schedules":
+                value = {location: LocationSchedule() for location in names}
+            else:
+                offsets = compiled.offsets
+                targets = compiled.targets
+                value = {
+                    location: [
+                        (names[targets[k]], compiled.distance[k],
+                         compiled.base_traffic[k])
+                        for k in range(offsets[u], offsets[u + 1])
+                    ]
+                    for u, location in enumerate(names)
+                }
+        setattr(self, name, value)
+        return value
+
+    def add_location(self, location: str, latitude: float, longitude: float, 
+                    location_type: str = "general", description: str = None,
+                    schedule: LocationSchedule = None):
+        """
+        Adds a location with its coordinates, metadata, and operating schedule.
+        
+        Args:
+            location: Name of the location
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            location_type: Type of location (e.g., landmark, shopping, restaurant)
+            description: Additional description of the location
+            schedule: Operating hours and events; an empty schedule if omitted
+        """
+        if location not in self.graph:
+            self.graph[location] = []
+            self.locations[location] = (latitude, longitude)
+            self.location_metadata[location] = {
+                "type": location_type,
+                "description": description
+            }
+            self.location_schedules[location] = schedule or LocationSchedule()
+            self.spatial_index.add(location, latitude, longitude)
+            self._compiled = None
+            self.graph_version += 1
+
+    def add_road(self, location1: str, location2: str, distance: float, 
+                base_traffic_factor: float, road_type: str = "street",
+                speed_limit: float = None, one_way: bool = False):
+        """
+        Adds a road between two locations with enhanced metadata.
+        
+        Args:
+            location1: First location name
+            location2: Second location name
+            distance: Distance in kilometers
+            base_traffic_factor: Base traffic congestion factor
+            road_type: Type of road (highway, street, avenue)
+            speed_limit: Speed limit in km/h; DEFAULT_SPEED_KMH if omitted
+            one_way: Whether the road can only be driven from location1 to
+                location2
+        """
+        road_id = f"{location1}-{location2}"
+        self.road_types[road_id] = road_type
+        if speed_limit:
+            self.speed_limits[road_id] = speed_limit
+        
+        self.graph[location1].append((location2, distance, base_traffic_factor))
+        if not one_way:
+            self.graph[location2].append(
+                (location1, distance, base_traffic_factor)
+            )
+        self._compiled = None
+        self.graph_version += 1
+
+    def add_traffic_pattern(self, location1: str, location2: str, 
+                          time_patterns: Dict[str, float]):
+        """
+        Adds time-based traffic patterns for a road.
+        
+        Args:
+            location1: First location name
+            location2: Second location name
+            time_patterns: Dictionary mapping time ranges to traffic multipliers
+        """
+        road_id = f"{location1}-{location2}"
+        self.traffic_patterns[road_id] = time_patterns
+        reverse_road_id = f"{location2}-{location1}"
+        self.traffic_patterns[reverse_road_id] = time_patterns
+        table = hourly_multipliers(time_patterns)
+        self._traffic_tables[road_id] = table
+        self._traffic_tables[reverse_road_id] = table
+        self._compiled = None
+        self.graph_version += 1
+
+    def get_traffic_multiplier(self, location1: str, location2: str, 
+                             current_time: datetime) -> float:
+        """
+        Gets the traffic multiplier for a specific time on a road.
+        
+        Args:
+            location1: Starting location
+            location2: Ending location
+            current_time: Current datetime
+        
+        Returns:
+            Traffic multiplier for the specified time
+        """
+        road_id = f"{location1}-{location2}"
+        table = self._traffic_tables.get(road_id)
+        if table is None:
+            if road_id not in self.traffic_patterns:
+                return 1.0
+            table = hourly_multipliers(self.traffic_patterns[road_id])
+            self._traffic_tables[road_id] = table
+
+        return table[current_time.hour]
+
+    def compile_graph(self) -> CompiledGraph:
+        """
+        Returns the CSR form of the graph, rebuilding it if roads, locations
+        or traffic patterns changed since the last compile.
+        
+        Returns:
+            CompiledGraph snapshot of the current graph
+        """
+        if self._compiled is None:
+            self._compiled = CompiledGraph.from_navigator(self)
+            self._weights = None
+        return self._compiled
+
+    def compile_weights(self, slice_minutes: int = 60) -> EdgeWeightTable:
+        """
+        Returns the precompiled arc weight table used by routing and ETA,
+        rebuilding it if the graph, traffic patterns or construction zones
+        changed since the last compile.
+        
+        Args:
+            slice_minutes: Length of a time-of-day slice (60 or 15, etc.)
+        
+        Returns:
+            EdgeWeightTable for the current graph
+        """
+        compiled = self.compile_graph()
+        if (self._weights is None or
+                self._weights.slice_minutes != slice_minutes):
+            self._weights = EdgeWeightTable(self, compiled, slice_minutes)
+        return self._weights
+
+    def _workspace(self, compiled: CompiledGraph,
+                   slot: int = 0) -> SearchWorkspace:
+        # Slot 1 is the backward frontier of bidirectional searches
+        workspaces = getattr(self._workspaces, "slots", None)
+        if workspaces is None or workspaces[0].capacity < compiled.node_count:
+            workspaces = [SearchWorkspace(compiled.node_count)
+                          for _ in range(2)]
+            self._workspaces.slots = workspaces
+        return workspaces[slot]
+
+    def dijkstra(self, start: str, end: str, 
+                current_time: datetime = None) -> Tuple[List[str], float]:
+        """
+        Enhanced Dijkstra's algorithm considering time-based traffic patterns.
+        Runs on the compiled CSR arrays with the precompiled weights in effect
+        at current_time, so the inner loop never hashes or parses strings.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            current_time: Current datetime for traffic calculation
+        
+        Returns:
+            Tuple containing the path and total cost in minutes (empty path
+            if unreachable)
+        """
+        if current_time is None:
+            current_time = datetime.now()
+
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        source = compiled.index[start]
+        target = compiled.index[end]
+
+        offsets = compiled.offsets
+        targets = compiled.targets
+        weights = weight_table.weights_at(current_time)
+
+        table = self._all_pairs
+        matrix = (table.matrix_for(compiled, weights) if table is not None
+                  else None)
+        if matrix is not None:
+            arcs = table.path_arcs(matrix, source, target)
+            if arcs is None:
+                return [], math.inf
+            # Summed in path order, exactly as the search would
+            cost = 0.0
+            for k in arcs:
+                cost += weights[k]
+            return ([start] + [compiled.names[targets[k]] for k in arcs],
+                    cost * weight_table.weather_factor(current_time))
+
+        workspace = self._workspace(compiled)
+        generation = workspace.begin()
+        distances = workspace.distances
+        previous_nodes = workspace.parents
+        stamps = workspace.stamps
+        distances[source] = 0.0
+        stamps[source] = generation
+        heappop, heappush = heapq.heappop, heapq.heappush
+        profiler = self.profiler
+        if profiler is not None:
+            profile = profiler.begin("dijkstra", start, end)
+            profile.traffic_lookups += 1  # The weights_at() above
+            heappop, heappush = profile.heap_hooks(distances, offsets, target)
+        pq = []
+        heappush(pq, (0.0, source))
+
+        while pq:
+            current_distance, u = heappop(pq)
+
+            if u == target:
+                break
+
+            if current_distance > distances[u]:
+                continue
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                new_distance = current_distance + weights[k]
+
+                if stamps[v] != generation or new_distance < distances[v]:
+                    stamps[v] = generation
+                    distances[v] = new_distance
+                    previous_nodes[v] = u
+                    heappush(pq, (new_distance, v))
+
+        if profiler is not None:
+            profile.lap("search")
+        if stamps[target] != generation or distances[target] == math.inf:
+            route = [], math.inf
+        else:
+            weather_factor = weight_table.weather_factor(current_time)
+            route = ([compiled.names[u]
+                      for u in workspace.path(source, target)],
+                     distances[target] * weather_factor)
+        if profiler is not None:
+            profile.lap("reconstruction")
+            profiler.finish(profile)
+        return route
+
+    def prepare_landmarks(self, count: int = 4) -> List[str]:
+        """
+        Picks ALT landmarks and precomputes lower-bound distances from them.
+        
+        Landmarks are chosen farthest-first, so they sit on the edge of the
+        map where their triangle-inequality bounds are tightest. The
+        distances are refreshed automatically when the weights change.
+        
+        Args:
+            count: Number of landmarks (0 disables landmark bounds)
+        
+        Returns:
+            Names of the chosen landmarks
+        """
+        self._landmark_count = count
+        self._landmarks = None
+        if count <= 0:
+            return []
+        return [self.compile_graph().names[landmark]
+                for landmark in self._landmark_distances()[0]]
+
+    def _landmark_distances(self):
+        weight_table = self.compile_weights()
+        if self._landmarks is not None and self._landmarks[0] is weight_table:
+            return self._landmarks[1]
+
+        compiled = weight_table.compiled
+        lower_bound = weight_table.lower_bound_weights()
+        landmarks, distances = [], []
+        if compiled.node_count:
+            # Start from the node farthest from an arbitrary first node
+            reach = compiled.shortest_distances(lower_bound, 0)
+            closest = [d if d < math.inf else -1.0 for d in reach]
+            for _ in range(min(self._landmark_count, compiled.node_count)):
+                landmark = max(range(compiled.node_count),
+                               key=closest.__getitem__)
+                if landmark in landmarks:
+                    break
+                from_landmark = compiled.shortest_distances(
+                    lower_bound, landmark
+                )
+                to_landmark = compiled.shortest_distances(
+                    lower_bound, landmark, reverse=True
+                )
+                landmarks.append(landmark)
+                distances.append((from_landmark, to_landmark))
+                closest = [min(c, d) if d < math.inf else -1.0
+                           for c, d in zip(closest, from_landmark)]
+
+        self._landmarks = (weight_table, (landmarks, distances))
+        return self._landmarks[1]
+
+    def astar(self, start: str, end: str, 
+              when: datetime = None) -> Tuple[List[str], float]:
+        """
+        A* search guided by the straight-line distance to the destination.
+        
+        The heuristic is the haversine distance scaled by the fewest minutes
+        per kilometer of any road, raised by ALT landmark bounds when
+        prepare_landmarks was called. Both are admissible, so the result is
+        the same as dijkstra's while settling far fewer nodes.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            when: Departure datetime for traffic calculation
+        
+        Returns:
+            Tuple containing the path and total cost in minutes (empty path
+            if unreachable)
+        """
+        if when is None:
+            when = datetime.now()
+
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        source = compiled.index[start]
+        target = compiled.index[end]
+
+        offsets = compiled.offsets
+        targets = compiled.targets
+        weights = weight_table.weights_at(when)
+        minutes_per_km = weight_table.minutes_per_km()
+        landmark_distances = []
+        if self._landmark_count:
+            for from_landmark, to_landmark in self._landmark_distances()[1]:
+                landmark_distances.append((
+                    from_landmark, from_landmark[target],
+                    to_landmark, to_landmark[target]
+                ))
+
+        node_km = compiled.node_km
+        workspace = self._workspace(compiled)
+        generation = workspace.begin()
+        distances = workspace.distances
+        previous_nodes = workspace.parents
+        estimates = workspace.estimates
+        stamps = workspace.stamps
+
+        def heuristic(v: int) -> float:
+            # d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L)
+            estimate = node_km(v, target) * minutes_per_km
+            for from_l, from_l_target, to_l, to_l_target in landmark_distances:
+                if from_l[v] < math.inf and from_l_target < math.inf:
+                    estimate = max(estimate, from_l_target - from_l[v])
+                if to_l[v] < math.inf and to_l_target < math.inf:
+                    estimate = max(estimate, to_l[v] - to_l_target)
+            estimates[v] = estimate
+            return estimate
+
+        distances[source] = 0.0
+        stamps[source] = generation
+        pq = [(heuristic(source), 0.0, source)]
+
+        while pq:
+            _, current_distance, u = heapq.heappop(pq)
+
+            if u == target:
+                break
+
+            if current_distance > distances[u]:
+                continue
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                new_distance = current_distance + weights[k]
+
+                if stamps[v] != generation:
+                    # First time v is reached in this search
+                    stamps[v] = generation
+                    estimate = heuristic(v)
+                elif new_distance < distances[v]:
+                    estimate = estimates[v]
+                else:
+                    continue
+                distances[v] = new_distance
+                previous_nodes[v] = u
+                heapq.heappush(pq, (new_distance + estimate,
+                                    new_distance, v))
+
+        if stamps[target] != generation or distances[target] == math.inf:
+            return [], math.inf
+
+        weather_factor = weight_table.weather_factor(when)
+        return ([compiled.names[u] for u in workspace.path(source, target)],
+                distances[target] * weather_factor)
+
+    def bidirectional_dijkstra(self, start: str, end: str, 
+                               when: datetime = None
+                               ) -> Tuple[List[str], float]:
+        """
+        Dijkstra's algorithm growing one frontier from start over outgoing
+        roads and one from end over incoming roads.
+        
+        The search stops once the two smallest queue keys together reach the
+        best meeting cost found, which roughly halves the search radius of a
+        point-to-point query. One-way roads are handled by the transposed
+        CSR used for the backward frontier.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            when: Departure datetime for traffic calculation
+        
+        Returns:
+            Tuple containing the path and total cost in minutes (empty path
+            if unreachable)
+        """
+        if when is None:
+            when = datetime.now()
+
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        source = compiled.index[start]
+        target = compiled.index[end]
+        if source == target:
+            return [start], 0.0
+
+        offsets = compiled.offsets
+        targets = compiled.targets
+        reverse_offsets, reverse_sources, reverse_arcs = compiled.reverse_arcs()
+        weights = weight_table.weights_at(when)
+
+        forward = self._workspace(compiled)
+        backward = self._workspace(compiled, 1)
+        forward_generation = forward.begin()
+        backward_generation = backward.begin()
+        forward_distances = forward.distances
+        backward_distances = backward.distances
+        forward_stamps = forward.stamps
+        backward_stamps = backward.stamps
+        previous_nodes = forward.parents
+        next_nodes = backward.parents
+        forward_distances[source] = 0.0
+        forward_stamps[source] = forward_generation
+        backward_distances[target] = 0.0
+        backward_stamps[target] = backward_generation
+        forward_pq = [(0.0, source)]
+        backward_pq = [(0.0, target)]
+        best, meeting = math.inf, -1
+
+        while forward_pq and backward_pq:
+            if forward_pq[0][0] + backward_pq[0][0] >= best:
+                break
+
+            if forward_pq[0][0] <= backward_pq[0][0]:
+                current_distance, u = heapq.heappop(forward_pq)
+                if current_distance > forward_distances[u]:
+                    continue
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    new_distance = current_distance + weights[k]
+                    if (forward_stamps[v] != forward_generation or
+                            new_distance < forward_distances[v]):
+                        forward_stamps[v] = forward_generation
+                        forward_distances[v] = new_distance
+                        previous_nodes[v] = u
+                        heapq.heappush(forward_pq, (new_distance, v))
+                        if backward_stamps[v] == backward_generation:
+                            through = new_distance + backward_distances[v]
+                            if through < best:
+                                best, meeting = through, v
+            else:
+                current_distance, u = heapq.heappop(backward_pq)
+                if current_distance > backward_distances[u]:
+                    continue
+                for j in range(reverse_offsets[u], reverse_offsets[u + 1]):
+                    v = reverse_sources[j]
+                    new_distance = current_distance + weights[reverse_arcs[j]]
+                    if (backward_stamps[v] != backward_generation or
+                            new_distance < backward_distances[v]):
+                        backward_stamps[v] = backward_generation
+                        backward_distances[v] = new_distance
+                        next_nodes[v] = u
+                        heapq.heappush(backward_pq, (new_distance, v))
+                        if forward_stamps[v] == forward_generation:
+                            through = new_distance + forward_distances[v]
+                            if through < best:
+                                best, meeting = through, v
+
+        if meeting == -1:
+            return [], math.inf
+
+        path = forward.path(source, meeting)
+        current = meeting
+        while current != target:
+            current = next_nodes[current]
+            path.append(current)
+
+        return ([compiled.names[u] for u in path],
+                best * weight_table.weather_factor(when))
+
+    def build_contraction_hierarchy(self) -> ContractionHierarchy:
+        """
+        Runs the contraction hierarchy preprocessing for the current graph.
+        Only needs to be redone when roads or locations change; traffic,
+        construction and weather are applied by cheap customization.
+        
+        Returns:
+            The new ContractionHierarchy
+        """
+        self._hierarchy = ContractionHierarchy.build(self.compile_graph())
+        self._hierarchy_metrics = {}
+        return self._hierarchy
+
+    def save_contraction_hierarchy(self, filename: str) -> None:
+        """
+        Saves the contraction hierarchy, building it first if needed.
+        
+        Args:
+            filename: Name of the file to save to
+        """
+        self._current_hierarchy().save(filename)
+
+    def load_contraction_hierarchy(self, filename: str) -> None:
+        """
+        Loads a contraction hierarchy saved for this map.
+        
+        Args:
+            filename: Name of the file to load from
+        """
+        hierarchy = ContractionHierarchy.load(filename)
+        if not hierarchy.matches(self.compile_graph()):
+            raise ValueError(f"{filename} was built for a different map")
+        self._hierarchy = hierarchy
+        self._hierarchy_metrics = {}
+
+    def build_all_pairs(self, when: datetime = None,
+                        processes: int = 1) -> "AllPairsTable":
+        """
+        Precomputes every route on the map so dijkstra, calculate_eta and
+        generate_timing_report answer from table lookups.
+        
+        One distance and next-hop matrix is built per distinct weight
+        vector over the day of when, so slices with the same traffic share
+        a matrix. Queries under any other weight vector (after a road,
+        traffic or construction change, or on a day with different
+        construction) fall back to searching until the table is rebuilt.
+        Time-dependent queries use the table only for trips that arrive
+        before their departure slice ends; a trip that runs into a traffic
+        change is searched, so its ETA is the same as without the table.
+        
+        Memory grows with the square of the node count, so this is meant
+        for maps of up to a few thousand locations.
+        
+        Args:
+            when: Day whose slices are tabulated; defaults to today
+            processes: Worker processes for the searches
+        
+        Returns:
+            The AllPairsTable, which save_all_pairs() writes to disk
+        """
+        from .allpairs import AllPairsTable  # Needs NumPy
+
+        if when is None:
+            when = datetime.now()
+        weight_table = self.compile_weights()
+        day_start = datetime.combine(when.date(), time())
+        weight_vectors = [
+            weight_table.weights_at(day_start + timedelta(
+                minutes=s * weight_table.slice_minutes
+            ))
+            for s in range(weight_table.slices_per_day)
+        ]
+        self._all_pairs = AllPairsTable.build(weight_table.compiled,
+                                              weight_vectors, processes)
+        return self._all_pairs
+
+    def save_all_pairs(self, filename: str) -> None:
+        """
+        Saves the all-pairs table, building it first if needed.
+        
+        Args:
+            filename: Name of the .npz file to save to
+        """
+        if self._all_pairs is None:
+            self.build_all_pairs()
+        self._all_pairs.save(filename)
+
+    def load_all_pairs(self, filename: str) -> None:
+        """
+        Loads an all-pairs table saved for this map.
+        
+        Args:
+            filename: Name of the file to load from
+        """
+        from .allpairs import AllPairsTable  # Needs NumPy
+
+        table = AllPairsTable.load(filename)
+        fingerprint = self.compile_graph().fingerprint()
+        if table.fingerprint != fingerprint:
+            raise ValueError(f"{filename} was built for a different map")
+        self._all_pairs = table
+
+    def drop_all_pairs(self) -> None:
+        self._all_pairs = None
+
+    def _current_hierarchy(self) -> ContractionHierarchy:
+        hierarchy = self._hierarchy
+        if hierarchy is None or not hierarchy.matches(self.compile_graph()):
+            self.build_contraction_hierarchy()
+        return self._hierarchy
+
+    def ch_route(self, start: str, end: str, 
+                 when: datetime = None) -> Tuple[List[str], float]:
+        """
+        Answers a route query from the contraction hierarchy.
+        
+        The hierarchy is customized once per weight vector (traffic slice and
+        active construction) and the customization is cached.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            when: Departure datetime for traffic calculation
+        
+        Returns:
+            Tuple containing the path and total cost in minutes (empty path
+            if unreachable)
+        """
+        if when is None:
+            when = datetime.now()
+
+        hierarchy = self._current_hierarchy()
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        weights = weight_table.weights_at(when)
+
+        cached = self._hierarchy_metrics.get(id(weights))
+        if cached is None or cached[0] is not weights:
+            cached = (weights, hierarchy.customize(compiled, weights))
+            self._hierarchy_metrics[id(weights)] = cached
+
+        path, cost = hierarchy.query(
+            cached[1], compiled.index[start], compiled.index[end]
+        )
+        if not path:
+            return [], math.inf
+        return ([compiled.names[u] for u in path],
+                cost * weight_table.weather_factor(when))
+
+    def find_route(self, start: str, end: str, 
+                   current_time: datetime = None,
+                   algorithm: str = None) -> Tuple[List[str], float]:
+        """
+        Finds a route with the selected search algorithm, answering from the
+        hot-route table or the route cache when enable_hot_routes() or
+        enable_route_cache() was called. Every served query is recorded in
+        route_history.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            current_time: Departure datetime for traffic calculation
+            algorithm: "dijkstra", "astar", "bidirectional" or "ch";
+                defaults to self.routing_algorithm
+        
+        Returns:
+            Tuple containing the path and total cost in minutes
+        """
+        if current_time is None:
+            current_time = datetime.now()
+        weight_table = self.compile_weights()
+        route = None
+        if self.hot_routes is not None:
+            key = (start, end, self._traffic_bucket(current_time),
+                   current_time.date())
+            route = self.hot_routes.get(key, self.graph_version)
+        if route is not None:
+            route = list(route[0]), route[1]
+        elif self.route_cache is not None:
+            route = self._cached_route(start, end, current_time, algorithm)
+        else:
+            route = self._search_route(start, end, current_time, algorithm)
+        self.route_history.record(start, end,
+                                  weight_table.slice_index(current_time))
+        return route
+
+    def enable_route_cache(self, capacity: int = 1024,
+                           tree_capacity: int = 16) -> RouteCache:
+        """
+        Turns on route caching for find_route.
+        
+        Args:
+            capacity: Maximum number of cached routes
+            tree_capacity: Maximum number of cached shortest-path trees
+        
+        Returns:
+            The RouteCache, whose stats() reports hits, misses and evictions
+        """
+        self.route_cache = RouteCache(capacity, tree_capacity)
+        return self.route_cache
+
+    def enable_profiling(self, keep: int = 1000) -> SearchProfiler:
+        """
+        Turns on per-query counters and phase timings for dijkstra and the
+        time-dependent search behind calculate_eta and
+        generate_timing_report.
+        
+        The searches run the same loops either way. With a profiler, their
+        heap functions and slice lookups are swapped for counting stand-ins
+        that tally nodes settled, heap pushes and pops, stale-entry skips,
+        arcs relaxed and traffic lookups, and the search, reconstruction
+        and (time-dependent only) ETA phases are timed.
+        
+        Args:
+            keep: Number of recent per-query profiles to retain
+        
+        Returns:
+            The SearchProfiler, whose stats() and prometheus() export the
+            numbers
+        """
+        self.profiler = SearchProfiler(keep)
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        self.profiler = None
+
+    def shortest_path_tree(self, start: str, 
+                           current_time: datetime = None
+                           ) -> Tuple[List[float], List[int]]:
+        """
+        Computes distances and predecessors from start to every location.
+        
+        Args:
+            start: Starting location
+            current_time: Departure datetime for traffic calculation
+        
+        Returns:
+            Tuple of (distances, previous node ids) indexed by compiled node id
+        """
+        if current_time is None:
+            current_time = datetime.now()
+
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        weights = weight_table.weights_at(current_time)
+        offsets = compiled.offsets
+        targets = compiled.targets
+
+        source = compiled.index[start]
+        distances = [math.inf] * compiled.node_count
+        previous_nodes = [-1] * compiled.node_count
+        distances[source] = 0.0
+        pq = [(0.0, source)]
+        while pq:
+            current_distance, u = heapq.heappop(pq)
+            if current_distance > distances[u]:
+                continue
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                new_distance = current_distance + weights[k]
+                if new_distance < distances[v]:
+                    distances[v] = new_distance
+                    previous_nodes[v] = u
+                    heapq.heappush(pq, (new_distance, v))
+        return distances, previous_nodes
+
+    def _cached_route(self, start: str, end: str, current_time: datetime,
+                      algorithm: str) -> Tuple[List[str], float]:
+        cache = self.route_cache
+        cache.sync(self.graph_version)
+        weight_table = self.compile_weights()
+        bucket = self._traffic_bucket(current_time)
+        weather_date = current_time.date()
+
+        key = (start, end, bucket, weather_date)
+        route = cache.get_route(key)
+        if route is not None:
+            return list(route[0]), route[1]
+
+        tree_key = (start, bucket, weather_date)
+        tree = cache.get_tree(tree_key)
+        if tree is None:
+            # Second distinct destination from this origin: keep the tree
+            misses = cache.origin_misses.get(tree_key, 0) + 1
+            cache.origin_misses[tree_key] = misses
+            if misses >= 2:
+                tree = self.shortest_path_tree(start, current_time)
+                cache.put_tree(tree_key, tree)
+                del cache.origin_misses[tree_key]
+
+        if tree is not None:
+            cache.tree_hits += 1
+            compiled = weight_table.compiled
+            distances, previous_nodes = tree
+            target = compiled.index[end]
+            if distances[target] == math.inf:
+                route = ([], math.inf)
+            else:
+                route = (compiled.path_names(previous_nodes, target),
+                         distances[target] *
+                         weight_table.weather_factor(current_time))
+        else:
+            cache.misses += 1
+            route = self._search_route(start, end, current_time, algorithm)
+
+        cache.put_route(key, route)
+        return list(route[0]), route[1]
+
+    def _traffic_bucket(self, when: datetime) -> Tuple:
+        # Routes are identical for all times with the same bucket and date
+        weight_table = self.compile_weights()
+        return (weight_table.slice_index(when),
+                weight_table.active_construction(when))
+
+    def enable_hot_routes(self, per_slice: int = 32,
+                          interval: float = 300.0,
+                          background: bool = True) -> HotRouteTable:
+        """
+        Answers the most requested routes of every time slice from a
+        precomputed table.
+        
+        The pairs come from route_history, the ring buffer of queries
+        served by find_route. With background set, a daemon thread re-warms
+        the table every interval seconds; otherwise call warm_hot_routes()
+        whenever it suits.
+        
+        Args:
+            per_slice: Number of pairs precomputed per time slice
+            interval: Seconds between background warm-ups
+            background: Whether to start the warming thread
+        
+        Returns:
+            The HotRouteTable, whose stats() reports the hit rate
+        """
+        self.disable_hot_routes()
+        self.hot_routes = HotRouteTable(per_slice)
+        if background:
+            stop = threading.Event()
+            table = self.hot_routes
+
+            def warm_periodically():
+                while not stop.is_set():
+                    try:
+                        self.warm_hot_routes(table=table)
+                    except (KeyError, IndexError):
+                        # The graph changed under the warm-up; next round
+                        table.interrupted += 1
+                    except Exception as error:
+                        # Anything else is a bug; keep serving but show it
+                        table.failures += 1
+                        table.last_error = repr(error)
+                    stop.wait(interval)
+
+            thread = threading.Thread(target=warm_periodically,
+                                      name="hot-route-warmer", daemon=True)
+            self._hot_route_warmer = (thread, stop)
+            thread.start()
+        return self.hot_routes
+
+    def disable_hot_routes(self) -> None:
+        """
+        Stops background warming and drops the hot-route table.
+        """
+        if self._hot_route_warmer is not None:
+            thread, stop = self._hot_route_warmer
+            stop.set()
+            if thread is not threading.current_thread():
+                thread.join()
+            self._hot_route_warmer = None
+        self.hot_routes = None
+
+    def warm_hot_routes(self, when: datetime = None,
+                        table: HotRouteTable = None) -> int:
+        """
+        Recomputes the hot-route table from route_history.
+        
+        The top pairs of every recorded time slice are routed at the start
+        of that slice on the day of when, and the new routes replace the
+        table in one step.
+        
+        Args:
+            when: Day to compute routes for; defaults to now
+            table: Table to fill; defaults to self.hot_routes
+        
+        Returns:
+            Number of routes in the table
+        """
+        table = table or self.hot_routes
+        if table is None:
+            raise ValueError("Call enable_hot_routes() first")
+        started = perf_counter()
+        day = (when or datetime.now()).date()
+        version = self.graph_version
+        weight_table = self.compile_weights()
+        counts = self.route_history.pair_counts()
+        routes = {}
+        covered = total = 0
+        for slice_index, counter in counts.items():
+            total += sum(counter.values())
+            slice_start = datetime.combine(day, time()) + timedelta(
+                minutes=slice_index * weight_table.slice_minutes
+            )
+            bucket = self._traffic_bucket(slice_start)
+            for (start, end), n in counter.most_common(table.per_slice):
+                if (start not in weight_table.compiled.index or
+                        end not in weight_table.compiled.index):
+                    continue  # Recorded before the map was replaced
+                route = self._search_route(start, end, slice_start, None)
+                routes[(start, end, bucket, day)] = route
+                covered += n
+        table.replace(routes, version)
+        table.built_at = day
+        table.coverage = covered / total if total else 0.0
+        table.warmups += 1
+        table.warm_seconds = perf_counter() - started
+        return len(routes)
+
+    def hot_route_stats(self) -> Dict[str, float]:
+        """
+        Returns the hot-route table stats plus the size of route_history.
+        """
+        history = self.route_history
+        stats = self.hot_routes.stats() if self.hot_routes else {}
+        stats["recorded"] = history.recorded
+        stats["history"] = len(history)
+        stats["history_capacity"] = history.capacity
+        return stats
+
+    def _search_route(self, start: str, end: str, current_time: datetime,
+                      algorithm: str) -> Tuple[List[str], float]:
+        algorithm = algorithm or self.routing_algorithm
+        searches = {
+            "dijkstra": self.dijkstra,
+            "astar": self.astar,
+            "bidirectional": self.bidirectional_dijkstra,
+            "ch": self.ch_route,
+        }
+        if algorithm not in searches:
+            raise ValueError(f"Unknown routing algorithm: {algorithm}")
+        return searches[algorithm](start, end, current_time)
+
+    def alternative_routes(self, start: str, end: str, k: int = 3,
+                           when: datetime = None, max_overlap: float = 0.5,
+                           max_stretch: float = 1.25
+                           ) -> List[Tuple[List[str], float]]:
+        """
+        Finds up to k meaningfully different routes with the plateau method.
+        
+        One search from start and one reverse search to end, both stopped
+        at max_stretch times the fastest cost, are shared by every
+        alternative. A plateau is a run of roads that lies on both
+        shortest-path trees; following the forward tree to a plateau, along
+        it, and the reverse tree on to end gives a natural detour that is
+        locally shortest. Candidates are ranked by how much of their cost
+        lies outside their plateau, and kept if they are not too slow and
+        not too similar to routes already picked.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            k: Maximum number of routes to return
+            when: Departure datetime for traffic calculation
+            max_overlap: Largest share of a route's minutes that may be
+                shared with an earlier route
+            max_stretch: Largest allowed cost relative to the fastest route
+        
+        Returns:
+            List of (path, cost in minutes), fastest first
+        """
+        if when is None:
+            when = datetime.now()
+
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        weights = weight_table.weights_at(when)
+        source = compiled.index[start]
+        target = compiled.index[end]
+        forward, previous_nodes, best = self._bounded_tree(
+            compiled.offsets, compiled.targets, weights, source, target,
+            max_stretch
+        )
+        if best == math.inf or k <= 0:
+            return []
+        reverse_offsets, sources, arc_map = compiled.reverse_arcs()
+        backward, next_nodes, _ = self._bounded_tree(
+            reverse_offsets, sources, [weights[arc] for arc in arc_map],
+            target, source, max_stretch
+        )
+
+        # on_plateau[v]: the tree road into v is also v's parent's road on
+        # the reverse tree, i.e. u -> v lies on both trees
+        node_count = compiled.node_count
+        on_plateau = [False] * node_count
+        for v in range(node_count):
+            u = previous_nodes[v]
+            if u != -1 and next_nodes[u] == v:
+                on_plateau[v] = True
+
+        candidates = []
+        limit = best * max_stretch
+        for v in range(node_count):
+            # Only the last node of each plateau starts a walk
+            if not on_plateau[v]:
+                continue
+            w = next_nodes[v]
+            if w != -1 and on_plateau[w] and previous_nodes[w] == v:
+                continue
+            via_cost = forward[v] + backward[v]
+            if via_cost > limit:
+                continue
+            first = v
+            while on_plateau[first]:
+                first = previous_nodes[first]
+            plateau = forward[v] - forward[first]
+            candidates.append((via_cost - plateau, via_cost, first, v))
+        # The fastest route itself always goes first, even when ties split
+        # it over several plateaus
+        candidates.append((-math.inf, best, target, target))
+        candidates.sort()
+
+        weather_factor = weight_table.weather_factor(when)
+        routes = []
+        chosen_roads = []
+        for _, via_cost, first, last in candidates:
+            # Nodes, and the minutes of each road, of start -> first ->
+            # last -> end
+            nodes = []
+            current = last
+            while current != -1:
+                nodes.append(current)
+                current = previous_nodes[current]
+            nodes.reverse()
+            current = next_nodes[last]
+            while current != -1:
+                nodes.append(current)
+                current = next_nodes[current]
+            if len(set(nodes)) != len(nodes):
+                continue  # The two tree paths cross, so this is no detour
+
+            split = nodes.index(last)
+            roads = {}
+            for i in range(len(nodes) - 1):
+                a, b = nodes[i], nodes[i + 1]
+                roads[a, b] = (forward[b] - forward[a] if i < split
+                               else backward[a] - backward[b])
+            if any(
+                sum(minutes for road, minutes in roads.items()
+                    if road in other) > max_overlap * via_cost
+                for other in chosen_roads
+            ):
+                continue
+
+            chosen_roads.append(roads)
+            routes.append(([compiled.names[u] for u in nodes],
+                           via_cost * weather_factor))
+            if len(routes) == k:
+                break
+
+        routes.sort(key=lambda route: route[1])
+        return routes
+
+    @staticmethod
+    def _bounded_tree(offsets, targets, weights, source: int, target: int,
+                      max_stretch: float) -> Tuple[List[float], List[int], float]:
+        # Dijkstra that keeps going after target until max_stretch times its
+        # distance; every node within that bound ends up settled
+        node_count = len(offsets) - 1
+        distances = [math.inf] * node_count
+        parents = [-1] * node_count
+        distances[source] = 0.0
+        best = math.inf
+        limit = math.inf
+        pq = [(0.0, source)]
+        while pq:
+            current_distance, u = heapq.heappop(pq)
+            if current_distance > distances[u]:
+                continue
+            if current_distance > limit:
+                break
+            if u == target:
+                best = current_distance
+                limit = best * max_stretch
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                new_distance = current_distance + weights[k]
+                if new_distance < distances[v]:
+                    distances[v] = new_distance
+                    parents[v] = u
+                    heapq.heappush(pq, (new_distance, v))
+        return distances, parents, best
+
+    def nearest(self, latitude: float, longitude: float,
+                k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Returns the k locations closest to a GPS coordinate, as
+        (location, distance in km) pairs.
+        """
+        return self.spatial_index.nearest(latitude, longitude, k)
+
+    def within_radius(self, latitude: float, longitude: float,
+                      radius_km: float) -> List[Tuple[str, float]]:
+        """
+        Returns every location within radius_km of a GPS coordinate, as
+        (location, distance in km) pairs.
+        """
+        return self.spatial_index.within_radius(latitude, longitude,
+                                                radius_km)
+
+    def find_route_from_coordinates(self, origin: Tuple[float, float],
+                                    destination: Tuple[float, float],
+                                    current_time: datetime = None,
+                                    algorithm: str = None
+                                    ) -> Tuple[List[str], float]:
+        """
+        Snaps two (latitude, longitude) points to their nearest locations
+        and routes between them.
+        """
+        snapped_origin = self.nearest(*origin)
+        snapped_destination = self.nearest(*destination)
+        if not snapped_origin or not snapped_destination:
+            return [], math.inf
+        return self.find_route(snapped_origin[0][0],
+                               snapped_destination[0][0],
+                               current_time, algorithm)
+
+    def get_road_type_multiplier(self, road_type: str) -> float:
+        """
+        Returns a multiplier based on road type.
+        
+        Args:
+            road_type: Type of road
+        
+        Returns:
+            Multiplier for the road type
+        """
+        return ROAD_TYPE_MULTIPLIERS.get(road_type, 1.0)
+
+    def visualize_route(self, start: str, end: str, path: List[str], 
+                       show_traffic: bool = True, markers: str = "all",
+                       current_time: datetime = None,
+                       output="enhanced_route_map.html") -> None:
+        """
+        Enhanced visualization with traffic information and location metadata.
+        
+        The route is drawn as one colored line. On large maps, markers other
+        than "all" keep the HTML small: "bbox" marks the route plus the
+        locations in its bounding box, "route" only the route, and "cluster"
+        every location through one in-browser marker cluster.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            path: List of locations in the path
+            show_traffic: Whether to show traffic information
+            markers: Which locations to mark: "all", "bbox", "route" or
+                "cluster"
+            current_time: Time to show traffic for, now by default
+            output: File name, or a text or binary file object, to write
+                the HTML to
+        """
+        if markers not in ("all", "bbox", "route", "cluster"):
+            raise ValueError(f"Unknown marker mode: {markers}")
+        # Imported here so routing alone never pays for folium
+        import folium
+        from branca.colormap import StepColormap
+        from folium.plugins import FastMarkerCluster
+
+        if current_time is None:
+            current_time = datetime.now()
+
+        # Create base map
+        start_lat, start_lon = self.locations[start]
+        m = folium.Map(location=[start_lat, start_lon], zoom_start=12)
+
+        route_points = [tuple(self.locations[location])
+                        for location in (path or [start, end])]
+        if markers == "all":
+            marked = list(self.locations)
+        elif markers == "bbox":
+            latitudes = [lat for lat, _ in route_points]
+            longitudes = [lon for _, lon in route_points]
+            marked = self.spatial_index.within_bounds(
+                min(latitudes), min(longitudes),
+                max(latitudes), max(longitudes)
+            )
+            already = set(marked)
+            marked += [location for location in dict.fromkeys(path)
+                       if location not in already]
+        else:
+            marked = list(dict.fromkeys(path or [start, end]))
+
+        def popup_text(location: str) -> str:
+            metadata = self.location_metadata[location]
+            return f"""
+                <b>{location}</b><br>
+                Type: {metadata['type']}<br>
+                {metadata['description'] if metadata['description'] else ''}
+            """
+
+        if markers == "cluster":
+            # Markers are built in the browser from a compact data array
+            FastMarkerCluster(
+                [[lat, lon, popup_text(location)]
+                 for location, (lat, lon) in self.locations.items()],
+                callback="""
+                    function (row) {
+                        return L.marker(new L.LatLng(row[0], row[1]))
+                                .bindPopup(row[2]);
+                    }
+                """
+            ).add_to(m)
+
+        # Add locations with enhanced tooltips
+        for location in marked:
+            lat, lon = self.locations[location]
+            color = 'red' if location in [start, end] else 'blue'
+            folium.Marker(
+                [lat, lon],
+                popup=folium.Popup(popup_text(location), max_width=300),
+                icon=folium.Icon(color=color)
+            ).add_to(m)
+
+        # Plot the path as one line colored by traffic per segment
+        if len(path) > 1:
+            levels = []
+            for loc1, loc2 in zip(path, path[1:]):
+                traffic_multiplier = self.get_traffic_multiplier(
+                    loc1, loc2, current_time
+                )
+                levels.append(["green", "yellow", "red"].index(
+                    self.get_traffic_color(traffic_multiplier)
+                ) if show_traffic else 0)
+            colormap = (StepColormap(["green", "yellow", "red"],
+                                     index=[0, 1, 2, 3], vmin=0, vmax=3)
+                        if show_traffic else
+                        StepColormap(["blue"], index=[0, 3], vmin=0, vmax=3))
+            folium.ColorLine(
+                route_points, levels, colormap=colormap,
+                weight=4, opacity=0.8
+            ).add_to(m)
+
+        # Save the map
+        if isinstance(output, str):
+            m.save(output)
+            print(f"Enhanced map saved as '{output}'")
+        else:
+            html = m.get_root().render()
+            if isinstance(output, io.TextIOBase):
+                output.write(html)
+            else:
+                output.write(html.encode("utf-8"))
+
+    def get_traffic_color(self, traffic_multiplier: float) -> str:
+        """
+        Returns a color based on traffic conditions.
+        
+        Args:
+            traffic_multiplier: Traffic multiplier value
+        
+        Returns:
+            Color code for the traffic condition
+        """
+        if traffic_multiplier <= 1.0:
+            return "green"
+        elif traffic_multiplier <= 1.5:
+            return "yellow"
+        else:
+            return "red"
+
+    def save_to_json(self, filename: str) -> None:
+        """
+        Saves the current map data to a JSON file.
+        
+        Args:
+            filename: Name of the file to save to
+        """
+        data = {
+            "locations": self.locations,
+            "location_metadata": self.location_metadata,
+            "traffic_patterns": self.traffic_patterns,
+            "road_types": self.road_types,
+            "graph": {k: [(n, d, t) for n, d, t in v] 
+                     for k, v in self.graph.items()}
+        }
+        
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=4)
+
+    def load_from_json(self, filename: str) -> None:
+        """
+        Loads map data from a JSON file.
+        
+        Args:
+            filename: Name of the file to load from
+        """
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        
+        # Speed limits are not part of the JSON format; drop any that were
+        # still backed by a file opened with load_binary
+        self.__dict__.setdefault("speed_limits", {})
+        self._map_file = None
+        self.locations = data["locations"]
+        self.spatial_index = SpatialIndex()
+        for location, (latitude, longitude) in self.locations.items():
+            self.spatial_index.add(location, latitude, longitude)
+        self.location_metadata = data["location_metadata"]
+        # Schedules are not part of the JSON format either
+        self.location_schedules = {location: LocationSchedule()
+                                   for location in self.locations}
+        self.traffic_patterns = data["traffic_patterns"]
+        self.road_types = data["road_types"]
+        self.graph = {k: [(n, d, t) for n, d, t in v] 
+                     for k, v in data["graph"].items()}
+        self._traffic_tables = {}
+        self._compiled = None
+        self.graph_version += 1
+
+    def save_binary(self, filename: str) -> None:
+        """
+        Saves the map in the compact binary format read by load_binary.
+        
+        Args:
+            filename: Name of the file to save to
+        """
+        MapFile.write(filename, self.compile_graph(), {
+            name: getattr(self, name) for name in MapFile.JSON_SECTIONS
+        })
+
+    def import_network(self, filenames, output: str,
+                       chunk_size: int = 100_000, progress=None) -> Dict:
+        """
+        Bulk-loads a road network from CSV or GeoJSON-lines files.
+        
+        The files are streamed in chunks into a binary map at output, which
+        is then opened with load_binary, replacing the current map. See
+        NetworkImporter for the accepted columns.
+        
+        Args:
+            filenames: File or list of files, node files before edge files
+            output: Binary map file to write
+            chunk_size: Rows read per chunk
+            progress: Called with a progress dict after every chunk, e.g.
+                print_import_progress
+        
+        Returns:
+            Import summary from NetworkImporter.write
+        """
+        from .importer import NetworkImporter  # Needs pandas and NumPy
+
+        if isinstance(filenames, str):
+            filenames = [filenames]
+        importer = NetworkImporter(chunk_size, progress)
+        for filename in filenames:
+            importer.read(filename)
+        summary = importer.write(output)
+        self.load_binary(output)
+        return summary
+
+    def load_binary(self, filename: str) -> None:
+        """
+        Memory-maps a map saved with save_binary.
+        
+        Routing runs directly on the mapped arrays. The graph, locations,
+        metadata and schedule dicts are only built if something reads them,
+        e.g. when a road is added or a route is drawn. Schedules are not
+        saved, so every location starts with an empty one.
+        
+        Args:
+            filename: Name of the file to load from
+        """
+        map_file = MapFile(filename)
+        for name in MAPPED_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+        self._map_file = map_file
+        self._traffic_tables = {}
+        self._compiled = CompiledGraph.from_map_file(map_file)
+        self._weights = None
+        self.graph_version += 1
+
+    def set_operating_hours(self, location: str, day: DayOfWeek, 
+                          hours: List[Tuple[time, time]]):
+        """
+        Sets operating hours for a location on a specific day.
+        """
+        if location in self.location_schedules:
+            self.location_schedules[location].operating_hours[day] = hours
+
+    def add_peak_hours(self, location: str, peak_window: TimeWindow):
+        """
+        Adds peak hours information for a location.
+        """
+        if location in self.location_schedules:
+            self.location_schedules[location].peak_hours.append(peak_window)
+
+    def add_special_event(self, location: str, start: datetime, end: datetime, 
+                         event_name: str):
+        """
+        Adds a special event for a location.
+        """
+        if location in self.location_schedules:
+            self.location_schedules[location].special_events.append(
+                (start, end, event_name)
+            )
+
+    def add_construction_zone(self, location1: str, location2: str, 
+                            start_date: datetime, end_date: datetime,
+                            delay_factor: float):
+        """
+        Adds construction zone information for a road segment.
+        """
+        road_id = f"{location1}-{location2}"
+        self.construction_zones[road_id] = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "delay_factor": delay_factor
+        }
+        self._update_construction(road_id)
+
+    def remove_construction_zone(self, location1: str, location2: str):
+        """
+        Removes the construction zone of a road segment, e.g. when it reopens.
+        """
+        road_id = f"{location1}-{location2}"
+        if self.construction_zones.pop(road_id, None) is not None:
+            self._update_construction(road_id)
+
+    def _update_construction(self, road_id: str) -> None:
+        # Patch the weight table and repair tracked trees in place instead of
+        # recompiling everything downstream
+        previous_version = self.graph_version
+        self.graph_version += 1
+        weight_table = self._weights
+        if weight_table is None:
+            return
+        if weight_table.update_construction(self.construction_zones):
+            self._landmarks = None
+        live = {id(weights) for weights in weight_table.slice_vectors()}
+        self._hierarchy_metrics = {
+            key: entry for key, entry in self._hierarchy_metrics.items()
+            if key in live
+        }
+
+        arcs = weight_table.compiled.road_arcs(road_id)
+        for key, (tree, table, version) in self._dynamic_trees.items():
+            if table is not weight_table or version != previous_version:
+                continue  # Already stale, rebuilt on next use
+            when = key[1]
+            tree.update({
+                k: weight_table.arc_weight(k, when) for k in arcs
+                if weight_table.arc_weight(k, when) != tree.weights[k]
+            })
+            self._dynamic_trees[key] = (tree, table, self.graph_version)
+
+    def add_weather_impact(self, date: datetime, impact_factor: float,
+                         weather_type: str):
+        """
+        Adds weather impact information for a specific date.
+        """
+        self.weather_impacts[date.date()] = {
+            "impact_factor": impact_factor,
+            "weather_type": weather_type
+        }
+        previous_version = self.graph_version
+        self.graph_version += 1
+        # Weather scales whole routes, so tracked trees stay valid
+        for key, (tree, table, version) in self._dynamic_trees.items():
+            if version == previous_version:
+                self._dynamic_trees[key] = (tree, table, self.graph_version)
+
+    def track_origin(self, start: str, when: datetime) -> None:
+        """
+        Keeps a shortest-path tree from start, for trips leaving at when,
+        that construction updates repair instead of recomputing.
+        """
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        tree = DynamicShortestPathTree(compiled, weight_table.weights_at(when),
+                                       compiled.index[start])
+        self._dynamic_trees[start, when] = (tree, weight_table,
+                                            self.graph_version)
+
+    def untrack_origin(self, start: str, when: datetime) -> None:
+        self._dynamic_trees.pop((start, when), None)
+
+    def tracked_route(self, start: str, end: str, 
+                      when: datetime) -> Tuple[List[str], float]:
+        """
+        Route from a tracked origin, read off its repaired tree. The tree is
+        rebuilt if the graph itself changed since it was last repaired.
+        
+        Returns:
+            Tuple of (path, cost in minutes); ([], inf) if unreachable
+        """
+        if (start, when) not in self._dynamic_trees:
+            raise KeyError(f"{start} at {when} is not a tracked origin")
+        tree, table, version = self._dynamic_trees[start, when]
+        if version != self.graph_version or table is not self._weights:
+            self.track_origin(start, when)
+            tree, table, version = self._dynamic_trees[start, when]
+
+        compiled = tree.compiled
+        target = compiled.index[end]
+        path = tree.path(target)
+        if not path:
+            return [], math.inf
+        return ([compiled.names[u] for u in path],
+                tree.distances[target] * table.weather_factor(when))
+
+    def time_dependent_route(self, start: str, end: str, 
+                             departure_time: datetime
+                             ) -> Tuple[List[str], Optional[datetime], List[Dict]]:
+        """
+        Time-dependent Dijkstra: every road is costed at the time the trip
+        actually reaches it, not at the departure time.
+        
+        Returns the path, the arrival time and the per-segment breakdown
+        from a single search, so ETA and timing reports need no second pass.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            departure_time: Departure datetime
+        
+        Returns:
+            Tuple of (path, arrival time, segments); the path is empty and the
+            arrival time None if the destination is unreachable
+        """
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        source = compiled.index[start]
+        target = compiled.index[end]
+
+        day_start = departure_time.replace(hour=0, minute=0, second=0,
+                                           microsecond=0)
+        clock = weight_table.slice_clock(day_start)
+        traverse = weight_table.traverse
+        slice_minutes = weight_table.slice_minutes
+        offsets = compiled.offsets
+        targets = compiled.targets
+        depart = (departure_time - day_start).total_seconds() / 60
+
+        table = self._all_pairs
+        slice_number = int(depart // slice_minutes)
+        weights, weather_factor = clock(slice_number)
+        matrix = (table.matrix_for(compiled, weights)
+                  if table is not None else None)
+        arcs = (table.path_arcs(matrix, source, target)
+                if matrix is not None else None)
+        if arcs is not None:
+            # The tabulated route is exact only for trips that end within
+            # the departure slice; longer ones fall through to the search
+            slice_end = (slice_number + 1) * slice_minutes
+            nodes = [source]
+            times = [depart]
+            for k in arcs:
+                arrival = times[-1] + weights[k] * weather_factor
+                if arrival > slice_end:
+                    break
+                nodes.append(targets[k])
+                times.append(arrival)
+            else:
+                return self._route_segments(weight_table, day_start, nodes,
+                                            arcs, times)
+
+        workspace = self._workspace(compiled)
+        generation = workspace.begin()
+        arrivals = workspace.distances
+        previous_arcs = workspace.parent_arcs
+        previous_nodes = workspace.parents
+        stamps = workspace.stamps
+        arrivals[source] = depart
+        stamps[source] = generation
+        heappop, heappush = heapq.heappop, heapq.heappush
+        profiler = self.profiler
+        if profiler is not None:
+            profile = profiler.begin("time_dependent", start, end)
+            heappop, heappush = profile.heap_hooks(arrivals, offsets, target)
+            clock = profile.count_lookups(clock)
+        pq = []
+        heappush(pq, (depart, source))
+
+        while pq:
+            current_time, u = heappop(pq)
+
+            if u == target:
+                break
+
+            if current_time > arrivals[u]:
+                continue
+
+            slice_number = int(current_time // slice_minutes)
+            weights, weather_factor = clock(slice_number)
+            slice_end = (slice_number + 1) * slice_minutes
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                arrival = current_time + weights[k] * weather_factor
+                if arrival > slice_end:
+                    arrival = traverse(k, current_time, clock)
+
+                if stamps[v] != generation or arrival < arrivals[v]:
+                    stamps[v] = generation
+                    arrivals[v] = arrival
+                    previous_arcs[v] = k
+                    previous_nodes[v] = u
+                    heappush(pq, (arrival, v))
+
+        if profiler is not None:
+            profile.lap("search")
+
+        if stamps[target] != generation or arrivals[target] == math.inf:
+            if profiler is not None:
+                profiler.finish(profile)
+            return [], None, []
+
+        nodes = workspace.path(source, target)
+        arcs = [previous_arcs[v] for v in nodes[1:]]
+        times = [arrivals[u] for u in nodes]
+        if profiler is None:
+            return self._route_segments(weight_table, day_start, nodes, arcs,
+                                        times)
+        profile.lap("reconstruction")
+        route = self._route_segments(weight_table, day_start, nodes, arcs,
+                                     times)
+        profile.traffic_lookups += len(arcs)  # arc_factors()
+        profile.lap("eta")
+        profiler.finish(profile)
+        return route
+
+    @staticmethod
+    def _route_segments(weight_table: EdgeWeightTable, day_start: datetime,
+                        nodes: List[int], arcs: List[int], times: List[float]
+                        ) -> Tuple[List[str], datetime, List[Dict]]:
+        # Path names, arrival time and per-road breakdown of a timed route
+        compiled = weight_table.compiled
+        segments = []
+        for i, k in enumerate(arcs):
+            segment_start = day_start + timedelta(minutes=times[i])
+            segment_end = day_start + timedelta(minutes=times[i + 1])
+            segments.append({
+                "from": compiled.names[nodes[i]],
+                "to": compiled.names[nodes[i + 1]],
+                "start_time": segment_start,
+                "factors": weight_table.arc_factors(k, segment_start),
+                "duration": segment_end - segment_start,
+                "distance": compiled.distance[k],
+                "end_time": segment_end
+            })
+
+        arrival_time = day_start + timedelta(minutes=times[-1])
+        return [compiled.names[u] for u in nodes], arrival_time, segments
+
+    def calculate_eta(self, start: str, end: str, 
+                     departure_time: datetime) -> timedelta:
+        """
+        Calculates estimated time of arrival considering all factors.
+        """
+        path, arrival_time, _ = self.time_dependent_route(
+            start, end, departure_time
+        )
+        if not path:
+            return None
+
+        return arrival_time - departure_time
+
+    def is_location_open(self, location: str, 
+                        check_time: datetime) -> Tuple[bool, str]:
+        """
+        Checks if a location is open at a specific time.
+        """
+        if location not in self.location_schedules:
+            return True, "No schedule information available"
+
+        schedule = self.location_schedules[location]
+        day = DayOfWeek(check_time.weekday())
+
+        # Check operating hours
+        if day in schedule.operating_hours:
+            for start, end in schedule.operating_hours[day]:
+                if start <= check_time.time() <= end:
+                    break
+            else:
+                return False, "Outside operating hours"
+
+        # Check special events
+        for event_start, event_end, event_name in schedule.special_events:
+            if event_start <= check_time <= event_end:
+                return False, f"Closed for special event: {event_name}"
+
+        return True, "Open"
+
+    def opening_windows(self, location: str, since: datetime,
+                        until: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Periods between since and until in which is_location_open reports
+        the location open, as (opens, closes) pairs.
+        """
+        schedule = self.location_schedules.get(location)
+        if schedule is None:
+            return [(since, until)]
+
+        windows = []
+        day = since.date()
+        while day <= until.date():
+            hours = schedule.operating_hours.get(DayOfWeek(day.weekday()))
+            if hours is None:
+                midnight = datetime.combine(day, time())
+                spans = [(midnight, midnight + timedelta(days=1))]
+            else:
+                spans = sorted((datetime.combine(day, opens),
+                                datetime.combine(day, closes))
+                               for opens, closes in hours)
+            for opens, closes in spans:
+                if closes < opens:
+                    continue  # is_location_open never matches these
+                if windows and opens <= windows[-1][1]:
+                    windows[-1] = (windows[-1][0], max(windows[-1][1], closes))
+                else:
+                    windows.append((opens, closes))
+            day += timedelta(days=1)
+
+        # Special events close the location for their whole span
+        for event_start, event_end, _ in schedule.special_events:
+            remaining = []
+            for opens, closes in windows:
+                if event_end < opens or event_start > closes:
+                    remaining.append((opens, closes))
+                    continue
+                if opens <= event_start - EVENT_MARGIN:
+                    remaining.append((opens, event_start - EVENT_MARGIN))
+                if event_end + EVENT_MARGIN <= closes:
+                    remaining.append((event_end + EVENT_MARGIN, closes))
+            windows = remaining
+
+        return [(max(opens, since), min(closes, until))
+                for opens, closes in windows
+                if closes >= since and opens <= until]
+
+    def plan_tour(self, start: str, stops: List[str], departure_time: datetime,
+                  service_minutes=0.0, end: str = None,
+                  return_to_start: bool = True, horizon_hours: float = 24,
+                  time_sliced: bool = True, max_seconds: float = 2.0) -> Dict:
+        """
+        Orders a day of visits so every stop is reached while it is open
+        and the tour finishes as early as possible.
+        
+        Travel times come from a stop-to-stop matrix per weight-table time
+        slice, built on first use with one one_to_many search per stop, or
+        from the departure-time matrix alone without time_sliced. The
+        tour is built by cheapest insertion in order of closing time, then
+        improved with 2-opt and Or-opt moves. Visits start inside the
+        windows from opening_windows, waiting for the opening if the tour
+        arrives early. A stop that cannot be reached before it closes is
+        still visited, but marked late, and lateness is minimized first.
+        
+        Args:
+            start: Location the tour leaves from
+            stops: Locations to visit, in any order
+            departure_time: When the tour leaves start
+            service_minutes: Minutes spent at every stop, or a dict of
+                minutes per stop
+            end: Location the tour must finish at; defaults to start when
+                return_to_start is set
+            return_to_start: Finish back at start if end is not given;
+                otherwise the tour ends at its last stop
+            horizon_hours: How far ahead opening hours are considered
+            time_sliced: Cost later legs at the traffic of their own time
+                slice instead of at departure-time traffic
+            max_seconds: Time limit for the local search, not counting
+                matrix building
+        
+        Returns:
+            Dictionary with the visit schedule and totals
+        """
+        if end is None and return_to_start:
+            end = start
+        stops = [stop for stop in dict.fromkeys(stops)
+                 if stop not in (start, end)]
+        names = [start] + stops
+        end_node = None
+        if end is not None:
+            end_node = 0 if end == start else len(names)
+            if end != start:
+                names.append(end)
+
+        weight_table = self.compile_weights()
+        day_start = departure_time.replace(hour=0, minute=0, second=0,
+                                           microsecond=0)
+        slice_minutes = weight_table.slice_minutes
+
+        matrices = {}
+
+        def matrix_at(slice_number: int) -> List[List[float]]:
+            when = departure_time
+            if time_sliced:
+                when = day_start + timedelta(
+                    minutes=slice_number * slice_minutes
+                )
+            if when not in matrices:
+                matrices[when] = [self.one_to_many(name, names, when)
+                                  for name in names]
+            return matrices[when]
+
+        until = departure_time + timedelta(hours=horizon_hours)
+        windows = {}
+        for node, stop in enumerate(stops, 1):
+            spans = self.opening_windows(stop, departure_time, until)
+            if spans != [(departure_time, until)]:
+                windows[node] = [
+                    ((opens - departure_time).total_seconds() / 60,
+                     (closes - departure_time).total_seconds() / 60)
+                    for opens, closes in spans
+                ]
+        if isinstance(service_minutes, dict):
+            service = {node: service_minutes.get(stop, 0.0)
+                       for node, stop in enumerate(stops, 1)}
+        else:
+            service = {node: service_minutes
+                       for node in range(1, len(stops) + 1)}
+
+        planner = TourPlanner(matrix_at, slice_minutes,
+                              (departure_time - day_start).total_seconds() / 60,
+                              windows, service, 0, end_node)
+
+        # Stops are only mutually reachable through the depot if they can
+        # get there and back
+        matrix = planner.matrix(0.0)
+        back = 0 if end_node is None else end_node
+        reachable, unreachable = [], []
+        for node in range(1, len(stops) + 1):
+            if matrix[0][node] < math.inf and matrix[node][back] < math.inf:
+                reachable.append(node)
+            else:
+                unreachable.append(names[node])
+
+        # Matrices built during the search do not count as search time
+        matrix_seconds = planner.matrix_seconds
+        started = perf_counter()
+        order = planner.plan(reachable, max_seconds)
+        seconds = (perf_counter() - started -
+                   (planner.matrix_seconds - matrix_seconds))
+
+        report = {
+            "departure_time": departure_time,
+            "stops": [],
+            "order": [names[node] for node in order],
+            "end": end,
+            "total_time": timedelta(),
+            "travel_time": timedelta(),
+            "waiting_time": timedelta(),
+            "late_stops": [],
+            "unreachable": unreachable,
+            "search": {
+                "moves": planner.moves,
+                "improvements": planner.improvements,
+                "seconds": seconds,
+                "moves_per_second": planner.moves / seconds if seconds else 0,
+                "matrices": len(matrices),
+                "matrix_seconds": planner.matrix_seconds
+            }
+        }
+
+        previous, t = 0, 0.0
+        for node in order:
+            arrival, begin, overdue = planner.visit(previous, node, t)
+            report["travel_time"] += timedelta(minutes=arrival - t)
+            t = begin + service[node]
+            service_start = departure_time + timedelta(minutes=begin)
+            is_open, status = self.is_location_open(names[node],
+                                                    service_start)
+            report["stops"].append({
+                "location": names[node],
+                "arrival_time": departure_time + timedelta(minutes=arrival),
+                "service_start": service_start,
+                "departure_time": departure_time + timedelta(minutes=t),
+                "wait": timedelta(minutes=begin - arrival),
+                "late": timedelta(minutes=overdue),
+                "open": is_open,
+                "status": status
+            })
+            report["waiting_time"] += timedelta(minutes=begin - arrival)
+            if overdue > 0:
+                report["late_stops"].append(names[node])
+            previous = node
+
+        if end_node is not None:
+            arrival = planner.visit(previous, end_node, t)[0]
+            report["travel_time"] += timedelta(minutes=arrival - t)
+            t = arrival
+        report["arrival_time"] = departure_time + timedelta(minutes=t)
+        report["total_time"] = timedelta(minutes=t)
+        return report
+
+    def departure_profile(self, start: str, end: str, 
+                          window_start: datetime, window_end: datetime
+                          ) -> List[Tuple[datetime, datetime]]:
+        """
+        Profile search: computes the arrival time at end for every departure
+        time in the window in a single run.
+        
+        Arrival times are piecewise linear in the departure time, with
+        breakpoints only where a trip crosses a traffic slice boundary, so
+        each node carries a short breakpoint list instead of a single label.
+        Use it for whole travel-time curves; an arrive-by query only needs
+        one point of the curve and latest_departure() is much cheaper.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            window_start: Earliest departure time
+            window_end: Latest departure time
+        
+        Returns:
+            (departure, arrival) breakpoints, linear in between; empty if the
+            destination is unreachable
+        """
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        source = compiled.index[start]
+        target = compiled.index[end]
+
+        day_start = window_start.replace(hour=0, minute=0, second=0,
+                                         microsecond=0)
+        clock = weight_table.slice_clock(day_start)
+        lo = (window_start - day_start).total_seconds() / 60
+        hi = (window_end - day_start).total_seconds() / 60
+        offsets = compiled.offsets
+        targets = compiled.targets
+
+        functions = {source: [(lo, lo), (hi, hi)] if hi > lo else [(lo, lo)]}
+        pq = [(lo, source)]
+        while pq:
+            earliest, u = heapq.heappop(pq)
+            function = functions[u]
+            if earliest > function[0][1]:
+                continue
+            # Keys only grow, so nothing left can improve the destination
+            if target in functions and earliest >= functions[target][-1][1]:
+                break
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                candidate = weight_table.compose_arrival(k, function, clock)
+                if candidate[-1][1] == math.inf:
+                    continue
+                if v in functions:
+                    envelope, improved = pwl_lower_envelope(
+                        functions[v], candidate
+                    )
+                    if not improved:
+                        continue
+                    functions[v] = envelope
+                else:
+                    functions[v] = candidate
+                heapq.heappush(pq, (functions[v][0][1], v))
+
+        if target not in functions:
+            return []
+        return [
+            (day_start + timedelta(minutes=x), day_start + timedelta(minutes=y))
+            for x, y in functions[target] if y < math.inf
+        ]
+
+    def one_to_many(self, start: str, destinations: List[str], 
+                    when: datetime = None,
+                    time_dependent: bool = False) -> List[float]:
+        """
+        Costs from one origin to many destinations in a single search that
+        stops as soon as every destination is settled.
+        
+        Args:
+            start: Starting location
+            destinations: Destination locations
+            when: Departure datetime for traffic calculation
+            time_dependent: Return time-dependent travel minutes instead of
+                the cost at the departure-time weights
+        
+        Returns:
+            Minutes per destination, inf where unreachable
+        """
+        if when is None:
+            when = datetime.now()
+
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        source = compiled.index[start]
+        target_ids = [compiled.index[d] for d in destinations]
+        remaining = set(target_ids)
+        offsets = compiled.offsets
+        targets = compiled.targets
+
+        workspace = self._workspace(compiled)
+        generation = workspace.begin()
+        distances = workspace.distances
+        stamps = workspace.stamps
+        if time_dependent:
+            day_start = when.replace(hour=0, minute=0, second=0,
+                                     microsecond=0)
+            clock = weight_table.slice_clock(day_start)
+            traverse = weight_table.traverse
+            slice_minutes = weight_table.slice_minutes
+            depart = (when - day_start).total_seconds() / 60
+        else:
+            weights = weight_table.weights_at(when)
+            depart = 0.0
+        distances[source] = depart
+        stamps[source] = generation
+        pq = [(depart, source)]
+
+        while pq and remaining:
+            current_distance, u = heapq.heappop(pq)
+            if current_distance > distances[u]:
+                continue
+            remaining.discard(u)
+
+            if time_dependent:
+                slice_number = int(current_distance // slice_minutes)
+                weights, weather_factor = clock(slice_number)
+                slice_end = (slice_number + 1) * slice_minutes
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if time_dependent:
+                    new_distance = (current_distance +
+                                    weights[k] * weather_factor)
+                    if new_distance > slice_end:
+                        new_distance = traverse(k, current_distance, clock)
+                else:
+                    new_distance = current_distance + weights[k]
+
+                if stamps[v] != generation or new_distance < distances[v]:
+                    stamps[v] = generation
+                    distances[v] = new_distance
+                    heapq.heappush(pq, (new_distance, v))
+
+        costs = [distances[t] if stamps[t] == generation else math.inf
+                 for t in target_ids]
+        if time_dependent:
+            return [cost - depart for cost in costs]
+        weather_factor = weight_table.weather_factor(when)
+        return [cost * weather_factor for cost in costs]
+
+    def isochrone(self, start: str, when: datetime, 
+                  budget_minutes: float) -> Dict[str, datetime]:
+        """
+        Everything reachable from start within a travel-time budget.
+        
+        One time-dependent search, stopped as soon as the earliest unsettled
+        arrival is past the budget, replaces an ETA query per location.
+        
+        Args:
+            start: Starting location
+            when: Departure datetime
+            budget_minutes: Travel-time budget in minutes
+        
+        Returns:
+            Reachable locations mapped to their arrival times, earliest first
+        """
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        source = compiled.index[start]
+
+        day_start = when.replace(hour=0, minute=0, second=0, microsecond=0)
+        clock = weight_table.slice_clock(day_start)
+        traverse = weight_table.traverse
+        slice_minutes = weight_table.slice_minutes
+        offsets = compiled.offsets
+        targets = compiled.targets
+
+        workspace = self._workspace(compiled)
+        generation = workspace.begin()
+        arrivals = workspace.distances
+        stamps = workspace.stamps
+        depart = (when - day_start).total_seconds() / 60
+        deadline = depart + budget_minutes
+        arrivals[source] = depart
+        stamps[source] = generation
+        pq = [(depart, source)]
+        reached = []
+
+        while pq:
+            current_time, u = heapq.heappop(pq)
+            if current_time > deadline:
+                break
+            if current_time > arrivals[u]:
+                continue
+            reached.append(u)
+
+            slice_number = int(current_time // slice_minutes)
+            weights, weather_factor = clock(slice_number)
+            slice_end = (slice_number + 1) * slice_minutes
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                arrival = current_time + weights[k] * weather_factor
+                if arrival > slice_end:
+                    arrival = traverse(k, current_time, clock)
+
+                if arrival <= deadline and (stamps[v] != generation or
+                                            arrival < arrivals[v]):
+                    stamps[v] = generation
+                    arrivals[v] = arrival
+                    heapq.heappush(pq, (arrival, v))
+
+        return {
+            compiled.names[u]: day_start + timedelta(minutes=arrivals[u])
+            for u in reached
+        }
+
+    def isochrone_polygon(self, start: str, when: datetime, 
+                          budget_minutes: float) -> List[Tuple[float, float]]:
+        """
+        Convex outline, as (latitude, longitude) points, of the locations
+        returned by isochrone().
+        """
+        reachable = self.isochrone(start, when, budget_minutes)
+        return convex_hull([tuple(self.locations[location])
+                            for location in reachable])
+
+    def visualize_isochrone(self, start: str, when: datetime, 
+                            budget_minutes: float) -> None:
+        """
+        Saves a map of the area reachable within the budget, with every
+        reachable location marked with its arrival time.
+        """
+        import folium
+
+        reachable = self.isochrone(start, when, budget_minutes)
+        start_lat, start_lon = self.locations[start]
+        m = folium.Map(location=[start_lat, start_lon], zoom_start=12)
+
+        outline = convex_hull([tuple(self.locations[location])
+                               for location in reachable])
+        if len(outline) >= 3:
+            folium.Polygon(
+                outline, color="blue", fill=True, fill_opacity=0.2,
+                popup=f"Reachable within {budget_minutes:g} minutes"
+            ).add_to(m)
+
+        for location, arrival in reachable.items():
+            lat, lon = self.locations[location]
+            folium.CircleMarker(
+                [lat, lon], radius=4,
+                color='red' if location == start else 'blue',
+                popup=f"{location}: {arrival.strftime('%H:%M')}"
+            ).add_to(m)
+
+        m.save("isochrone_map.html")
+        print("Isochrone map saved as 'isochrone_map.html'")
+
+    def distance_matrix(self, origins: List[str], destinations: List[str],
+                        when: datetime = None, return_times: bool = False,
+                        processes: int = None):
+        """
+        Travel-cost matrix between many origins and destinations.
+        
+        Runs one bounded search per origin and fans the origins out over a
+        process pool. Workers are forked after the graph and weights are
+        compiled, so they share those pages read-only instead of rebuilding
+        or copying them.
+        
+        Args:
+            origins: Origin locations (matrix rows)
+            destinations: Destination locations (matrix columns)
+            when: Departure datetime for traffic calculation
+            return_times: Also return time-dependent travel minutes
+            processes: Worker processes; defaults to the CPU count, and 1
+                runs everything in this process
+        
+        Returns:
+            NumPy array of costs in minutes (inf where unreachable), or a
+            (costs, times) pair when return_times is set
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        import numpy as np
+
+        if when is None:
+            when = datetime.now()
+
+        # Compile before forking so every worker inherits the result
+        weight_table = self.compile_weights()
+        weight_table.weights_at(when)
+
+        processes = processes or os.cpu_count() or 1
+        processes = min(processes, len(origins))
+        if processes > 1:
+            chunk = math.ceil(len(origins) / (processes * 4))
+            batches = [origins[i:i + chunk]
+                       for i in range(0, len(origins), chunk)]
+            if "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+            else:
+                context = None
+            with ProcessPoolExecutor(processes, mp_context=context,
+                                     initializer=_init_matrix_worker,
+                                     initargs=(self,)) as pool:
+                rows = [row for batch_rows in pool.map(
+                            _matrix_worker_rows, batches,
+                            [destinations] * len(batches),
+                            [when] * len(batches),
+                            [return_times] * len(batches))
+                        for row in batch_rows]
+        else:
+            _init_matrix_worker(self)
+            rows = _matrix_worker_rows(origins, destinations, when,
+                                       return_times)
+
+        costs = np.array([row[0] for row in rows], dtype=float).reshape(
+            len(origins), len(destinations)
+        )
+        if not return_times:
+            return costs
+        times = np.array([row[1] for row in rows], dtype=float).reshape(
+            len(origins), len(destinations)
+        )
+        return costs, times
+
+    def latest_departure(self, start: str, end: str, 
+                         target_arrival: datetime,
+                         earliest: datetime = None) -> Optional[datetime]:
+        """
+        Reverse time-dependent search: the latest time to leave start and
+        still reach end by target_arrival.
+        
+        Runs backward from end over incoming roads, inverting each road's
+        traversal time. FIFO traversal makes this exact in a single search,
+        which is the arrive-by reading of the departure profile.
+        
+        Args:
+            start: Starting location
+            end: Destination location
+            target_arrival: Required arrival datetime
+            earliest: Give up on departures before this time
+        
+        Returns:
+            Latest departure datetime, or None if there is none
+        """
+        weight_table = self.compile_weights()
+        compiled = weight_table.compiled
+        source = compiled.index[start]
+        target = compiled.index[end]
+
+        day_start = (earliest or target_arrival).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        clock = weight_table.slice_clock(day_start)
+        latest_entry = weight_table.latest_entry
+        slice_minutes = weight_table.slice_minutes
+        reverse_offsets, reverse_sources, reverse_arcs = compiled.reverse_arcs()
+        cutoff = (-math.inf if earliest is None else
+                  (earliest - day_start).total_seconds() / 60)
+
+        departures = [-math.inf] * compiled.node_count
+        deadline = (target_arrival - day_start).total_seconds() / 60
+        departures[target] = deadline
+        pq = [(-deadline, target)]
+
+        while pq:
+            negative_time, u = heapq.heappop(pq)
+            current_time = -negative_time
+
+            if u == source or current_time < cutoff:
+                break
+
+            if current_time < departures[u]:
+                continue
+
+            slice_number = math.ceil(current_time / slice_minutes) - 1
+            weights, weather_factor = clock(slice_number)
+            slice_start = slice_number * slice_minutes
+
+            for j in range(reverse_offsets[u], reverse_offsets[u + 1]):
+                k = reverse_arcs[j]
+                v = reverse_sources[j]
+                departure = current_time - weights[k] * weather_factor
+                if departure < slice_start:
+                    departure = latest_entry(k, current_time, clock)
+
+                if departure > departures[v]:
+                    departures[v] = departure
+                    heapq.heappush(pq, (-departure, v))
+
+        if departures[source] == -math.inf or departures[source] < cutoff:
+            return None
+        return day_start + timedelta(minutes=departures[source])
+
+    def get_optimal_departure_time(self, start: str, end: str, 
+                                 target_arrival: datetime,
+                                 search_window_hours: int = 3) -> datetime:
+        """
+        Finds the latest departure time, on a whole minute before the target
+        and within the search window, that still reaches the destination by
+        target time. Uses one reverse search instead of one route search per
+        candidate minute.
+        """
+        window_start = target_arrival - timedelta(hours=search_window_hours)
+        latest = self.latest_departure(start, end, target_arrival,
+                                       earliest=window_start)
+        if latest is None:
+            return None
+
+        # Stay on the whole-minute grid counted back from the target, and
+        # step back one more minute if rounding put us a hair too late
+        minutes_early = math.ceil(
+            round((target_arrival - latest).total_seconds() / 60, 6)
+        )
+        departure = target_arrival - timedelta(minutes=minutes_early)
+        _, arrival_time, _ = self.time_dependent_route(start, end, departure)
+        if arrival_time is None or arrival_time > target_arrival:
+            departure -= timedelta(minutes=1)
+        if departure <= window_start:
+            return None
+        return departure
+
+    def generate_timing_report(self, start: str, end: str, 
+                             departure_time: datetime) -> Dict:
+        """
+        Generates a detailed timing report for a route.
+        """
+        path, arrival_time, segments = self.time_dependent_route(
+            start, end, departure_time
+        )
+        if not path:
+            return None
+
+        report = {
+            "departure_time": departure_time,
+            "total_distance": 0,
+            "total_time": timedelta(),
+            "segments": segments,
+            "factors_considered": {
+                "traffic": [],
+                "construction": [],
+                "weather": [],
+                "special_events": []
+            }
+        }
+
+        for segment in segments:
+            report["total_distance"] += segment["distance"]
+            report["total_time"] += segment["duration"]
+
+        report["arrival_time"] = arrival_time
+        return report
@@ -0,0 +1,180 @@
+"""Opt-in per-query search counters and phase timings."""
+import heapq
+from collections import deque
+from time import perf_counter
+from typing import Callable, Dict, Sequence, Tuple
+
+COUNTERS = ("settled", "heap_pushes", "heap_pops", "stale_skips",
+            "edges_relaxed", "traffic_lookups")
+
+# Prometheus metric name and help text per counter
+_METRICS = {
+    "settled": ("nodes_settled", "Nodes settled by the search."),
+    "heap_pushes": ("heap_pushes", "Priority queue pushes."),
+    "heap_pops": ("heap_pops", "Priority queue pops."),
+    "stale_skips": ("stale_skips", "Popped entries skipped as outdated."),
+    "edges_relaxed": ("edges_relaxed", "Arcs scanned from settled nodes."),
+    "traffic_lookups": ("traffic_lookups",
+                        "Time-slice weight and traffic factor lookups."),
+}
+
+class QueryProfile:
+    """
+    Counters and phase timings of one search.
+    """
+    __slots__ = COUNTERS + ("kind", "start", "end", "phases", "_mark")
+
+    def __init__(self, kind: str, start: str, end: str):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.phases = {}
+        self._mark = perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """
+        Charges the time since the previous lap (or since the query began)
+        to phase.
+        """
+        now = perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def heap_hooks(self, labels: Sequence[float], offsets: Sequence[int],
+                   target: int) -> Tuple[Callable, Callable]:
+        """
+        Counting stand-ins for heapq.heappop and heapq.heappush.
+
+        A search that pops and pushes through them runs its own loop
+        unchanged while pops, pushes, stale skips, settled nodes and the
+        arcs scanned from them are tallied here.
+
+        Args:
+            labels: The search's tentative labels, read to tell stale pops
+            offsets: Arc offsets of the graph being searched
+            target: Node whose settling ends the search, so its arcs are
+                not counted as relaxed
+
+        Returns:
+            Tuple of (heappop, heappush)
+        """
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        def pop(heap):
+            item = heappop(heap)
+            self.heap_pops += 1
+            u = item[1]
+            if item[0] > labels[u]:
+                self.stale_skips += 1
+            else:
+                self.settled += 1
+                if u != target:
+                    self.edges_relaxed += offsets[u + 1] - offsets[u]
+            return item
+
+        def push(heap, item):
+            heappush(heap, item)
+            self.heap_pushes += 1
+
+        return pop, push
+
+    def count_lookups(self, clock: Callable) -> Callable:
+        """
+        Wraps a slice clock so every call counts as a traffic lookup.
+        """
+        def counted(slice_number):
+            self.traffic_lookups += 1
+            return clock(slice_number)
+
+        return counted
+
+    def as_dict(self) -> Dict:
+        record = {"kind": self.kind, "start": self.start, "end": self.end}
+        for name in COUNTERS:
+            record[name] = getattr(self, name)
+        record["phases"] = dict(self.phases)
+        return record
+
+class SearchProfiler:
+    """
+    Collects QueryProfiles from the navigator searches.
+
+    Searches check for a profiler once per query and, if there is one, run
+    their usual loop with the counting heap functions and slice clock of a
+    QueryProfile, so the code measured is the code that serves queries.
+    Totals are kept per query kind; the most recent queries are kept
+    individually.
+    """
+
+    def __init__(self, keep: int = 1000):
+        self.recent = deque(maxlen=keep)
+        self.totals = {}  # kind -> {"queries": n, counter: sum, ...}
+        self.phase_totals = {}  # kind -> {phase: seconds}
+
+    def begin(self, kind: str, start: str, end: str) -> QueryProfile:
+        return QueryProfile(kind, start, end)
+
+    def finish(self, profile: QueryProfile) -> None:
+        totals = self.totals.get(profile.kind)
+        if totals is None:
+            totals = self.totals[profile.kind] = dict.fromkeys(
+                ("queries",) + COUNTERS, 0
+            )
+            self.phase_totals[profile.kind] = {}
+        totals["queries"] += 1
+        for name in COUNTERS:
+            totals[name] += getattr(profile, name)
+        phase_totals = self.phase_totals[profile.kind]
+        for phase, seconds in profile.phases.items():
+            phase_totals[phase] = phase_totals.get(phase, 0.0) + seconds
+        self.recent.append(profile)
+
+    def reset(self) -> None:
+        self.recent.clear()
+        self.totals.clear()
+        self.phase_totals.clear()
+
+    def stats(self) -> Dict:
+        """
+        Returns totals and mean phase seconds per query kind, plus the
+        recent queries as dicts.
+        """
+        kinds = {}
+        for kind, totals in self.totals.items():
+            queries = totals["queries"]
+            kinds[kind] = dict(totals)
+            kinds[kind]["phase_seconds"] = dict(self.phase_totals[kind])
+            kinds[kind]["mean_phase_ms"] = {
+                phase: seconds * 1000 / queries
+                for phase, seconds in self.phase_totals[kind].items()
+            }
+        return {"kinds": kinds,
+                "recent": [profile.as_dict() for profile in self.recent]}
+
+    def prometheus(self, prefix: str = "map_navigator") -> str:
+        """
+        Renders the totals in the Prometheus text exposition format.
+        """
+        lines = [f"# HELP {prefix}_queries_total Profiled route queries.",
+                 f"# TYPE {prefix}_queries_total counter"]
+        for kind, totals in sorted(self.totals.items()):
+            lines.append(
+                f'{prefix}_queries_total{{kind="{kind}"}} {totals["queries"]}'
+            )
+        for name in COUNTERS:
+            metric, text = _METRICS[name]
+            lines.append(f"# HELP {prefix}_{metric}_total {text}")
+            lines.append(f"# TYPE {prefix}_{metric}_total counter")
+            for kind, totals in sorted(self.totals.items()):
+                lines.append(f'{prefix}_{metric}_total{{kind="{kind}"}} '
+                             f'{totals[name]}')
+        lines.append(f"# HELP {prefix}_phase_seconds_total "
+                     "Time spent per query phase.")
+        lines.append(f"# TYPE {prefix}_phase_seconds_total counter")
+        for kind, phases in sorted(self.phase_totals.items()):
+            for phase, seconds in sorted(phases.items()):
+                lines.append(f'{prefix}_phase_seconds_total{{kind="{kind}",'
+                             f'phase="{phase}"}} {seconds:.9f}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,27 @@
+"""Operating hours, peak hours and special events of locations."""
+from dataclasses import dataclass
+from datetime import datetime, time
+from enum import Enum
+from typing import Dict, List, Tuple
+
+class DayOfWeek(Enum):
+    MONDAY = 0
+    TUESDAY = 1
+    WEDNESDAY = 2
+    THURSDAY = 3
+    FRIDAY = 4
+    SATURDAY = 5
+    SUNDAY = 6
+
+@dataclass
+class TimeWindow:
+    start_time: time
+    end_time: time
+    traffic_multiplier: float
+    day_of_week: List[DayOfWeek]
+
+class LocationSchedule:
+    def __init__(self):
+        self.operating_hours: Dict[DayOfWeek, List[Tuple[time, time]]] = {}
+        self.peak_hours: List[TimeWindow] = []
+        self.special_events: List[Tuple[datetime, datetime, str]] = []
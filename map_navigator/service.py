@@ -0,0 +1,279 @@
+"""asyncio HTTP/JSON routing service backed by a process pool."""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import signal
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .navigator import EnhancedMapNavigator
+
+# Navigator shared read-only by routing service worker processes
+_service_navigator = None
+
+def _init_service_worker(navigator, map_path: str) -> None:
+    global _service_navigator
+    if navigator is None:
+        # Without fork, every worker maps the same file instead
+        navigator = EnhancedMapNavigator()
+        navigator.load_binary(map_path)
+    _service_navigator = navigator
+
+def _service_request(endpoint: str, params: Dict) -> Optional[Dict]:
+    navigator = _service_navigator
+    start, end = params["start"], params["end"]
+    when = (datetime.fromisoformat(params["time"]) if params.get("time")
+            else datetime.now())
+
+    if endpoint == "/route":
+        path, minutes = navigator.find_route(start, end, when,
+                                             params.get("algorithm"))
+        return {"path": path, "minutes": minutes if path else None}
+    if endpoint == "/eta":
+        eta = navigator.calculate_eta(start, end, when)
+        if eta is None:
+            return {"eta_minutes": None, "arrival_time": None}
+        return {"eta_minutes": eta.total_seconds() / 60,
+                "arrival_time": when + eta}
+    return navigator.generate_timing_report(start, end, when)
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds() / 60  # Minutes, like route costs
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+class RoutingService:
+    """
+    asyncio HTTP/JSON front end that runs route, ETA and timing-report
+    requests on a process pool.
+    
+    Workers are forked after the weights are compiled, so they share the
+    navigator read-only; a map opened with load_binary stays in the same
+    mapped pages for every worker. Once max_pending requests are in flight,
+    new ones are turned away with 503 instead of queueing without bound.
+    Recent latencies are kept per endpoint for percentile reporting.
+    """
+
+    ENDPOINTS = ("/route", "/eta", "/timing-report")
+    REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+               503: "Service Unavailable"}
+
+    def __init__(self, navigator, map_path: str = None, processes: int = None,
+                 max_pending: int = None, latency_window: int = 10000):
+        self.navigator = navigator
+        self.map_path = map_path
+        self.processes = processes or os.cpu_count() or 1
+        self.max_pending = max_pending or self.processes * 8
+        self.in_flight = 0
+        self.latencies = {endpoint: deque(maxlen=latency_window)
+                          for endpoint in self.ENDPOINTS}
+        self.counts = {endpoint: 0 for endpoint in self.ENDPOINTS}
+        self.errors = {endpoint: 0 for endpoint in self.ENDPOINTS}
+        self.rejected = {endpoint: 0 for endpoint in self.ENDPOINTS}
+        self.pool = None
+
+    def start_pool(self) -> None:
+        # Compile before forking so every worker inherits the result
+        self.navigator.compile_weights()
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+            initargs = (self.navigator, None)
+        elif self.map_path and self.map_path.endswith(".json"):
+            raise ValueError("Serving a JSON map needs the fork start method")
+        else:
+            context = None
+            initargs = (None, self.map_path)
+        self.pool = ProcessPoolExecutor(self.processes, mp_context=context,
+                                        initializer=_init_service_worker,
+                                        initargs=initargs)
+
+    def stats(self) -> Dict:
+        """
+        Returns request counts and latency percentiles in ms per endpoint.
+        """
+        endpoints = {}
+        for endpoint in self.ENDPOINTS:
+            latencies = sorted(self.latencies[endpoint])
+            endpoints[endpoint] = {
+                "requests": self.counts[endpoint],
+                "errors": self.errors[endpoint],
+                "rejected": self.rejected[endpoint],
+                "p50_ms": percentile(latencies, 0.50),
+                "p90_ms": percentile(latencies, 0.90),
+                "p99_ms": percentile(latencies, 0.99),
+                "max_ms": latencies[-1] if latencies else 0.0
+            }
+        return {"in_flight": self.in_flight, "max_pending": self.max_pending,
+                "processes": self.processes, "endpoints": endpoints}
+
+    async def dispatch(self, target: str, body: bytes) -> Tuple[int, object]:
+        """
+        Runs one request and returns (HTTP status, JSON payload).
+        """
+        url = urlsplit(target)
+        endpoint = url.path.rstrip("/") or "/"
+        if endpoint == "/stats":
+            return 200, self.stats()
+        if endpoint == "/locations":
+            return 200, sorted(self.navigator.locations)
+        if endpoint not in self.ENDPOINTS:
+            return 404, {"error": f"Unknown endpoint: {endpoint}"}
+
+        params = dict(parse_qsl(url.query))
+        if body:
+            try:
+                decoded = json.loads(body)
+            except ValueError:
+                return 400, {"error": "Request body is not valid JSON"}
+            if not isinstance(decoded, dict):
+                return 400, {"error": "Request body must be a JSON object"}
+            params.update(decoded)
+        if "start" not in params or "end" not in params:
+            return 400, {"error": "start and end are required"}
+        for name in ("start", "end", "algorithm", "time"):
+            value = params.get(name)
+            if value is not None and not isinstance(value, str):
+                return 400, {"error": f"{name} must be a string"}
+
+        if self.in_flight >= self.max_pending:
+            self.rejected[endpoint] += 1
+            return 503, {"error": "Server is overloaded, retry later"}
+
+        self.in_flight += 1
+        started = perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.pool, _service_request, endpoint, params
+            )
+            status = 200
+        except KeyError as error:
+            self.errors[endpoint] += 1
+            status, result = 404, {"error": f"Unknown location: {error}"}
+        except (TypeError, ValueError) as error:
+            self.errors[endpoint] += 1
+            status, result = 400, {"error": str(error)}
+        finally:
+            self.in_flight -= 1
+        self.counts[endpoint] += 1
+        self.latencies[endpoint].append((perf_counter() - started) * 1000)
+        return status, result
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """
+        Serves HTTP/1.1 requests on one connection, with keep-alive.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    _, target, version = request_line.decode("latin-1").split()
+                    body = await reader.readexactly(
+                        int(headers.get("content-length", 0))
+                    )
+                except ValueError:
+                    status, payload = 400, {"error": "Malformed request"}
+                    version, headers = "HTTP/1.0", {}
+                else:
+                    status, payload = await self.dispatch(target, body)
+
+                keep_alive = (version == "HTTP/1.1" and
+                              headers.get("connection", "").lower() != "close")
+                data = json.dumps(payload, default=_json_default).encode()
+                head = (f"HTTP/1.1 {status} {self.REASONS[status]}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n")
+                if status == 503:
+                    head += "Retry-After: 1\r\n"
+                if not keep_alive:
+                    head += "Connection: close\r\n"
+                writer.write(head.encode("latin-1") + b"\r\n" + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def run(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """
+        Starts the worker pool and serves until interrupted or terminated.
+        """
+        self.start_pool()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Routing service listening on http://{host}:{port} "
+              f"with {self.processes} workers")
+        # Stop cleanly on SIGTERM too, so pool workers are not orphaned
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, task.cancel)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+        try:
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+def serve(argv: List[str] = None) -> None:
+    """
+    Command-line entry point: ``python "Map Navigator.py" serve --map FILE``.
+    """
+    parser = argparse.ArgumentParser(
+        prog="Map Navigator.py serve",
+        description="Serve route, ETA and timing-report requests over HTTP."
+    )
+    parser.add_argument("--map", required=True,
+                        help="Binary map (save_binary/import_network) or "
+                             "JSON map (save_to_json)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Requests in flight before answering 503")
+    args = parser.parse_args(argv)
+
+    navigator = EnhancedMapNavigator()
+    if args.map.endswith(".json"):
+        navigator.load_from_json(args.map)
+    else:
+        navigator.load_binary(args.map)
+    service = RoutingService(navigator, args.map, args.processes,
+                             args.max_pending)
+    try:
+        asyncio.run(service.run(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
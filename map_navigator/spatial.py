@@ -0,0 +1,188 @@
+"""Grid index for nearest-location and radius queries."""
+import heapq
+import math
+from typing import List, Tuple
+
+from .geometry import EARTH_RADIUS_KM
+
+class SpatialIndex:
+    """
+    Uniform grid over locations in a local equirectangular projection.
+    
+    Coordinates are projected to kilometers around the latitude of the first
+    point added, which is accurate to well under a percent across a city.
+    Lookups only visit the grid cells around the query point instead of
+    scanning every location.
+    """
+
+    def __init__(self, cell_km: float = 1.0):
+        self.cell_km = cell_km
+        self.reference_latitude = None
+        self.cells = {}
+        self.points = {}  # name -> projected (x, y)
+        self.bounds = None  # (min_cx, min_cy, max_cx, max_cy)
+
+    def project(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        if self.reference_latitude is None:
+            self.reference_latitude = latitude
+        scale = math.radians(1) * EARTH_RADIUS_KM
+        return (longitude * scale *
+                math.cos(math.radians(self.reference_latitude)),
+                latitude * scale)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_km), math.floor(y / self.cell_km)
+
+    def add(self, name: str, latitude: float, longitude: float) -> None:
+        """
+        Adds or moves one location.
+        """
+        if name in self.points:
+            self.remove(name)
+        x, y = self.project(latitude, longitude)
+        cx, cy = self._cell(x, y)
+        self.points[name] = (x, y)
+        self.cells.setdefault((cx, cy), []).append(name)
+        if self.bounds is None:
+            self.bounds = (cx, cy, cx, cy)
+        else:
+            min_cx, min_cy, max_cx, max_cy = self.bounds
+            self.bounds = (min(min_cx, cx), min(min_cy, cy),
+                           max(max_cx, cx), max(max_cy, cy))
+
+    def remove(self, name: str) -> None:
+        x, y = self.points.pop(name)
+        cell = self._cell(x, y)
+        self.cells[cell].remove(name)
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def nearest(self, latitude: float, longitude: float,
+                k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Finds the k locations closest to a point.
+        
+        Args:
+            latitude: Query latitude
+            longitude: Query longitude
+            k: Number of locations to return
+        
+        Returns:
+            List of (location, distance in km), closest first
+        """
+        if not self.points or k <= 0:
+            return []
+        x, y = self.project(latitude, longitude)
+        cx, cy = self._cell(x, y)
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        # Rings closer than the occupied bounds hold nothing, so start at
+        # the first one that reaches them
+        first_ring = max(min_cx - cx, cx - max_cx, min_cy - cy, cy - max_cy, 0)
+        max_ring = max(abs(cx - min_cx), abs(cx - max_cx),
+                       abs(cy - min_cy), abs(cy - max_cy))
+
+        def distance(name: str) -> float:
+            px, py = self.points[name]
+            return math.hypot(px - x, py - y)
+
+        best = []  # Max-heap of the k closest so far, as (-distance, name)
+        for ring in range(first_ring, max_ring + 1):
+            # Border cells of this ring, clipped to the occupied bounds
+            x0, x1 = max(cx - ring, min_cx), min(cx + ring, max_cx)
+            y0, y1 = max(cy - ring, min_cy), min(cy + ring, max_cy)
+            cells = []
+            for gx in range(x0, x1 + 1):
+                if abs(gx - cx) == ring:
+                    cells.extend((gx, gy) for gy in range(y0, y1 + 1))
+                else:
+                    cells.extend((gx, gy) for gy in (cy - ring, cy + ring)
+                                 if y0 <= gy <= y1)
+            if len(cells) > len(self.points):
+                # Mostly empty cells: a plain scan is cheaper
+                found = heapq.nsmallest(
+                    k, ((distance(name), name) for name in self.points)
+                )
+                return [(name, d) for d, name in found]
+            for cell in cells:
+                for name in self.cells.get(cell, ()):
+                    entry = (-distance(name), name)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+            # Anything outside the rings seen so far is at least this far
+            if len(best) == k and -best[0][0] <= ring * self.cell_km:
+                break
+
+        return [(name, -d) for d, name in sorted(best, reverse=True)]
+
+    def within_radius(self, latitude: float, longitude: float,
+                      radius_km: float) -> List[Tuple[str, float]]:
+        """
+        Finds every location within a radius of a point.
+        
+        Args:
+            latitude: Query latitude
+            longitude: Query longitude
+            radius_km: Search radius in kilometers
+        
+        Returns:
+            List of (location, distance in km), closest first
+        """
+        if not self.points:
+            return []
+        x, y = self.project(latitude, longitude)
+        min_cx, min_cy = self._cell(x - radius_km, y - radius_km)
+        max_cx, max_cy = self._cell(x + radius_km, y + radius_km)
+        bound_min_cx, bound_min_cy, bound_max_cx, bound_max_cy = self.bounds
+        min_cx, min_cy = max(min_cx, bound_min_cx), max(min_cy, bound_min_cy)
+        max_cx, max_cy = min(max_cx, bound_max_cx), min(max_cy, bound_max_cy)
+
+        if max_cx < min_cx or max_cy < min_cy:
+            candidates = ()
+        elif (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.points):
+            # Mostly empty cells: a plain scan is cheaper
+            candidates = self.points
+        else:
+            candidates = [name
+                          for gx in range(min_cx, max_cx + 1)
+                          for gy in range(min_cy, max_cy + 1)
+                          for name in self.cells.get((gx, gy), ())]
+        found = []
+        for name in candidates:
+            px, py = self.points[name]
+            distance = math.hypot(px - x, py - y)
+            if distance <= radius_km:
+                found.append((distance, name))
+        found.sort()
+        return [(name, distance) for distance, name in found]
+
+    def within_bounds(self, min_latitude: float, min_longitude: float,
+                      max_latitude: float, max_longitude: float) -> List[str]:
+        """
+        Returns the locations inside a latitude/longitude box.
+        """
+        if not self.points:
+            return []
+        x0, y0 = self.project(min_latitude, min_longitude)
+        x1, y1 = self.project(max_latitude, max_longitude)
+        min_cx, min_cy = self._cell(x0, y0)
+        max_cx, max_cy = self._cell(x1, y1)
+        bound_min_cx, bound_min_cy, bound_max_cx, bound_max_cy = self.bounds
+        min_cx, min_cy = max(min_cx, bound_min_cx), max(min_cy, bound_min_cy)
+        max_cx, max_cy = min(max_cx, bound_max_cx), min(max_cy, bound_max_cy)
+
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.points):
+            # Mostly empty cells: a plain scan is cheaper
+            candidates = self.points
+        else:
+            candidates = [name
+                          for gx in range(min_cx, max_cx + 1)
+                          for gy in range(min_cy, max_cy + 1)
+                          for name in self.cells.get((gx, gy), ())]
+        found = []
+        for name in candidates:
+            px, py = self.points[name]
+            if x0 <= px <= x1 and y0 <= py <= y1:
+                found.append(name)
+        return found
@@ -0,0 +1,255 @@
+"""Multi-stop tour ordering under opening-hour time windows."""
+import math
+from bisect import bisect_left
+from itertools import chain
+from time import perf_counter
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Gains smaller than this are float noise, not better tours
+TOUR_EPSILON = 1e-9
+
+def _better(cost: Tuple[float, float], current: Tuple[float, float]) -> bool:
+    # Lateness first, then finish time
+    if cost[0] < current[0] - TOUR_EPSILON:
+        return True
+    return (cost[0] <= current[0] + TOUR_EPSILON and
+            cost[1] < current[1] - TOUR_EPSILON)
+
+class TourPlanner:
+    """
+    Orders the stops of a tour so it finishes as early as possible while
+    every visit starts inside one of the stop's opening windows.
+
+    Nodes are integer indexes into the travel matrices. Times are minutes
+    after departure. Arriving early means waiting for the next window to
+    open. Arriving after the last window closes is served late, and
+    minimizing total lateness takes priority over finishing early.
+
+    Travel times come from matrix_at(slice_number), the node-to-node matrix
+    for one weight-table time slice, so legs later in the day see later
+    traffic. Matrices are requested lazily and cached.
+
+    Moves are scored incrementally. The prefix schedule of the current
+    route is kept, so a candidate is simulated only from its first changed
+    position. The simulation stops as soon as it is back on the old route
+    with the same departure time, usually after a wait for an opening. From
+    there the old schedule holds unchanged.
+    """
+
+    def __init__(self, matrix_at: Callable[[int], Sequence[Sequence[float]]],
+                 slice_minutes: int, day_offset: float,
+                 windows: Dict[int, List[Tuple[float, float]]],
+                 service: Dict[int, float], start: int, end: int = None):
+        """
+        Args:
+            matrix_at: Returns the travel-minute matrix for a time slice
+                number, counted from midnight of the departure day
+            slice_minutes: Length of one time slice
+            day_offset: Departure time in minutes after midnight
+            windows: Sorted (open, close) minute pairs per node; nodes
+                without an entry are always open
+            service: Minutes spent at each node
+            start: Node the tour leaves from
+            end: Node the tour finishes at, or None to finish at the last
+                stop
+        """
+        self.matrix_at = matrix_at
+        self.slice_minutes = slice_minutes
+        self.day_offset = day_offset
+        self.opens = {node: [w[0] for w in spans]
+                      for node, spans in windows.items()}
+        self.closes = {node: [w[1] for w in spans]
+                       for node, spans in windows.items()}
+        self.service = service
+        self.start = start
+        self.end = end
+        self._matrices = {}
+        self.matrix_seconds = 0.0  # Spent building matrices, not searching
+        self.route = [start] if end is None else [start, end]
+        self.departs = []
+        self.lateness = []
+        self.moves = 0
+        self.improvements = 0
+        self._schedule()
+
+    def matrix(self, t: float) -> Sequence[Sequence[float]]:
+        """
+        Travel-minute matrix in effect t minutes after departure.
+        """
+        slice_number = int((self.day_offset + t) // self.slice_minutes)
+        matrix = self._matrices.get(slice_number)
+        if matrix is None:
+            started = perf_counter()
+            matrix = self._matrices[slice_number] = self.matrix_at(
+                slice_number
+            )
+            self.matrix_seconds += perf_counter() - started
+        return matrix
+
+    def _search_clock(self) -> float:
+        return perf_counter() - self.matrix_seconds
+
+    def visit(self, previous: int, node: int, t: float
+              ) -> Tuple[float, float, float]:
+        """
+        Leaves previous at t for node. Returns (arrival, service start,
+        lateness) at node.
+        """
+        arrival = t + self.matrix(t)[previous][node]
+        closes = self.closes.get(node)
+        if closes is None:
+            return arrival, arrival, 0.0
+        i = bisect_left(closes, arrival)
+        if i == len(closes):
+            return arrival, arrival, arrival - closes[-1]
+        return arrival, max(arrival, self.opens[node][i]), 0.0
+
+    def _schedule(self) -> None:
+        # Departure time and running lateness after every route position
+        route = self.route
+        self.departs = [0.0] * len(route)
+        self.lateness = [0.0] * len(route)
+        t, late = 0.0, 0.0
+        for k in range(1, len(route)):
+            _, begin, overdue = self.visit(route[k - 1], route[k], t)
+            late += overdue
+            t = begin + self.service.get(route[k], 0.0)
+            self.departs[k] = t
+            self.lateness[k] = late
+
+    def cost(self) -> Tuple[float, float]:
+        """
+        (total lateness, finish time) of the current route.
+        """
+        return self.lateness[-1], self.departs[-1]
+
+    def evaluate(self, position: int, nodes, shift: int = 0,
+                 changed_until: int = None) -> Tuple[float, float]:
+        """
+        Cost of the route whose nodes from position onward are nodes.
+
+        Args:
+            position: First route position that differs
+            nodes: New nodes for position and everything after it
+            shift: New route length minus the current one
+            changed_until: First new position from which the new route
+                repeats the old one, offset by shift
+
+        Returns:
+            (total lateness, finish time) of the new route
+        """
+        self.moves += 1
+        route, departs, lateness = self.route, self.departs, self.lateness
+        service = self.service
+        previous = route[position - 1]
+        t = departs[position - 1]
+        late = lateness[position - 1]
+        if changed_until is None:
+            changed_until = len(route) + shift
+        k = position
+        for node in nodes:
+            _, begin, overdue = self.visit(previous, node, t)
+            late += overdue
+            t = begin + service.get(node, 0.0)
+            old = k - shift
+            if k >= changed_until and t == departs[old]:
+                # Back in step with the current schedule
+                return late + lateness[-1] - lateness[old], departs[-1]
+            previous = node
+            k += 1
+        return late, t
+
+    def insert(self, node: int) -> None:
+        """
+        Adds a stop at the position that keeps the tour cheapest.
+        """
+        route = self.route
+        last = len(route) if self.end is None else len(route) - 1
+        best, best_position = None, last
+        for position in range(1, last + 1):
+            cost = self.evaluate(position, chain((node,), route[position:]),
+                                 1, position + 1)
+            if best is None or _better(cost, best):
+                best, best_position = cost, position
+        route.insert(best_position, node)
+        self._schedule()
+
+    def _improve_once(self, deadline: float) -> bool:
+        # First-improvement pass over 2-opt and Or-opt moves
+        route = self.route
+        current = self.cost()
+        first = 1
+        last = len(route) - 1 if self.end is None else len(route) - 2
+
+        # 2-opt: reverse route[i..j]
+        for i in range(first, last):
+            if self._search_clock() > deadline:
+                return False
+            for j in range(i + 1, last + 1):
+                cost = self.evaluate(
+                    i, chain(reversed(route[i:j + 1]), route[j + 1:]),
+                    0, j + 1
+                )
+                if _better(cost, current):
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    self._schedule()
+                    self.improvements += 1
+                    return True
+
+        # Or-opt: move a run of one to three stops before position b
+        for length in (1, 2, 3):
+            for a in range(first, last - length + 2):
+                if self._search_clock() > deadline:
+                    return False
+                segment = route[a:a + length]
+                for b in range(first, last + 2):
+                    if a <= b <= a + length:
+                        continue
+                    if b < a:
+                        cost = self.evaluate(
+                            b, chain(segment, route[b:a], route[a + length:]),
+                            0, a + length
+                        )
+                    else:
+                        cost = self.evaluate(
+                            a, chain(route[a + length:b], segment, route[b:]),
+                            0, b
+                        )
+                    if _better(cost, current):
+                        if b < a:
+                            route[b:a + length] = segment + route[b:a]
+                        else:
+                            route[a:b] = route[a + length:b] + segment
+                        self._schedule()
+                        self.improvements += 1
+                        return True
+        return False
+
+    def improve(self, max_seconds: float = 2.0) -> None:
+        """
+        Runs 2-opt and Or-opt local search until no move helps or the time
+        limit is reached. Time spent building matrices does not count.
+        """
+        deadline = self._search_clock() + max_seconds
+        while self._improve_once(deadline):
+            pass
+
+    def plan(self, stops: List[int], max_seconds: float = 2.0) -> List[int]:
+        """
+        Builds a tour over stops and improves it.
+
+        Stops are inserted by cheapest insertion in order of their last
+        closing time, so tight deadlines are placed while the route is
+        still short. Returns the stop order, without start and end.
+        """
+        def deadline(node: int) -> float:
+            closes = self.closes.get(node)
+            return closes[-1] if closes else math.inf
+
+        for node in sorted(stops, key=deadline):
+            self.insert(node)
+        self.improve(max_seconds)
+        return self.stops()
+
+    def stops(self) -> List[int]:
+        return self.route[1:] if self.end is None else self.route[1:-1]
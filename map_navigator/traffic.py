@@ -0,0 +1,112 @@
+"""Road type and time-of-day traffic factors, and piecewise-linear travel
+time functions."""
+from typing import Dict, List, Tuple
+
+ROAD_TYPE_MULTIPLIERS = {
+    "highway": 0.8,  # Highways are faster
+    "street": 1.0,   # Normal streets
+    "avenue": 0.9,   # Avenues are somewhat faster than streets
+    "local": 1.2     # Local roads are slower
+}
+
+DEFAULT_SPEED_KMH = 50
+
+def parse_time_window(time_range: str) -> Tuple[int, int]:
+    """
+    Parses a traffic pattern key such as "8-10" into (start_hour, end_hour).
+    """
+    start_hour, end_hour = time_range.split('-')
+    return int(start_hour), int(end_hour)
+
+def hourly_multipliers(time_patterns: Dict[str, float]) -> List[float]:
+    """
+    Expands a traffic pattern dict into one multiplier per hour of the day.
+    
+    Windows are matched in insertion order and the first match wins, as in
+    the original per-call lookup. A window whose start is after its end,
+    such as "22-8", wraps around midnight.
+    
+    Args:
+        time_patterns: Dictionary mapping time ranges to traffic multipliers
+    
+    Returns:
+        List of 24 multipliers indexed by hour
+    """
+    table = [None] * 24
+    for time_range, multiplier in time_patterns.items():
+        start_hour, end_hour = parse_time_window(time_range)
+        if start_hour <= end_hour:
+            hours = range(start_hour, end_hour)
+        else:
+            hours = list(range(start_hour, 24)) + list(range(0, end_hour))
+        for hour in hours:
+            if 0 <= hour < 24 and table[hour] is None:
+                table[hour] = multiplier
+    return [1.0 if m is None else m for m in table]
+
+# Piecewise-linear functions are lists of (x, y) breakpoints with increasing x
+PWL_EPSILON = 1e-9
+
+def pwl_evaluate(function: List[Tuple[float, float]], x: float) -> float:
+    """
+    Evaluates a piecewise-linear function, clamping x to its domain.
+    """
+    if x <= function[0][0]:
+        return function[0][1]
+    lo, hi = 0, len(function) - 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if function[mid][0] <= x:
+            lo = mid
+        else:
+            hi = mid
+    (x0, y0), (x1, y1) = function[lo], function[hi]
+    if x >= x1:
+        return y1
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+def pwl_simplify(function: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Drops duplicate and collinear breakpoints.
+    """
+    result = []
+    for x, y in function:
+        if result and x - result[-1][0] <= PWL_EPSILON:
+            result[-1] = (result[-1][0], min(result[-1][1], y))
+            continue
+        while len(result) >= 2:
+            (x0, y0), (x1, y1) = result[-2], result[-1]
+            predicted = y0 + (y - y0) * (x1 - x0) / (x - x0)
+            if abs(predicted - y1) > PWL_EPSILON:
+                break
+            result.pop()
+        result.append((x, y))
+    return result
+
+def pwl_lower_envelope(first: List[Tuple[float, float]],
+                       second: List[Tuple[float, float]]
+                       ) -> Tuple[List[Tuple[float, float]], bool]:
+    """
+    Pointwise minimum of two functions over the same domain.
+    
+    Returns:
+        Tuple of the envelope and whether second is lower than first anywhere
+    """
+    xs = sorted({x for x, _ in first} | {x for x, _ in second})
+    envelope = []
+    improved = False
+    previous = None
+    for x in xs:
+        a = pwl_evaluate(first, x)
+        b = pwl_evaluate(second, x)
+        if previous is not None:
+            px, pa, pb = previous
+            # Add the crossing point if the two swap order inside the piece
+            if (pa - pb) * (a - b) < 0:
+                t = (pa - pb) / ((pa - pb) - (a - b))
+                envelope.append((px + t * (x - px), pa + t * (a - pa)))
+        if b < a - PWL_EPSILON:
+            improved = True
+        envelope.append((x, min(a, b)))
+        previous = (x, a, b)
+    return pwl_simplify(envelope), improved
@@ -0,0 +1,70 @@
+"""Synthetic maps shared by the tests."""
+import random
+from typing import List, Tuple
+
+from map_navigator import (ROAD_TYPE_MULTIPLIERS, EnhancedMapNavigator,
+                           haversine_km)
+
+def grid_navigator(size: int) -> EnhancedMapNavigator:
+    navigator = EnhancedMapNavigator()
+    for i in range(size):
+        for j in range(size):
+            navigator.add_location(f"{i},{j}", 28.5 + i * 0.005,
+                                   77.1 + j * 0.005)
+    for i in range(size):
+        for j in range(size):
+            if i + 1 < size:
+                navigator.add_road(f"{i},{j}", f"{i + 1},{j}", 0.6, 1.2,
+                                   "street")
+            if j + 1 < size:
+                navigator.add_road(f"{i},{j}", f"{i},{j + 1}", 0.6, 1.0,
+                                   "avenue")
+    return navigator
+
+# Hourly traffic shapes given to some roads of random_navigator maps
+TRAFFIC_PATTERNS = [
+    {"7-10": 2.2, "10-17": 1.2, "17-20": 2.0, "20-7": 0.8},
+    {"8-9": 3.0, "9-18": 1.0, "18-19": 2.5, "19-8": 0.9},
+]
+
+def random_navigator(count: int, seed: int) -> EnhancedMapNavigator:
+    """
+    Random city: locations scattered over a few kilometers, each joined to
+    some of its nearest neighbours by two-way or one-way roads at least as
+    long as the straight line, some with hourly traffic patterns.
+    """
+    rng = random.Random(seed)
+    navigator = EnhancedMapNavigator()
+    points = []
+    for i in range(count):
+        latitude = 28.5 + rng.random() * 0.05
+        longitude = 77.1 + rng.random() * 0.05
+        navigator.add_location(f"L{i}", latitude, longitude)
+        points.append((latitude, longitude))
+    road_types = list(ROAD_TYPE_MULTIPLIERS)
+    for i, (latitude, longitude) in enumerate(points):
+        neighbours = sorted(
+            range(count),
+            key=lambda j: haversine_km(latitude, longitude, *points[j])
+        )[1:rng.randint(3, 5)]
+        for j in neighbours:
+            distance = haversine_km(latitude, longitude, *points[j])
+            navigator.add_road(f"L{i}", f"L{j}",
+                               distance * (1.0 + rng.random() * 0.5),
+                               1.0 + rng.random(), rng.choice(road_types),
+                               one_way=rng.random() < 0.15)
+            if rng.random() < 0.3:
+                navigator.add_traffic_pattern(f"L{i}", f"L{j}",
+                                              rng.choice(TRAFFIC_PATTERNS))
+    return navigator
+
+def random_roads(navigator: EnhancedMapNavigator, count: int,
+                 seed: int) -> List[Tuple[str, str]]:
+    """
+    Picks count distinct roads of navigator as (location1, location2), the
+    way they were added.
+    """
+    rng = random.Random(seed)
+    roads = sorted({road_id for road_id in navigator.road_types})
+    return [tuple(road_id.split("-"))
+            for road_id in rng.sample(roads, count)]
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+from maps import grid_navigator
+
+def rush_hour_grid():
+    # The middle column slows to a crawl at 08:00
+    navigator = grid_navigator(8)
+    for i in range(7):
+        navigator.add_traffic_pattern(f"{i},3", f"{i + 1},3",
+                                      {"8-10": 6.0, "10-8": 0.5})
+        navigator.add_traffic_pattern(f"{i},4", f"{i + 1},4",
+                                      {"8-10": 6.0, "10-8": 0.5})
+    return navigator
+
+QUERIES = [("0,3", "7,4"), ("7,3", "0,3"), ("0,0", "7,7"), ("2,3", "2,4")]
+DEPARTURES = [datetime(2024, 12, 5, 7, 30) + timedelta(minutes=m)
+              for m in range(0, 45, 3)]
+
+def test_time_dependent_table_answers_match_the_search():
+    navigator = rush_hour_grid()
+    expected = [navigator.time_dependent_route(start, end, when)
+                for start, end in QUERIES for when in DEPARTURES]
+
+    navigator.build_all_pairs(DEPARTURES[0])
+    profiler = navigator.enable_profiling()
+    got = [navigator.time_dependent_route(start, end, when)
+           for start, end in QUERIES for when in DEPARTURES]
+    assert [route[1] for route in got] == [route[1] for route in expected]
+    # Trips that stay inside their slice come from the table; the ones
+    # crossing into rush hour were searched
+    searched = profiler.stats()["kinds"]["time_dependent"]["queries"]
+    assert 0 < searched < len(got)
@@ -0,0 +1,62 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from maps import grid_navigator, random_navigator
+
+DAY = datetime(2024, 12, 5)
+
+def road_minutes(navigator, when: datetime):
+    # Minutes of the fastest road from each location to each neighbour
+    weight_table = navigator.compile_weights()
+    compiled = weight_table.compiled
+    weights = weight_table.weights_at(when)
+    minutes = {}
+    for u in range(compiled.node_count):
+        for k in range(compiled.offsets[u], compiled.offsets[u + 1]):
+            key = compiled.names[u], compiled.names[compiled.targets[k]]
+            minutes[key] = min(minutes.get(key, math.inf), weights[k])
+    return minutes
+
+@pytest.mark.parametrize("navigator", [random_navigator(80, 3),
+                                       grid_navigator(9)],
+                         ids=["random", "grid"])
+@pytest.mark.parametrize("max_overlap, max_stretch", [(0.5, 1.25),
+                                                      (0.8, 1.5)])
+def test_alternative_routes_respect_their_limits(navigator, max_overlap,
+                                                 max_stretch):
+    names = sorted(navigator.locations)
+    rng = random.Random(4)
+    found = 0
+    for _ in range(25):
+        start, end = rng.sample(names, 2)
+        when = DAY + timedelta(minutes=rng.randrange(1440))
+        minutes = road_minutes(navigator, when)
+        routes = navigator.alternative_routes(start, end, 4, when,
+                                              max_overlap, max_stretch)
+        path, best = navigator.dijkstra(start, end, when)
+        if not path:
+            assert routes == []
+            continue
+        assert 1 <= len(routes) <= 4
+        assert routes[0][1] == pytest.approx(best, rel=1e-9)
+        assert [cost for _, cost in routes] == sorted(
+            cost for _, cost in routes
+        )
+        roads = []
+        for route, cost in routes:
+            assert route[0] == start and route[-1] == end
+            assert len(set(route)) == len(route)
+            legs = {(a, b): minutes[a, b] for a, b in zip(route, route[1:])}
+            assert sum(legs.values()) == pytest.approx(cost, rel=1e-9)
+            assert cost <= best * max_stretch * (1 + 1e-9)
+            roads.append((legs, cost))
+        for i, (legs, cost) in enumerate(roads):
+            for other, other_cost in roads[:i]:
+                shared = sum(m for road, m in legs.items() if road in other)
+                assert shared <= max_overlap * max(cost, other_cost) + 1e-9
+        found += len(routes)
+    # The limits must still leave real alternatives to check
+    assert found > 25
@@ -0,0 +1,68 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from map_navigator import DynamicShortestPathTree
+from maps import random_navigator, random_roads
+
+DAY = datetime(2024, 12, 5)
+
+@pytest.mark.parametrize("seed", range(6))
+def test_repaired_tree_matches_fresh_search(seed):
+    navigator = random_navigator(60, seed)
+    weight_table = navigator.compile_weights()
+    compiled = weight_table.compiled
+    rng = random.Random(seed)
+    tree = DynamicShortestPathTree(
+        compiled, weight_table.weights_at(DAY + timedelta(hours=8)),
+        rng.randrange(compiled.node_count)
+    )
+    for _ in range(30):
+        # Closures, reopenings, slowdowns and speedups, several at a time
+        changes = {}
+        for k in rng.sample(range(compiled.arc_count), rng.randint(1, 6)):
+            if tree.weights[k] == math.inf:
+                changes[k] = rng.uniform(0.5, 3.0)
+            else:
+                changes[k] = rng.choice((math.inf, tree.weights[k] * 3,
+                                         tree.weights[k] * 0.3))
+        tree.update(changes)
+
+        expected = compiled.shortest_distances(tree.weights, tree.source)
+        assert tree.distances == pytest.approx(expected, rel=1e-9)
+        for target in range(compiled.node_count):
+            path = tree.path(target)
+            if expected[target] == math.inf:
+                assert path == []
+                continue
+            assert path[0] == tree.source and path[-1] == target
+            cost = sum(tree.weights[tree.parent_arcs[v]] for v in path[1:])
+            assert cost == pytest.approx(expected[target], rel=1e-9)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_tracked_routes_follow_construction_changes(seed):
+    navigator = random_navigator(60, seed)
+    rng = random.Random(seed)
+    origins = [(f"L{rng.randrange(60)}",
+                DAY + timedelta(minutes=rng.randrange(1440)))
+               for _ in range(3)]
+    for start, when in origins:
+        navigator.track_origin(start, when)
+    roads = random_roads(navigator, 12, seed)
+    for step, (location1, location2) in enumerate(roads):
+        navigator.add_construction_zone(location1, location2, DAY,
+                                        DAY + timedelta(days=1),
+                                        rng.choice((math.inf, 3.0, 0.5)))
+        if step % 4 == 3:
+            navigator.remove_construction_zone(*roads[step - 2])
+        for start, when in origins:
+            tree = navigator._dynamic_trees[start, when][0]
+            for end in navigator.locations:
+                path, cost = navigator.tracked_route(start, end, when)
+                expected = navigator.dijkstra(start, end, when)
+                assert cost == pytest.approx(expected[1], rel=1e-9)
+                assert bool(path) == bool(expected[0])
+            # Repaired in place, not rebuilt
+            assert navigator._dynamic_trees[start, when][0] is tree
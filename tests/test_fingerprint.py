@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pytest
+
+from map_navigator.graph import CompiledGraph
+from maps import grid_navigator
+
+def test_hierarchy_and_all_pairs_share_the_graph_fingerprint(tmp_path):
+    navigator = grid_navigator(5)
+    fingerprint = navigator.compile_graph().fingerprint()
+    assert navigator.build_contraction_hierarchy().fingerprint == fingerprint
+    assert navigator.build_all_pairs(datetime(2024, 12, 5)).fingerprint == (
+        fingerprint
+    )
+
+    hierarchy_file = str(tmp_path / "grid.ch")
+    table_file = str(tmp_path / "grid.npz")
+    navigator.save_contraction_hierarchy(hierarchy_file)
+    navigator.save_all_pairs(table_file)
+
+    copy = grid_navigator(5)
+    copy.load_contraction_hierarchy(hierarchy_file)
+    copy.load_all_pairs(table_file)
+    assert copy.dijkstra("0,0", "4,4", datetime(2024, 12, 5, 9)) == (
+        navigator.dijkstra("0,0", "4,4", datetime(2024, 12, 5, 9))
+    )
+
+    other = grid_navigator(6)
+    with pytest.raises(ValueError):
+        other.load_contraction_hierarchy(hierarchy_file)
+    with pytest.raises(ValueError):
+        other.load_all_pairs(table_file)
+
+def test_hierarchy_queries_do_not_rehash_the_graph(monkeypatch):
+    navigator = grid_navigator(5)
+    navigator.ch_route("0,0", "4,4", datetime(2024, 12, 5, 9))
+    hashed = []
+    names_blob = CompiledGraph.names_blob
+    monkeypatch.setattr(CompiledGraph, "names_blob",
+                        lambda self: hashed.append(1) or names_blob(self))
+    for hour in range(24):
+        navigator.ch_route("0,0", "4,4", datetime(2024, 12, 5, hour))
+        navigator.ch_route("4,0", "0,4", datetime(2024, 12, 5, hour))
+    assert hashed == []
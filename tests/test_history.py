@@ -0,0 +1,57 @@
+import time
+from datetime import datetime, timedelta
+
+from maps import grid_navigator
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_hot_routes_match_searches():
+    navigator = grid_navigator(8)
+    day = datetime(2024, 12, 5)
+    queries = [("0,0", "7,7", day + timedelta(hours=h)) for h in range(24)]
+    queries += [("3,1", "0,6", day + timedelta(hours=9, minutes=m))
+                for m in range(0, 60, 5)]
+    expected = [navigator.find_route(*query) for query in queries]
+
+    table = navigator.enable_hot_routes(per_slice=2, background=False)
+    navigator.warm_hot_routes(day)
+    assert [navigator.find_route(*query) for query in queries] == expected
+    stats = navigator.hot_route_stats()
+    assert stats["hits"] == len(queries)
+    assert stats["coverage"] == 1.0
+    assert table.failures == 0
+
+def test_background_warmer_counts_failures():
+    navigator = grid_navigator(4)
+    navigator.find_route("0,0", "3,3")
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("warm-up bug")
+
+    navigator.warm_hot_routes = broken
+    table = navigator.enable_hot_routes(interval=0.01)
+    try:
+        wait_for(lambda: table.failures >= 2)
+    finally:
+        navigator.disable_hot_routes()
+    stats = table.stats()
+    assert stats["last_error"] == "RuntimeError('warm-up bug')"
+    assert stats["interrupted"] == 0
+
+def test_background_warmer_counts_graph_changes_separately():
+    navigator = grid_navigator(4)
+
+    def interrupted(*args, **kwargs):
+        raise KeyError("0,0")
+
+    navigator.warm_hot_routes = interrupted
+    table = navigator.enable_hot_routes(interval=0.01)
+    try:
+        wait_for(lambda: table.interrupted >= 2)
+    finally:
+        navigator.disable_hot_routes()
+    assert table.failures == 0
@@ -0,0 +1,121 @@
+import csv
+import json
+import random
+from datetime import datetime, timedelta
+
+from map_navigator import EnhancedMapNavigator
+from maps import TRAFFIC_PATTERNS
+
+def random_network(seed: int):
+    rng = random.Random(seed)
+    nodes = [(f"N{i}", 28.5 + rng.random() * 0.05, 77.1 + rng.random() * 0.05)
+             for i in range(40)]
+    roads = []
+    pairs = set()  # One road per pair: the dict views key roads by pair
+    for i in range(40):
+        for j in rng.sample(range(40), 3):
+            if j != i and frozenset((i, j)) not in pairs:
+                pairs.add(frozenset((i, j)))
+                roads.append({
+                    "from": f"N{i}", "to": f"N{j}",
+                    "distance": round(0.3 + rng.random() * 2, 3),
+                    "traffic": round(1 + rng.random(), 2),
+                    "road_type": rng.choice(("street", "avenue", "highway")),
+                    "one_way": rng.random() < 0.2,
+                    "traffic_pattern": (rng.choice(TRAFFIC_PATTERNS)
+                                        if rng.random() < 0.3 else None)
+                })
+    return nodes, roads
+
+def json_map(nodes, roads, filename: str) -> EnhancedMapNavigator:
+    # The same network built road by road and loaded back from JSON
+    navigator = EnhancedMapNavigator()
+    for name, latitude, longitude in nodes:
+        navigator.add_location(name, latitude, longitude)
+    for road in roads:
+        navigator.add_road(road["from"], road["to"], road["distance"],
+                           road["traffic"], road["road_type"],
+                           one_way=road["one_way"])
+        if road["traffic_pattern"]:
+            navigator.add_traffic_pattern(road["from"], road["to"],
+                                          road["traffic_pattern"])
+    navigator.save_to_json(filename)
+    loaded = EnhancedMapNavigator()
+    loaded.load_from_json(filename)
+    return loaded
+
+def assert_same_map(imported: EnhancedMapNavigator,
+                    expected: EnhancedMapNavigator) -> None:
+    assert {name: tuple(point)
+            for name, point in imported.locations.items()} == {
+        name: tuple(point) for name, point in expected.locations.items()
+    }
+    assert imported.graph == expected.graph
+    # The importer only records road types other than the default street
+    assert imported.road_types == {
+        road_id: road_type for road_id, road_type
+        in expected.road_types.items() if road_type != "street"
+    }
+    assert imported.traffic_patterns == expected.traffic_patterns
+    rng = random.Random(0)
+    day = datetime(2024, 12, 5)
+    for _ in range(60):
+        start, end = f"N{rng.randrange(40)}", f"N{rng.randrange(40)}"
+        when = day + timedelta(minutes=rng.randrange(1440))
+        assert imported.dijkstra(start, end, when) == (
+            expected.dijkstra(start, end, when)
+        )
+        assert imported.time_dependent_route(start, end, when)[:2] == (
+            expected.time_dependent_route(start, end, when)[:2]
+        )
+
+def test_csv_import_matches_json(tmp_path):
+    nodes, roads = random_network(1)
+    with open(tmp_path / "nodes.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "latitude", "longitude"])
+        writer.writerows(nodes)
+    with open(tmp_path / "roads.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, list(roads[0]))
+        writer.writeheader()
+        for road in roads:
+            pattern = road["traffic_pattern"]
+            writer.writerow(dict(road, traffic_pattern=(
+                json.dumps(pattern) if pattern else ""
+            )))
+
+    imported = EnhancedMapNavigator()
+    summary = imported.import_network(
+        [str(tmp_path / "nodes.csv"), str(tmp_path / "roads.csv")],
+        str(tmp_path / "city.map"), chunk_size=25
+    )
+    assert summary["roads"] == len(roads)
+    assert_same_map(imported,
+                    json_map(nodes, roads, str(tmp_path / "city.json")))
+
+def test_geojson_lines_import_matches_json(tmp_path):
+    nodes, roads = random_network(2)
+    position = {name: (latitude, longitude)
+                for name, latitude, longitude in nodes}
+    with open(tmp_path / "city.geojsonl", "w") as f:
+        for name, latitude, longitude in nodes:
+            f.write(json.dumps({
+                "type": "Feature",
+                "geometry": {"type": "Point",
+                             "coordinates": [longitude, latitude]},
+                "properties": {"name": name}
+            }) + "\n")
+        for road in roads:
+            f.write(json.dumps({
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": [
+                    position[road["from"]][::-1], position[road["to"]][::-1]
+                ]},
+                "properties": road
+            }) + "\n")
+
+    imported = EnhancedMapNavigator()
+    imported.import_network(str(tmp_path / "city.geojsonl"),
+                            str(tmp_path / "city.map"), chunk_size=30)
+    assert_same_map(imported,
+                    json_map(nodes, roads, str(tmp_path / "city.json")))
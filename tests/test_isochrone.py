@@ -0,0 +1,34 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from maps import random_navigator, random_roads
+
+DAY = datetime(2024, 12, 5)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_isochrone_matches_time_dependent_route(seed):
+    navigator = random_navigator(50, seed)
+    for location1, location2 in random_roads(navigator, 3, seed):
+        navigator.add_construction_zone(location1, location2, DAY,
+                                        DAY + timedelta(days=1), math.inf)
+    rng = random.Random(seed)
+    for _ in range(6):
+        start = f"L{rng.randrange(50)}"
+        # Around the 07:00, 08:00 and 17:00 traffic changes
+        when = DAY + timedelta(hours=rng.choice((6, 7, 16)),
+                               minutes=rng.randrange(45, 60))
+        budget = rng.choice((3.0, 8.0, 20.0))
+        reached = navigator.isochrone(start, when, budget)
+
+        expected = {}
+        for end in navigator.locations:
+            _, arrival_time, _ = navigator.time_dependent_route(start, end,
+                                                                when)
+            if (arrival_time is not None and
+                    arrival_time - when <= timedelta(minutes=budget)):
+                expected[end] = arrival_time
+        assert reached == expected
+        assert list(reached.values()) == sorted(reached.values())
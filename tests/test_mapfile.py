@@ -0,0 +1,81 @@
+import random
+from datetime import datetime, time, timedelta
+
+from map_navigator import DayOfWeek, EnhancedMapNavigator
+from maps import grid_navigator, random_navigator
+
+THURSDAY_EVENING = datetime(2024, 12, 5, 20)
+
+def closed_grid():
+    navigator = grid_navigator(4)
+    for location in ("0,0", "3,3"):
+        navigator.set_operating_hours(location, DayOfWeek.THURSDAY,
+                                      [(time(9), time(17))])
+    return navigator
+
+def test_loading_a_map_drops_the_previous_schedules(tmp_path):
+    binary_file = str(tmp_path / "grid.map")
+    json_file = str(tmp_path / "grid.json")
+    grid_navigator(4).save_binary(binary_file)
+    grid_navigator(4).save_to_json(json_file)
+
+    for load in ("load_binary", "load_from_json"):
+        navigator = closed_grid()
+        assert not navigator.is_location_open("3,3", THURSDAY_EVENING)[0]
+        getattr(navigator, load)(binary_file if load == "load_binary"
+                                 else json_file)
+        assert navigator.is_location_open("3,3", THURSDAY_EVENING) == (
+            True, "Open"
+        )
+        assert navigator.opening_windows(
+            "0,0", THURSDAY_EVENING, datetime(2024, 12, 6)
+        ) == [(THURSDAY_EVENING, datetime(2024, 12, 6))]
+        # Schedules can be set again on the loaded map
+        navigator.set_operating_hours("3,3", DayOfWeek.THURSDAY,
+                                      [(time(9), time(17))])
+        assert not navigator.is_location_open("3,3", THURSDAY_EVENING)[0]
+
+def map_views(navigator: EnhancedMapNavigator):
+    # JSON reads coordinates back as lists
+    return ({name: tuple(point)
+             for name, point in navigator.locations.items()},
+            navigator.graph, navigator.location_metadata,
+            navigator.road_types, navigator.traffic_patterns)
+
+def routes(navigator: EnhancedMapNavigator, seed: int):
+    rng = random.Random(seed)
+    found = []
+    for _ in range(40):
+        start, end = f"L{rng.randrange(50)}", f"L{rng.randrange(50)}"
+        when = THURSDAY_EVENING + timedelta(minutes=rng.randrange(1440))
+        found.append(navigator.dijkstra(start, end, when))
+        found.append(navigator.time_dependent_route(start, end, when)[:2])
+    return found
+
+def test_binary_round_trip_matches_json(tmp_path):
+    original = random_navigator(50, 7)
+    json_file = str(tmp_path / "city.json")
+    binary_file = str(tmp_path / "city.map")
+    original.save_to_json(json_file)
+    original.save_binary(binary_file)
+
+    from_json = EnhancedMapNavigator()
+    from_json.load_from_json(json_file)
+    from_binary = EnhancedMapNavigator()
+    from_binary.load_binary(binary_file)
+    assert (from_binary.compile_graph().fingerprint() ==
+            original.compile_graph().fingerprint())
+    expected = routes(original, 1)
+    assert routes(from_binary, 1) == expected
+    assert routes(from_json, 1) == expected
+    assert map_views(from_binary) == map_views(from_json) == (
+        map_views(original)
+    )
+
+    # A map opened with load_binary saves back to the same map
+    copy_file = str(tmp_path / "copy.map")
+    from_binary.save_binary(copy_file)
+    copy = EnhancedMapNavigator()
+    copy.load_binary(copy_file)
+    assert map_views(copy) == map_views(original)
+    assert routes(copy, 2) == routes(original, 2)
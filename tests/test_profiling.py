@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from maps import grid_navigator
+
+RUSH_HOURS = {"8-10": 2.0, "10-16": 1.2, "16-19": 1.8, "19-22": 1.3,
+              "22-8": 1.0}
+
+def traffic_grid():
+    navigator = grid_navigator(10)
+    for i in range(10):
+        navigator.add_traffic_pattern(f"{i},4", f"{i},5", RUSH_HOURS)
+        navigator.add_traffic_pattern(f"4,{i}", f"5,{i}", RUSH_HOURS)
+    return navigator
+
+QUERIES = [("0,0", "9,9"), ("9,0", "0,9"), ("3,2", "7,8"), ("5,5", "5,5")]
+# Departures before, inside and across the rush-hour slices
+TIMES = [datetime(2024, 12, 5, 7, 55) + timedelta(minutes=m)
+         for m in (0, 90, 500, 1320)]
+
+def test_profiled_searches_match_plain_ones():
+    navigator = traffic_grid()
+    expected = [(navigator.dijkstra(start, end, when),
+                 navigator.time_dependent_route(start, end, when))
+                for start, end in QUERIES for when in TIMES]
+
+    profiler = navigator.enable_profiling()
+    profiled = [(navigator.dijkstra(start, end, when),
+                 navigator.time_dependent_route(start, end, when))
+                for start, end in QUERIES for when in TIMES]
+    assert profiled == expected
+
+    kinds = profiler.stats()["kinds"]
+    for kind in ("dijkstra", "time_dependent"):
+        totals = kinds[kind]
+        assert totals["queries"] == len(QUERIES) * len(TIMES)
+        assert totals["heap_pops"] == (totals["settled"] +
+                                       totals["stale_skips"])
+        assert totals["heap_pushes"] >= totals["heap_pops"]
+        assert totals["edges_relaxed"] > 0
+        assert totals["traffic_lookups"] > 0
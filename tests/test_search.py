@@ -0,0 +1,71 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from maps import random_navigator, random_roads
+
+DAY = datetime(2024, 12, 5)
+
+def closed_navigator(seed: int):
+    # Random map with some roads closed and some slowed down for the day
+    navigator = random_navigator(60, seed)
+    for location1, location2 in random_roads(navigator, 4, seed):
+        navigator.add_construction_zone(location1, location2, DAY,
+                                        DAY + timedelta(days=1), math.inf)
+    for location1, location2 in random_roads(navigator, 4, seed + 100):
+        navigator.add_construction_zone(location1, location2, DAY,
+                                        DAY + timedelta(days=1), 2.5)
+    return navigator
+
+def queries(seed: int, count: int = 30):
+    rng = random.Random(seed)
+    return [(f"L{rng.randrange(60)}", f"L{rng.randrange(60)}",
+             DAY + timedelta(minutes=rng.randrange(1440)))
+            for _ in range(count)]
+
+def assert_same_route(navigator, route, expected, start, end):
+    path, cost = route
+    if not expected[0]:
+        assert path == [] and cost == math.inf
+        return
+    assert cost == pytest.approx(expected[1], rel=1e-9)
+    assert path[0] == start and path[-1] == end
+    for location1, location2 in zip(path, path[1:]):
+        assert any(n == location2 for n, _, _ in navigator.graph[location1])
+
+@pytest.mark.parametrize("seed", range(8))
+def test_astar_matches_dijkstra(seed):
+    navigator = closed_navigator(seed)
+    for landmarks in (0, 3):
+        navigator.prepare_landmarks(landmarks)
+        for start, end, when in queries(seed):
+            assert_same_route(navigator, navigator.astar(start, end, when),
+                              navigator.dijkstra(start, end, when),
+                              start, end)
+
+@pytest.mark.parametrize("seed", range(8))
+def test_bidirectional_dijkstra_matches_dijkstra(seed):
+    navigator = closed_navigator(seed)
+    for start, end, when in queries(seed):
+        assert_same_route(navigator,
+                          navigator.bidirectional_dijkstra(start, end, when),
+                          navigator.dijkstra(start, end, when), start, end)
+
+@pytest.mark.parametrize("seed", range(8))
+def test_ch_route_matches_dijkstra(seed):
+    navigator = random_navigator(60, seed)
+    navigator.build_contraction_hierarchy()
+    # Closures after preprocessing only need a new customization
+    for location1, location2 in random_roads(navigator, 4, seed):
+        navigator.add_construction_zone(location1, location2, DAY,
+                                        DAY + timedelta(days=1), math.inf)
+    for start, end, when in queries(seed):
+        assert_same_route(navigator, navigator.ch_route(start, end, when),
+                          navigator.dijkstra(start, end, when), start, end)
+    # A new road changes the topology, so the hierarchy is rebuilt
+    navigator.add_road("L0", "L59", 0.1, 1.0, one_way=True)
+    for start, end, when in queries(seed + 1):
+        assert_same_route(navigator, navigator.ch_route(start, end, when),
+                          navigator.dijkstra(start, end, when), start, end)
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+from map_navigator.cli import main
+from map_navigator.service import RoutingService
+
+def request(service: RoutingService, raw: bytes) -> bytes:
+    # One request over a real connection; 400s never reach the worker pool
+    async def exchange() -> bytes:
+        server = await asyncio.start_server(service.handle_connection,
+                                            "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return response
+    return asyncio.run(exchange())
+
+def post(body: bytes) -> bytes:
+    return (b"POST /route HTTP/1.1\r\nConnection: close\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+
+def test_non_object_json_body_is_rejected():
+    service = RoutingService(main(), processes=1)
+    for body in (b"[1]", b'"x"', b"3", b"null"):
+        status, payload = asyncio.run(service.dispatch("/route", body))
+        assert status == 400
+        assert "JSON object" in payload["error"]
+
+        response = request(service, post(body))
+        assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+        assert b"JSON object" in response
+
+def test_invalid_json_body_is_rejected():
+    service = RoutingService(main(), processes=1)
+    response = request(service, post(b"{"))
+    assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    payload = json.loads(response.split(b"\r\n\r\n", 1)[1])
+    assert payload["error"] == "Request body is not valid JSON"
+
+def test_fields_of_the_wrong_type_are_rejected():
+    service = RoutingService(main(), processes=1)
+    for body in (b'{"start": "Saket", "end": "Red Fort", "time": 5}',
+                 b'{"start": ["Saket"], "end": "Red Fort"}',
+                 b'{"start": "Saket", "end": {"name": "Red Fort"}}',
+                 b'{"start": "Saket", "end": "Red Fort", "algorithm": 1}'):
+        status, payload = asyncio.run(service.dispatch("/route", body))
+        assert status == 400
+        assert "must be a string" in payload["error"]
+
+        response = request(service, post(body))
+        assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+        assert b"must be a string" in response
@@ -0,0 +1,78 @@
+import math
+import random
+import time
+
+from map_navigator import SpatialIndex
+
+def random_index(count: int, seed: int) -> SpatialIndex:
+    rng = random.Random(seed)
+    index = SpatialIndex()
+    for i in range(count):
+        index.add(f"P{i}", 28.4 + rng.random() * 0.4,
+                  77.0 + rng.random() * 0.4)
+    return index
+
+def brute_force(index: SpatialIndex, latitude: float, longitude: float,
+                k: int):
+    x, y = index.project(latitude, longitude)
+    distances = sorted((math.hypot(px - x, py - y), name)
+                       for name, (px, py) in index.points.items())
+    return [(name, distance) for distance, name in distances[:k]]
+
+def test_nearest_matches_brute_force():
+    index = random_index(500, 1)
+    rng = random.Random(2)
+    for _ in range(200):
+        latitude = 28.2 + rng.random() * 0.8
+        longitude = 76.8 + rng.random() * 0.8
+        k = rng.randint(1, 8)
+        got = index.nearest(latitude, longitude, k)
+        expected = brute_force(index, latitude, longitude, k)
+        assert [d for _, d in got] == [d for _, d in expected]
+
+def test_nearest_far_away_query_is_fast():
+    index = random_index(2000, 3)
+    started = time.perf_counter()
+    got = index.nearest(-33.9, 151.2, 3)  # Sydney, about 10,000 km away
+    assert time.perf_counter() - started < 0.5
+    assert [d for _, d in got] == [
+        d for _, d in brute_force(index, -33.9, 151.2, 3)
+    ]
+
+def brute_force_radius(index: SpatialIndex, latitude: float,
+                       longitude: float, radius_km: float):
+    x, y = index.project(latitude, longitude)
+    distances = sorted((math.hypot(px - x, py - y), name)
+                       for name, (px, py) in index.points.items())
+    return [(name, distance) for distance, name in distances
+            if distance <= radius_km]
+
+def test_within_radius_matches_brute_force():
+    index = random_index(500, 4)
+    rng = random.Random(5)
+    for _ in range(200):
+        latitude = 28.2 + rng.random() * 0.8
+        longitude = 76.8 + rng.random() * 0.8
+        radius_km = rng.choice((0.5, 2.0, 8.0, 30.0, 100.0))
+        assert index.within_radius(latitude, longitude, radius_km) == (
+            brute_force_radius(index, latitude, longitude, radius_km)
+        )
+
+def test_within_radius_large_radius_is_fast():
+    index = random_index(100, 6)
+    started = time.perf_counter()
+    got = index.within_radius(28.6, 77.2, 1000.0)
+    far = index.within_radius(-33.9, 151.2, 1000.0)  # Sydney
+    assert time.perf_counter() - started < 0.5
+    assert len(got) == 100
+    assert got == brute_force_radius(index, 28.6, 77.2, 1000.0)
+    assert far == []
+
+def test_empty_index_queries_leave_projection_unset():
+    index = SpatialIndex()
+    assert index.within_radius(-33.9, 151.2, 5.0) == []
+    assert index.nearest(-33.9, 151.2) == []
+    assert index.within_bounds(-34.0, 151.0, -33.0, 152.0) == []
+    assert index.reference_latitude is None
+    index.add("A", 28.6, 77.2)
+    assert index.reference_latitude == 28.6
@@ -0,0 +1,79 @@
+import copy
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "sudoku_solver", Path(__file__).parent.parent / "Sudoku solver.py"
+)
+sudoku_solver = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sudoku_solver)
+solve_sudoku = sudoku_solver.solve_sudoku
+
+def parse(text: str):
+    digits = [int(c) if c.isdigit() else 0 for c in text if c in "0123456789."]
+    return [digits[9 * r:9 * r + 9] for r in range(9)]
+
+PUZZLES = [
+    # Textbook, "hardest" (Inkala) and a 17-clue puzzle
+    "53..7....6..195....98....6.8...6...34..8.3..1"
+    "7...2...6.6....28....419..5....8..79",
+    "8..........36......7..9.2...5...7.......457.."
+    "...1...3...1....68..85...1..9....4..",
+    ".......1.4.........2...........5.4.7..8...3.."
+    "..1.9....3..4..2...5.1........8.6...",
+    "." * 81,
+]
+
+def assert_solved(board, puzzle):
+    units = ([row for row in board] +
+             [[board[r][c] for r in range(9)] for c in range(9)] +
+             [[board[3 * (b // 3) + i // 3][3 * (b % 3) + i % 3]
+               for i in range(9)] for b in range(9)])
+    for unit in units:
+        assert sorted(unit) == list(range(1, 10))
+    for r in range(9):
+        for c in range(9):
+            if puzzle[r][c]:
+                assert board[r][c] == puzzle[r][c]
+
+@pytest.mark.parametrize("text", PUZZLES)
+def test_solves_to_a_valid_grid(text):
+    puzzle = parse(text)
+    board = copy.deepcopy(puzzle)
+    assert solve_sudoku(board) is True
+    assert_solved(board, puzzle)
+
+def test_random_puzzles_keep_their_clues():
+    solution = parse(PUZZLES[0])
+    assert solve_sudoku(solution)
+    rng = random.Random(9)
+    for _ in range(20):
+        puzzle = [[digit if rng.random() < 0.3 else 0 for digit in row]
+                  for row in solution]
+        board = copy.deepcopy(puzzle)
+        assert solve_sudoku(board) is True
+        assert_solved(board, puzzle)
+
+UNSOLVABLE = [
+    # Clashing clues: two 5s in the first row
+    "55..7....6..195....98....6.8...6...34..8.3..1"
+    "7...2...6.6....28....419..5....8..79",
+    # Clashing clues: two 9s in the last box
+    "53..7....6..195....98....6.8...6...34..8.3..1"
+    "7...2...6.6....28....419..5....8.999",
+    # No clash, but the top-right cell has no digit left
+    "12345678.........9" + "." * 63,
+    # No clash; only the search finds there is no solution (Norvig)
+    ".....5.8....6.1.43..........1.5........1.6...3......."
+    "553.....61........4.........",
+]
+
+@pytest.mark.parametrize("text", UNSOLVABLE)
+def test_unsolvable_board_is_left_unchanged(text):
+    puzzle = parse(text)
+    board = copy.deepcopy(puzzle)
+    assert solve_sudoku(board) is False
+    assert board == puzzle
@@ -0,0 +1,153 @@
+import heapq
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from maps import random_navigator, random_roads
+
+DAY = datetime(2024, 12, 5)
+
+def rush_hour_navigator(seed: int):
+    navigator = random_navigator(40, seed)
+    for location1, location2 in random_roads(navigator, 3, seed):
+        navigator.add_construction_zone(location1, location2, DAY,
+                                        DAY + timedelta(days=1), math.inf)
+    navigator.add_weather_impact(DAY, 1.3, "rain")
+    return navigator
+
+def minute_scan_arrivals(navigator, start: str, depart: float):
+    """
+    Earliest arrival minute at every node, driving each road one whole
+    minute at a time at the speed arc_minutes() gives for that minute.
+    """
+    weight_table = navigator.compile_weights()
+    compiled = weight_table.compiled
+    minutes = {}
+
+    def cost(k: int, minute: int) -> float:
+        if minute not in minutes:
+            minutes[minute] = [
+                weight_table.arc_minutes(arc, DAY + timedelta(minutes=minute))
+                for arc in range(compiled.arc_count)
+            ]
+        return minutes[minute][k]
+
+    def drive(k: int, now: float) -> float:
+        remaining = 1.0  # Share of the road still ahead
+        while True:
+            minute = math.floor(now)
+            if cost(k, minute) == math.inf:
+                return math.inf
+            if now + remaining * cost(k, minute) <= minute + 1:
+                return now + remaining * cost(k, minute)
+            remaining -= (minute + 1 - now) / cost(k, minute)
+            now = minute + 1
+
+    arrivals = [math.inf] * compiled.node_count
+    source = compiled.index[start]
+    arrivals[source] = depart
+    pq = [(depart, source)]
+    while pq:
+        now, u = heapq.heappop(pq)
+        if now > arrivals[u]:
+            continue
+        for k in range(compiled.offsets[u], compiled.offsets[u + 1]):
+            v = compiled.targets[k]
+            arrival = drive(k, now)
+            if arrival < arrivals[v]:
+                arrivals[v] = arrival
+                heapq.heappush(pq, (arrival, v))
+    return {compiled.names[u]: arrival for u, arrival in enumerate(arrivals)}
+
+def minutes_of(when: datetime) -> float:
+    return (when - DAY).total_seconds() / 60
+
+# Departures on both sides of the 07:00-10:00 and 17:00-20:00 changes
+DEPARTURES = [DAY + timedelta(hours=hour, minutes=minute)
+              for hour in (6, 7, 8, 9, 16, 17, 19)
+              for minute in (0, 37, 52, 58)]
+
+@pytest.mark.parametrize("seed", range(4))
+def test_time_dependent_route_matches_minute_scan(seed):
+    navigator = rush_hour_navigator(seed)
+    rng = random.Random(seed)
+    for departure in DEPARTURES:
+        start = f"L{rng.randrange(40)}"
+        expected = minute_scan_arrivals(navigator, start,
+                                        minutes_of(departure))
+        for end in (f"L{rng.randrange(40)}" for _ in range(5)):
+            path, arrival_time, segments = navigator.time_dependent_route(
+                start, end, departure
+            )
+            if expected[end] == math.inf:
+                assert path == [] and arrival_time is None
+                continue
+            assert minutes_of(arrival_time) == pytest.approx(expected[end],
+                                                             abs=1e-6)
+            assert path[0] == start and path[-1] == end
+            assert sum((segment["duration"] for segment in segments),
+                       timedelta()) == arrival_time - departure
+
+def profile_arrival(profile, departure: float) -> float:
+    # Arrival read off the piecewise-linear profile
+    points = [(minutes_of(x), minutes_of(y)) for x, y in profile]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if x0 <= departure <= x1:
+            if x1 == x0:
+                return y0
+            return y0 + (departure - x0) * (y1 - y0) / (x1 - x0)
+    raise AssertionError(f"{departure} is outside the profile")
+
+@pytest.mark.parametrize("seed", range(3))
+def test_departure_profile_matches_minute_scan(seed):
+    navigator = rush_hour_navigator(seed)
+    rng = random.Random(seed)
+    for _ in range(2):
+        start, end = f"L{rng.randrange(40)}", f"L{rng.randrange(40)}"
+        window_start = DAY + timedelta(hours=6, minutes=40)
+        window_end = DAY + timedelta(hours=8, minutes=20)
+        profile = navigator.departure_profile(start, end, window_start,
+                                              window_end)
+        for minute in range(400, 501, 4):
+            expected = minute_scan_arrivals(navigator, start, minute)[end]
+            if expected == math.inf:
+                assert profile == []
+                continue
+            assert profile_arrival(profile, minute) == pytest.approx(
+                expected, abs=1e-6
+            )
+
+@pytest.mark.parametrize("seed", range(3))
+def test_latest_departure_matches_minute_scan(seed):
+    navigator = rush_hour_navigator(seed)
+    rng = random.Random(seed)
+    for target_arrival in (DAY + timedelta(hours=7, minutes=12),
+                           DAY + timedelta(hours=8, minutes=5),
+                           DAY + timedelta(hours=17, minutes=9)):
+        start, end = f"L{rng.randrange(40)}", f"L{rng.randrange(40)}"
+        deadline = minutes_of(target_arrival)
+        latest = navigator.latest_departure(start, end, target_arrival)
+        if minute_scan_arrivals(navigator, start, 0)[end] == math.inf:
+            assert latest is None
+            continue
+        # Leaving at the latest departure arrives exactly on time, and
+        # leaving any later arrives late
+        departure = minutes_of(latest)
+        assert minute_scan_arrivals(navigator, start, departure)[end] == (
+            pytest.approx(deadline, abs=1e-6)
+        )
+        assert minute_scan_arrivals(navigator, start,
+                                    departure + 0.01)[end] > deadline
+
+        # The whole-minute answer is the last minute that still makes it
+        expected = None
+        for minutes_early in range(1, 3 * 60):
+            if minute_scan_arrivals(navigator, start,
+                                    deadline - minutes_early)[end] <= deadline:
+                expected = target_arrival - timedelta(minutes=minutes_early)
+                break
+        assert navigator.get_optimal_departure_time(
+            start, end, target_arrival
+        ) == expected
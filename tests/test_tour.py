@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from maps import grid_navigator
+
+def test_plan_tour_search_timing_is_not_negative():
+    # Few stops on a big map: building the matrices dwarfs the search
+    navigator = grid_navigator(40)
+    tour = navigator.plan_tour("0,0", ["39,39", "0,39", "39,0"],
+                               datetime(2024, 12, 5, 9, 30))
+    search = tour["search"]
+    assert search["seconds"] >= 0
+    assert search["moves_per_second"] >= 0
+    assert search["matrix_seconds"] > 0
+    assert sorted(tour["order"]) == ["0,39", "39,0", "39,39"]